@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Measures how many records per second the JSON log formatter can format, compared
+to the straightforward dict + json.dumps implementation it replaced.
+
+Usage:
+    python dev/benchmarks/log_formatter.py [--records N]
+"""
+import json
+import logging
+import time
+from argparse import ArgumentParser
+from typing import Callable, List
+
+from mmpm.__version__ import version
+from mmpm.log.factory import JsonFormatter
+
+
+class ReferenceFormatter(logging.Formatter):
+    def format(self, record):
+        log_data = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "version": version,
+            "message": record.getMessage(),
+            "logger_name": record.name,
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+
+        return json.dumps(log_data, ensure_ascii=False)
+
+
+def make_records(count: int) -> List[logging.LogRecord]:
+    records = []
+
+    for index in range(count):
+        record = logging.LogRecord(
+            "mmpm.magicmirror.database",
+            logging.DEBUG if index % 4 else logging.INFO,
+            "/mmpm/magicmirror/database.py",
+            100 + index % 10,
+            "Retrieved details for %s",
+            (f"MMM-Package-{index}",),
+            None,
+            func="load",
+        )
+        record.created = time.time() + index / 1000  # roughly a thousand records per second
+        records.append(record)
+
+    return records
+
+
+def measure(format_record: Callable[[logging.LogRecord], str], records: List[logging.LogRecord]) -> float:
+    start = time.perf_counter()
+
+    for record in records:
+        format_record(record)
+
+    return len(records) / (time.perf_counter() - start)
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the MMPM JSON log formatter")
+    parser.add_argument("--records", type=int, default=100000, help="number of records to format")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    formatters = {
+        "reference (dict + json.dumps)": ReferenceFormatter(),
+        "JsonFormatter(backend='json')": JsonFormatter(),
+    }
+
+    orjson_formatter = JsonFormatter(backend="orjson")
+
+    if orjson_formatter.backend == "orjson":
+        formatters["JsonFormatter(backend='orjson')"] = orjson_formatter
+
+    print(f"{'formatter':<40} {'records/s':>12}")
+
+    for name, formatter in formatters.items():
+        formatter.format(records[0])  # warm any caches
+        print(f"{name:<40} {measure(formatter.format, records):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Compares the memory and startup time of the two ways of running the MMPM UI: the four processes
+MMPMui starts with pm2 (the API, log server, and repeater under gunicorn, and the UI under gunicorn with mmpm.static),
+and the single process started by `mmpm serve`. The processes are started directly, without pm2.
+
+Startup is the time until every port answers, and the first request for the packages is timed
+separately. Memory is totalled over every process of a mode, both as RSS, which counts the pages shared
+between processes (ie. gunicorn masters and their workers) once per process, and as PSS, which splits
+them between the processes sharing them.
+
+Usage:
+    python dev/benchmarks/servers.py [--runs N] [--settle SECONDS]
+
+The ports of the UI, API, log server, and repeater must be free.
+"""
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Dict, List
+
+from mmpm.constants import urls
+from mmpm.ui import MMPMui
+
+SOCKETIO = "/socket.io/?EIO=4&transport=polling"
+
+
+def modes() -> Dict[str, Dict[str, List[str]]]:
+    scripts = [app["script"] for app in MMPMui().pm2_ecosystem_config["apps"]]
+
+    return {
+        "pm2 (4 processes)": {
+            "commands": scripts,
+            "ready": [
+                f"http://127.0.0.1:{urls.MMPM_API_SERVER_PORT}{SOCKETIO}",
+                f"http://127.0.0.1:{urls.MMPM_LOG_SERVER_PORT}{SOCKETIO}",
+                f"http://127.0.0.1:{urls.MMPM_REPEATER_SERVER_PORT}{SOCKETIO}",
+                f"http://127.0.0.1:{urls.MMPM_UI_PORT}/",
+            ],
+        },
+        "mmpm serve (1 process)": {
+            "commands": [f"{sys.executable} -m mmpm.server"],
+            "ready": [f"http://127.0.0.1:{urls.MMPM_API_SERVER_PORT}{SOCKETIO}", f"http://127.0.0.1:{urls.MMPM_API_SERVER_PORT}/"],
+        },
+    }
+
+
+def answers(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status < 500
+    except OSError:
+        return False
+
+
+def descendants(pid: int) -> List[int]:
+    children = Path(f"/proc/{pid}/task/{pid}/children")
+    found = [pid]
+
+    if children.exists():
+        for child in children.read_text().split():
+            found.extend(descendants(int(child)))
+
+    return found
+
+
+def memory(pids: List[int]) -> Dict[str, float]:
+    totals = {"rss": 0.0, "pss": 0.0}
+
+    for pid in pids:
+        try:
+            for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+                field, _, value = line.partition(":")
+
+                if field in ("Rss", "Pss"):
+                    totals[field.lower()] += int(value.split()[0]) / 1024
+        except OSError:
+            continue
+
+    return totals
+
+
+def measure(commands: List[str], ready: List[str], settle: float) -> Dict[str, float]:
+    start = time.perf_counter()
+    processes = [subprocess.Popen(command, shell=True, start_new_session=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for command in commands]
+    pids: List[int] = []
+
+    try:
+        while not all(answers(url) for url in ready):
+            if time.perf_counter() - start > 120:
+                raise TimeoutError(f"{commands} did not start within 120 seconds")
+            time.sleep(0.05)
+
+        startup = time.perf_counter() - start
+
+        request = time.perf_counter()
+        answers(f"http://127.0.0.1:{urls.MMPM_API_SERVER_PORT}/api/packages/")
+        first_request = time.perf_counter() - request
+
+        time.sleep(settle)
+        pids = [pid for process in processes for pid in descendants(process.pid)]
+        totals = memory([pid for pid in pids if not Path(f"/proc/{pid}/exe").resolve().name.endswith("sh")])
+    finally:
+        for process in processes:
+            os.killpg(process.pid, signal.SIGTERM)
+
+        for process in processes:
+            process.wait()
+
+        # the gunicorn masters outlive the shells which started them while their workers shut down, keeping the ports
+        while any(Path(f"/proc/{pid}").exists() for pid in pids):
+            time.sleep(0.1)
+
+    return {"startup": startup, "first_request": first_request, **totals}
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the memory and startup time of the MMPM UI servers")
+    parser.add_argument("--runs", type=int, default=3, help="number of runs per mode")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to wait after startup before measuring memory")
+    args = parser.parse_args()
+
+    print(f"{'mode':<26} {'startup (s)':>12} {'first request (s)':>18} {'RSS (MB)':>10} {'PSS (MB)':>10}")
+
+    for name, mode in modes().items():
+        runs = [measure(mode["commands"], mode["ready"], args.settle) for _ in range(args.runs)]
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(f"{name:<26} {median['startup']:>12.2f} {median['first_request']:>18.3f} {median['rss']:>10.1f} {median['pss']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Measures the wall-clock time of importing MMPM modules and running short CLI
+commands in fresh interpreters, so regressions in startup time are easy to spot.
+
+Usage:
+    python dev/benchmarks/startup.py [--runs N] [target ...]
+
+A target is either a module name (ie. mmpm.constants.urls) or a CLI invocation
+prefixed with "mmpm" (ie. "mmpm version").
+"""
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from typing import List
+
+DEFAULT_TARGETS = [
+    "mmpm.constants.urls",
+    "mmpm.utils",
+    "mmpm version",
+]
+
+
+def command_for(target: str) -> List[str]:
+    if target.startswith("mmpm ") or target == "mmpm":
+        return [sys.executable, "-m", "mmpm.entrypoint", *target.split()[1:]]
+
+    return [sys.executable, "-c", f"import {target}"]
+
+
+def measure(target: str, runs: int) -> List[float]:
+    command = command_for(target)
+    timings: List[float] = []
+
+    subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)  # warm the filesystem cache
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark MMPM startup time")
+    parser.add_argument("--runs", type=int, default=10, help="number of runs per target")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="modules or 'mmpm <subcommand>' invocations")
+    args = parser.parse_args()
+
+    print(f"{'target':<40} {'min (ms)':>10} {'median (ms)':>12} {'max (ms)':>10}")
+
+    for target in args.targets:
+        timings = measure(target, args.runs)
+        print(f"{target:<40} {min(timings):>10.1f} {statistics.median(timings):>12.1f} {max(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-from typing import Any
+from typing import Any, Callable
 
 from flask import Response, jsonify
 
+from mmpm.api.jobs import Job, JobConflict, JobManager, JobQueueFull
 from mmpm.log.factory import MMPMLogFactory
 
 logger = MMPMLogFactory.get_logger(__name__)
@@ -44,3 +45,28 @@ class Endpoint:
             Response: A Flask Response object with the specified status code and the provided message.
         """
         return jsonify({"code": code, "message": msg})
+
+    def job(self, name: str, task: Callable[[Job], Any], **options) -> Response:
+        """
+        Starts a long operation as a background job (see mmpm.api.jobs), rather than running it within
+        the request. The UI follows the job until it finishes, and its result is the task's return value.
+
+        Parameters:
+            name (str): what the job does, ie. 'packages/install'
+            task (Callable[[Job], Any]): the operation, which is passed the job to report its progress through
+            options: passed on to JobManager.submit, ie. coalesce=True
+
+        Returns:
+            Response: A Flask Response object containing the queued job, ie. {"job": {"id": "...", ...}}
+        """
+
+        try:
+            job = JobManager().submit(name, task, **options)
+        except JobQueueFull as error:
+            logger.error(str(error))
+            return self.failure(str(error), code=503)
+        except JobConflict as error:
+            logger.error(str(error))
+            return self.failure(str(error), code=409)
+
+        return self.success({"job": job.serialize()})
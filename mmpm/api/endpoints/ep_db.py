@@ -4,6 +4,8 @@ from flask import Blueprint, Response
 
 from mmpm.api.constants import http
 from mmpm.api.endpoints.endpoint import Endpoint
+from mmpm.api.jobs import Job
+from mmpm.env import MMPMEnv
 from mmpm.log.factory import MMPMLogFactory
 from mmpm.magicmirror.database import MagicMirrorDatabase
 from mmpm.magicmirror.magicmirror import MagicMirror
@@ -22,26 +24,38 @@ class Db(Endpoint):
         self.blueprint = Blueprint(self.name, __name__, url_prefix=f"/api/{self.name}")
         self.db = MagicMirrorDatabase()
         self.magicmirror = MagicMirror()
+        self.env = MMPMEnv()
 
         @self.blueprint.route("/update", methods=[http.GET])
         def update() -> Response:
             """
-            A Flask route method for updating the MagicMirror database.
+            A Flask route method for updating the MagicMirror database. Concurrent requests share a single
+            update, and the result of an update is reused for MMPM_DB_UPDATE_INTERVAL seconds, unless packages
+            or MagicMirror have been installed, upgraded, or removed since.
 
             Parameters:
                 None
 
             Returns:
-                Response: A Flask Response object indicating the success or failure of the database update.
+                Response: A Flask Response object containing the background job, whose result is the list of upgradable packages.
             """
-            if not self.db.load(update=True):
-                return self.failure("Failed to update database. See logs for details.")
 
-            can_upgrade_mmpm = update_available()
-            can_upgrade_magicmirror = self.magicmirror.update()
-            self.db.update(can_upgrade_mmpm=can_upgrade_mmpm, can_upgrade_magicmirror=can_upgrade_magicmirror)
+            def task(job: Job) -> dict:
+                job.progress("Downloading the package database", step=1, total=3)
 
-            return self.success(self.db.upgradable())
+                if not self.db.load(update=True):
+                    raise RuntimeError("Failed to update database. See logs for details.")
+
+                job.progress("Checking for MMPM and MagicMirror upgrades", step=2)
+                can_upgrade_mmpm = update_available()
+                can_upgrade_magicmirror = self.magicmirror.update()
+
+                job.progress("Checking for package upgrades", step=3)
+                self.db.update(can_upgrade_mmpm=can_upgrade_mmpm, can_upgrade_magicmirror=can_upgrade_magicmirror)
+
+                return self.db.upgradable()
+
+            return self.job("db/update", task, coalesce=True, fresh_for=self.env.MMPM_DB_UPDATE_INTERVAL.get())
 
         @self.blueprint.route("/upgradable", methods=[http.GET])
         def upgradable() -> Response:
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+from flask import Blueprint, Response
+
+from mmpm.api.constants import http
+from mmpm.api.endpoints.endpoint import Endpoint
+from mmpm.api.jobs import JobManager
+from mmpm.log.factory import MMPMLogFactory
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+class Jobs(Endpoint):
+    """
+    A Flask endpoint for following and cancelling the background jobs started by other endpoints
+    (ie. installing packages). Changes to jobs are also pushed to the UI as 'job' SocketIO events.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.name = "jobs"
+        self.blueprint = Blueprint(self.name, __name__, url_prefix=f"/api/{self.name}")
+        self.jobs = JobManager()
+
+        @self.blueprint.route("/", methods=[http.GET])
+        def retrieve() -> Response:
+            """
+            A Flask route method for listing the jobs that are running, waiting to run, or recently finished.
+
+            Parameters:
+                None
+
+            Returns:
+                Response: A Flask Response object containing the jobs, oldest first.
+            """
+
+            return self.success([job.serialize() for job in self.jobs.jobs()])
+
+        @self.blueprint.route("/<job_id>", methods=[http.GET])
+        def status(job_id: str) -> Response:
+            """
+            A Flask route method for retrieving the status, progress, and result of a job.
+
+            Parameters:
+                job_id (str): the ID of the job
+
+            Returns:
+                Response: A Flask Response object containing the job or an error message.
+            """
+
+            job = self.jobs.get(job_id)
+
+            if job is None:
+                return self.failure(f"No job with ID {job_id}", code=404)
+
+            return self.success(job.serialize())
+
+        @self.blueprint.route("/<job_id>/cancel", methods=[http.POST])
+        def cancel(job_id: str) -> Response:
+            """
+            A Flask route method for cancelling a job, killing any command it is running.
+
+            Parameters:
+                job_id (str): the ID of the job
+
+            Returns:
+                Response: A Flask Response object containing the job or an error message.
+            """
+
+            job = self.jobs.cancel(job_id)
+
+            if job is None:
+                return self.failure(f"No job with ID {job_id}", code=404)
+
+            return self.success(job.serialize())
@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
-from datetime import datetime
-from os import chdir
-from shutil import make_archive
-
-from flask import Blueprint, Response, send_file
+from flask import Blueprint, Response, request, stream_with_context
 
 from mmpm.api.constants import http
 from mmpm.api.endpoints.endpoint import Endpoint
-from mmpm.constants import paths
+from mmpm.log import archive as log_archive
 from mmpm.log.factory import MMPMLogFactory
+from mmpm.log.reader import LogFilter, parse_time
 
 logger = MMPMLogFactory.get_logger(__name__)
 
@@ -29,16 +26,33 @@ class Logs(Endpoint):
         @self.blueprint.route("/archive", methods=[http.GET])
         def archive() -> Response:
             """
-            Handles a GET request to create and serve a ZIP archive of log files.
+            Handles a GET request to create and serve an archive of the log files. The archive is streamed
+            to the client as it's built, and is never written to disk.
+
+            Query Parameters:
+                format (str): 'zip' (default), 'tar.gz', or 'tar.zst' (if zstandard is installed)
+                since (str): only include records since a date/time, or a duration ago (ie. '2024-01-31 18:00', '2h')
+                until (str): only include records before a date/time, or a duration ago
 
             Returns:
-                Response: A Flask Response object that enables the client to download the ZIP archive.
+                Response: A Flask Response object that enables the client to download the archive.
             """
-            logger.debug("Creating zip of log files")
-            chdir("/tmp")
-            today = datetime.now()
-            zip_file_name = f"mmpm-logs-{today.year}-{today.month}-{today.day}"
-            logger.debug(f"Creating zip of log files named '{zip_file_name}'")
-            archive_name = make_archive(zip_file_name, "zip", paths.MMPM_LOG_DIR)
-            logger.debug(f"Archive created: {bool(archive_name)}")
-            return send_file(f"/tmp/{zip_file_name}.zip", f"{zip_file_name}.zip", as_attachment=True)
+            archive_format = request.args.get("format", "zip")
+
+            if archive_format not in log_archive.available_formats():
+                return self.failure(f"Unsupported archive format '{archive_format}', expected one of {log_archive.available_formats()}", 400)
+
+            try:
+                since = parse_time(request.args["since"]) if request.args.get("since") else None
+                until = parse_time(request.args["until"]) if request.args.get("until") else None
+            except ValueError as error:
+                return self.failure(str(error), 400)
+
+            file_name = log_archive.file_name(archive_format)
+            logger.debug(f"Streaming archive of log files named '{file_name}'")
+
+            return Response(
+                stream_with_context(log_archive.stream(archive_format, LogFilter(since=since, until=until))),
+                mimetype=log_archive.FORMATS[archive_format][0],
+                headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+            )
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+from flask import Blueprint, Response
+
+from mmpm import metrics
+from mmpm.api.constants import http
+from mmpm.api.endpoints.endpoint import Endpoint
+from mmpm.log.factory import MMPMLogFactory
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+def collect_log_queue() -> None:
+    """
+    Reads the state of the queue between the logger and the log files/log server into the log metrics.
+    """
+
+    queue = MMPMLogFactory.metrics()
+    metrics.LOG_QUEUE_DEPTH.set(queue["queue_depth"])
+    metrics.LOG_QUEUE_CAPACITY.set(queue["queue_capacity"])
+    # the queue keeps its own running total, so the counter only catches up with it
+    metrics.LOG_RECORDS_DROPPED.inc(max(queue["dropped"] - metrics.LOG_RECORDS_DROPPED.value(), 0))
+
+
+class Metrics(Endpoint):
+    """
+    A Flask endpoint exposing the in-process metrics of the API server (see mmpm.metrics) to Prometheus,
+    or anything else which understands its text format.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.name = "metrics"
+        self.blueprint = Blueprint(self.name, __name__, url_prefix=f"/api/{self.name}")
+
+        metrics.REGISTRY.collector(collect_log_queue)
+
+        @self.blueprint.route("/", methods=[http.GET])
+        def retrieve() -> Response:
+            """
+            A Flask route method for retrieving the metrics.
+
+            Parameters:
+                None
+
+            Returns:
+                Response: A Flask Response object containing the metrics in the Prometheus text format.
+            """
+
+            return Response(metrics.REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -4,12 +4,16 @@ from flask import Blueprint, Response, request
 
 from mmpm.api.constants import http
 from mmpm.api.endpoints.endpoint import Endpoint
+from mmpm.api.jobs import Job, JobManager
 from mmpm.log.factory import MMPMLogFactory
 from mmpm.magicmirror.controller import MagicMirrorController
 from mmpm.magicmirror.magicmirror import MagicMirror
 
 logger = MMPMLogFactory.get_logger(__name__)
 
+# starting, stopping, and restarting MagicMirror must not overlap, they act on the same processes
+POWER_JOBS = ("mm-ctl/start", "mm-ctl/stop", "mm-ctl/restart")
+
 
 class MmCtl(Endpoint):
     """
@@ -32,14 +36,20 @@ class MmCtl(Endpoint):
                 None
 
             Returns:
-                Response: A Flask Response object indicating the success or failure of the installation.
+                Response: A Flask Response object containing the background job installing MagicMirror.
             """
 
             logger.info("Received request to install MagicMirror")
-            if self.magicmirror.install():
-                return self.success("MagicMirror installed")
 
-            return self.failure("Failed to install MagicMirror. See logs for details.")
+            def task(job: Job) -> str:
+                job.progress("Installing MagicMirror", step=1, total=1)
+
+                if not self.magicmirror.install():
+                    raise RuntimeError("Failed to install MagicMirror. See logs for details.")
+
+                return "MagicMirror installed"
+
+            return self.job("mm-ctl/install", task, invalidates=("db/update",))
 
         @self.blueprint.route("/remove", methods=[http.GET])
         def remove() -> Response:
@@ -55,6 +65,7 @@ class MmCtl(Endpoint):
 
             logger.info("Received request to remove MagicMirror")
             if self.magicmirror.remove():
+                JobManager().expire("db/update")
                 return self.success("MagicMirror removed")
 
             return self.failure("Failed to remove MagicMirror. See logs for details.")
@@ -68,14 +79,20 @@ class MmCtl(Endpoint):
                 None
 
             Returns:
-                Response: A Flask Response object indicating the success or failure of the upgrade.
+                Response: A Flask Response object containing the background job upgrading MagicMirror.
             """
 
             logger.info("Received request to upgrade MagicMirror")
-            if self.magicmirror.upgrade():
-                return self.success("MagicMirror updated")
 
-            return self.failure("Failed to update MagicMirror. See logs for details.")
+            def task(job: Job) -> str:
+                job.progress("Upgrading MagicMirror", step=1, total=1)
+
+                if not self.magicmirror.upgrade():
+                    raise RuntimeError("Failed to update MagicMirror. See logs for details.")
+
+                return "MagicMirror updated"
+
+            return self.job("mm-ctl/upgrade", task, invalidates=("db/update",))
 
         @self.blueprint.route("/start", methods=[http.GET])
         def start() -> Response:
@@ -86,14 +103,20 @@ class MmCtl(Endpoint):
                 None
 
             Returns:
-                Response: A Flask Response object indicating the success or failure of starting MagicMirror.
+                Response: A Flask Response object containing the background job starting MagicMirror.
             """
 
             logger.info("Received request to start MagicMirror")
-            if self.controller.start():
-                return self.success("MagicMirror started")
 
-            return self.failure("Failed to start MagicMirror. See logs for details.")
+            def task(job: Job) -> str:
+                job.progress("Starting MagicMirror", step=1, total=1)
+
+                if not self.controller.start():
+                    raise RuntimeError("Failed to start MagicMirror. See logs for details.")
+
+                return "MagicMirror started"
+
+            return self.job("mm-ctl/start", task, coalesce=True, excludes=POWER_JOBS)
 
         @self.blueprint.route("/stop", methods=[http.GET])
         def stop() -> Response:
@@ -104,14 +127,20 @@ class MmCtl(Endpoint):
                 None
 
             Returns:
-                Response: A Flask Response object indicating the success or failure of stopping MagicMirror.
+                Response: A Flask Response object containing the background job stopping MagicMirror.
             """
 
             logger.info("Received request to stop MagicMirror")
-            if self.controller.stop():
-                return self.success("MagicMirror stopped")
 
-            return self.failure("Failed to stop MagicMirror. See logs for details.")
+            def task(job: Job) -> str:
+                job.progress("Stopping MagicMirror", step=1, total=1)
+
+                if not self.controller.stop():
+                    raise RuntimeError("Failed to stop MagicMirror. See logs for details.")
+
+                return "MagicMirror stopped"
+
+            return self.job("mm-ctl/stop", task, coalesce=True, excludes=POWER_JOBS)
 
         @self.blueprint.route("/restart", methods=[http.GET])
         def restart() -> Response:
@@ -122,14 +151,20 @@ class MmCtl(Endpoint):
                 None
 
             Returns:
-                Response: A Flask Response object indicating the success or failure of restarting MagicMirror.
+                Response: A Flask Response object containing the background job restarting MagicMirror.
             """
 
             logger.info("Received request to restart MagicMirror")
-            if self.controller.restart():
-                return self.success("MagicMirror restarted")
 
-            return self.failure("Failed to restart MagicMirror. See logs for details.")
+            def task(job: Job) -> str:
+                job.progress("Restarting MagicMirror", step=1, total=1)
+
+                if not self.controller.restart():
+                    raise RuntimeError("Failed to restart MagicMirror. See logs for details.")
+
+                return "MagicMirror restarted"
+
+            return self.job("mm-ctl/restart", task, coalesce=True, excludes=POWER_JOBS)
 
         @self.blueprint.route("/hide", methods=[http.POST])
         def hide() -> Response:
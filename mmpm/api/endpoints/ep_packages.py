@@ -3,6 +3,7 @@ from flask import Blueprint, Response, request
 
 from mmpm.api.constants import http
 from mmpm.api.endpoints.endpoint import Endpoint
+from mmpm.api.jobs import Job, JobCancelled, JobManager, detached
 from mmpm.log.factory import MMPMLogFactory
 from mmpm.magicmirror.database import MagicMirrorDatabase
 from mmpm.magicmirror.magicmirror import MagicMirror
@@ -65,25 +66,39 @@ class Packages(Endpoint):
                 None
 
             Returns:
-                Response: A Flask Response object containing the status of each installation attempt.
+                Response: A Flask Response object containing the background job, whose result is the status of each installation attempt.
             """
 
             packages = request.get_json()["packages"]
-            success = []
-            failure = []
 
-            for package in packages:
-                pkg = MagicMirrorPackage(**package)
+            def task(job: Job) -> dict:
+                success = []
+                failure = []
 
-                if pkg.install():
-                    logger.debug(f"Installed {pkg.title}")
-                    success.append(package)
-                else:
-                    logger.debug(f"Removing {pkg.title} due to installation failure. Please try reinstalling manually.")
-                    failure.append(package)
-                    pkg.remove()
+                for index, package in enumerate(packages, start=1):
+                    pkg = MagicMirrorPackage(**package)
+                    job.progress(f"Installing {pkg.title}", step=index, total=len(packages))
 
-            return self.success({"success": success, "failure": failure})
+                    try:
+                        installed = pkg.install()
+                    except JobCancelled:
+                        with detached():
+                            pkg.remove()
+                        raise
+
+                    if installed:
+                        logger.debug(f"Installed {pkg.title}")
+                        success.append(package)
+                    else:
+                        logger.debug(f"Removing {pkg.title} due to installation failure. Please try reinstalling manually.")
+                        failure.append(package)
+
+                        with detached():
+                            pkg.remove()
+
+                return {"success": success, "failure": failure}
+
+            return self.job("packages/install", task, invalidates=("db/update",))
 
         @self.blueprint.route("/remove", methods=[http.POST])
         def remove() -> Response:
@@ -111,6 +126,7 @@ class Packages(Endpoint):
                     logger.debug(f"Failed to remove {pkg.title}")
                     failure.append(package)
 
+            JobManager().expire("db/update")
             return self.success({"success": success, "failure": failure})
 
         @self.blueprint.route("/upgrade", methods=[http.POST])
@@ -122,24 +138,29 @@ class Packages(Endpoint):
                 None
 
             Returns:
-                Response: A Flask Response object containing the status of each upgrade attempt.
+                Response: A Flask Response object containing the background job, whose result is the status of each upgrade attempt.
             """
 
             packages = request.get_json()["packages"]
-            success = []
-            failure = []
 
-            for package in packages:
-                pkg = MagicMirrorPackage(**package)
+            def task(job: Job) -> dict:
+                success = []
+                failure = []
 
-                if pkg.upgrade():
-                    logger.debug(f"Upgraded {pkg.title}")
-                    success.append(package)
-                else:
-                    logger.debug(f"Failed to upgrade {pkg.title}")
-                    failure.append(package)
+                for index, package in enumerate(packages, start=1):
+                    pkg = MagicMirrorPackage(**package)
+                    job.progress(f"Upgrading {pkg.title}", step=index, total=len(packages))
 
-            return self.success({"success": success, "failure": failure})
+                    if pkg.upgrade():
+                        logger.debug(f"Upgraded {pkg.title}")
+                        success.append(package)
+                    else:
+                        logger.debug(f"Failed to upgrade {pkg.title}")
+                        failure.append(package)
+
+                return {"success": success, "failure": failure}
+
+            return self.job("packages/upgrade", task, invalidates=("db/update",))
 
         @self.blueprint.route("/mm-pkg/add", methods=[http.POST])
         def add_mm_pkg() -> Response:
@@ -156,6 +177,7 @@ class Packages(Endpoint):
             package = MagicMirrorPackage(**request.get_json()["package"])
 
             if self.db.add_mm_pkg(package.title, package.author, package.repository, package.description):
+                JobManager().expire("db/update")
                 return self.success(f"Added custom package named {package.title}")
 
             return self.failure("Failed to add custom package. See logs for details.")
@@ -184,6 +206,7 @@ class Packages(Endpoint):
                 else:
                     failure.append(package)
 
+            JobManager().expire("db/update")
             return self.success({"success": success, "failure": failure})
 
         @self.blueprint.route("/details", methods=[http.POST])
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+from flask import Blueprint, Response, send_file
+
+from mmpm.api.constants import http
+from mmpm.api.endpoints.endpoint import Endpoint
+from mmpm.api.profiling import RequestProfiler
+from mmpm.log.factory import MMPMLogFactory
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+class Profiles(Endpoint):
+    """
+    A Flask endpoint for listing and downloading the profiles of API requests (see mmpm.api.profiling).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.name = "profiles"
+        self.blueprint = Blueprint(self.name, __name__, url_prefix=f"/api/{self.name}")
+        self.profiler = RequestProfiler()
+
+        @self.blueprint.route("/", methods=[http.GET])
+        def retrieve() -> Response:
+            """
+            A Flask route method for listing the saved profiles, most recent first.
+
+            Parameters:
+                None
+
+            Returns:
+                Response: A Flask Response object containing what each profiled request was, and how long it took.
+            """
+
+            return self.success(self.profiler.profiles())
+
+        @self.blueprint.route("/<profile_id>/<fmt>", methods=[http.GET])
+        def download(profile_id: str, fmt: str) -> Response:
+            """
+            A Flask route method for downloading a saved profile.
+
+            Parameters:
+                profile_id (str): the ID of the profile
+                fmt (str): 'pstats' (for `python -m pstats` or snakeviz), or 'collapsed' (for flame graphs)
+
+            Returns:
+                Response: A Flask Response object containing the profile, or an error message.
+            """
+
+            path = self.profiler.path(profile_id, fmt)
+
+            if path is None:
+                return self.failure(f"No {fmt} profile with ID {profile_id}", code=404)
+
+            mimetype = "text/plain" if fmt == "collapsed" else "application/octet-stream"
+            return send_file(path, mimetype=mimetype, as_attachment=True, download_name=path.name)
@@ -4,12 +4,17 @@ from gevent import monkey
 monkey.patch_all()
 
 import json
+import time
 
-from flask import Flask, Response
+import socketio
+from flask import Flask, Response, g, request
 from flask_cors import CORS
 
 import mmpm.api.endpoints
+from mmpm import metrics
 from mmpm.api.endpoints.index import Index
+from mmpm.api.jobs import JobManager
+from mmpm.api.profiling import RequestProfiler
 from mmpm.log.factory import MMPMLogFactory
 from mmpm.subcommands.loader import Loader
 
@@ -26,6 +31,41 @@ resources: dict = {
 }
 
 
+profiler = RequestProfiler()
+
+
+@app.before_request
+def before_request() -> None:
+    g.request_start = time.perf_counter()
+    g.profiling = profiler.wanted(request.headers) and profiler.start()
+
+
+@app.after_request  # type: ignore
+def record_request_duration(response: Response) -> Response:
+    """
+    Records how long the request took to handle (for streamed responses, until the response started).
+
+    Parameters:
+        response (flask.Response): the response object being returned to the frontend
+
+    Returns
+        response (flask.Response): the same response object
+    """
+
+    start = g.get("request_start")
+
+    if start is not None:
+        metrics.API_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            blueprint=request.blueprint or "",
+            route=request.url_rule.rule if request.url_rule else "<unmatched>",
+            method=request.method,
+            status=str(response.status_code),
+        )
+
+    return response
+
+
 @app.after_request  # type: ignore
 def after_request(response: Response) -> Response:
     """
@@ -44,6 +84,37 @@ def after_request(response: Response) -> Response:
     return response
 
 
+@app.after_request  # type: ignore
+def save_profile(response: Response) -> Response:
+    """
+    Saves the profile of the request, if it was profiled (see mmpm.api.profiling). Registered last, so
+    it runs before the other after_request functions, and the profile only covers handling the request.
+
+    Parameters:
+        response (flask.Response): the response object being returned to the frontend
+
+    Returns
+        response (flask.Response): the same response object, with the ID of the profile in the X-MMPM-Profile-Id header
+    """
+
+    if g.get("profiling"):
+        g.profiling = False
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        profile_id = profiler.stop(request.method, route, request.path, response.status_code)
+
+        if profile_id:
+            response.headers["X-MMPM-Profile-Id"] = profile_id
+
+    return response
+
+
+@app.teardown_request
+def discard_profile(error=None) -> None:  # pylint: disable=unused-argument
+    if g.get("profiling"):  # the request failed before a response was produced
+        g.profiling = False
+        profiler.stop(request.method, request.url_rule.rule if request.url_rule else "<unmatched>", request.path, 500)
+
+
 @app.errorhandler(Exception)
 def exception_handler(error) -> Response:
     response: Response = error.get_response()
@@ -71,3 +142,17 @@ for endpoint in entrypoints:
         logger.debug(f"Loaded blueprint for {endpoint}")
     except Exception as exception:
         logger.error(f"Failed to load blueprint for {endpoint}: {exception}")
+
+# pushes every change to a background job to the UI, and sends newly connected clients the current jobs
+sio = socketio.Server(cors_allowed_origins="*", async_mode="gevent")
+
+
+@sio.event
+def connect(sid, environ, auth=None):  # pylint: disable=unused-argument
+    sio.emit("jobs", [job.serialize() for job in JobManager().jobs()], to=sid)
+
+
+JobManager().subscribe(lambda job: sio.emit("job", job))
+
+app.wsgi_app = socketio.WSGIApp(sio, app.wsgi_app)  # type: ignore
+
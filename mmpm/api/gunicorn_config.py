@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+The gunicorn configuration of the API (see MMPMui), used as `gunicorn -c python:mmpm.api.gunicorn_config`.
+Only the server hooks live here, the worker class, number of workers, and address stay on the command line.
+
+Each worker warms up (see mmpm.api.warmup) before it accepts connections. With `--preload`, the app is
+imported and warmed up once by the master process instead, and the workers are forked from it, sharing
+the loaded state. The objects loaded by then are frozen out of the garbage collector beforehand, since
+collecting them would write to every one of them, copying the pages the workers would otherwise share.
+
+Background jobs (see mmpm.api.jobs) are kept in the memory of the worker which started them, so the API
+is started with a single worker, with or without `--preload`. Nothing from MMPM is imported here until
+a hook runs, so the master process doesn't import anything before gevent has patched it.
+"""
+import gc
+
+
+def when_ready(server) -> None:
+    """
+    Called by the master process once it is listening, before the workers are started.
+    """
+
+    if server.cfg.preload_app:
+        from mmpm.api.warmup import warmup  # pylint: disable=import-outside-toplevel
+
+        warmup()
+        gc.freeze()
+
+
+def post_worker_init(worker) -> None:
+    """
+    Called by each worker once the app is loaded, before it accepts connections.
+    """
+
+    if not worker.cfg.preload_app:
+        from mmpm.api.warmup import warmup  # pylint: disable=import-outside-toplevel
+
+        warmup()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Runs long operations requested through the API (installing and upgrading packages or MagicMirror,
+updating the database) in the background, so the request that started one returns right away with a
+job ID, rather than holding a worker until the operation finishes.
+
+Jobs run on a bounded executor (greenlets, within the API server), and report their progress as they
+go. Every change to a job is passed to the subscribed listeners, ie. the SocketIO server of the API,
+which pushes it to the UI as a 'job' event. Jobs are kept by the API server, not by the client which
+started them, so they survive the UI being reloaded, and the most recent finished jobs are retained
+for a while so their results can still be collected.
+
+Jobs which are expensive and return the same result no matter who asks (ie. updating the database)
+can be submitted with `coalesce`: concurrent callers then attach to the job already in flight and share
+its result, rather than each starting another, and a job that succeeded within the last `fresh_for`
+seconds is returned as-is. Jobs which change what such a result depends on (ie. installing packages)
+name the jobs they make stale with `invalidates`. Jobs which must not run alongside one another (ie.
+starting and stopping MagicMirror) name each other with `excludes`.
+
+Cancelling a job stops it at its next step, and kills every command it is running. While a job runs,
+`run_cmd` starts commands in a process group of their own (see mmpm.utils.CURRENT_JOB), so the entire
+group is killed, including any processes the command itself started (ie. npm).
+"""
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from mmpm import metrics
+from mmpm.log.factory import MMPMLogFactory
+from mmpm.singleton import Singleton
+from mmpm.utils import CURRENT_JOB
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """
+    Raised within a job once it has been cancelled, the next time it reports progress.
+    """
+
+
+class JobQueueFull(Exception):
+    """
+    Raised when a job is submitted while the maximum number of jobs are already waiting to run.
+    """
+
+
+class JobConflict(Exception):
+    """
+    Raised when a job is submitted while a job it excludes is waiting to run, or running.
+    """
+
+
+@contextmanager
+def detached() -> Iterator[None]:
+    """
+    Runs the commands within the block outside of the current job, so they aren't interrupted by it
+    being cancelled, ie. to clean up after a partially installed package.
+    """
+
+    token = CURRENT_JOB.set(None)
+
+    try:
+        yield
+    finally:
+        CURRENT_JOB.reset(token)
+
+
+class Job:
+    """
+    A single background operation.
+
+    Attributes:
+        id (str): the unique identifier of the job
+        name (str): what the job does, ie. 'packages/install'
+        status (str): one of 'pending', 'running', 'succeeded', 'failed', or 'cancelled'
+        step (int): the number of the current step, starting at 1 (0 until the first step)
+        total (int): the number of steps, 0 if unknown
+        message (str): a description of the current step
+        result (Any): the value returned by the task, once it has succeeded
+        error (str): why the job failed
+        created (float): when the job was submitted (time.time)
+        started (Optional[float]): when the job started running
+        finished (Optional[float]): when the job finished
+    """
+
+    def __init__(self, name: str, task: Callable[["Job"], Any], notify: Callable[["Job"], None], grace_period: float = 5.0):
+        """
+        Parameters:
+            name (str): what the job does, ie. 'packages/install'
+            task (Callable[[Job], Any]): the operation, which is passed the job to report its progress through
+            notify (Callable[[Job], None]): called whenever the job changes
+            grace_period (float): the number of seconds processes have to exit once terminated, before they're killed
+        """
+
+        self.id = uuid4().hex
+        self.name = name
+        self.status = PENDING
+        self.step = 0
+        self.total = 0
+        self.message = ""
+        self.result: Any = None
+        self.error = ""
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.grace_period = grace_period
+        self.invalidates: Tuple[str, ...] = ()
+        self.__task = task
+        self.__notify = notify
+        self.__cancelled = False
+        self.__processes: Set[subprocess.Popen] = set()
+        self.__lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__cancelled
+
+    def progress(self, message: str = "", step: Optional[int] = None, total: Optional[int] = None) -> None:
+        """
+        Reports the progress of the job. Calling this without a step only updates the message of the
+        current step. Once the job has been cancelled, this raises JobCancelled, which stops the task.
+
+        Parameters:
+            message (str): a description of the current step, ie. 'Installing MMM-Weather'
+            step (Optional[int]): the number of the current step, starting at 1
+            total (Optional[int]): the number of steps
+
+        Returns:
+            None
+
+        Raises:
+            JobCancelled: if the job has been cancelled
+        """
+
+        if self.__cancelled:
+            raise JobCancelled()
+
+        if step is not None:
+            self.step = step
+
+        if total is not None:
+            self.total = total
+
+        self.message = message
+        self.__notify(self)
+
+    def attach(self, process: subprocess.Popen) -> None:
+        """
+        Registers a command run by the job (see mmpm.utils.run_cmd), so it's killed if the job is cancelled.
+        The command must have been started in a session of its own.
+
+        Parameters:
+            process (subprocess.Popen): the command
+
+        Returns:
+            None
+        """
+
+        with self.__lock:
+            self.__processes.add(process)
+
+        if self.__cancelled:
+            self.__terminate__(process)
+
+    def detach(self, process: subprocess.Popen) -> None:
+        with self.__lock:
+            self.__processes.discard(process)
+
+    def __signal__(self, process: subprocess.Popen, signum: int) -> None:
+        if process.poll() is not None:
+            return
+
+        try:
+            os.killpg(process.pid, signum)
+        except (ProcessLookupError, PermissionError) as error:
+            logger.debug(f"Unable to signal process group {process.pid} of job {self.id}: {error}")
+
+    def __terminate__(self, process: subprocess.Popen) -> None:
+        """
+        Asks the process group of a command to exit, and kills it if it hasn't within the grace period.
+        """
+
+        self.__signal__(process, signal.SIGTERM)
+
+        timer = threading.Timer(self.grace_period, self.__signal__, args=(process, signal.SIGKILL))
+        timer.daemon = True
+        timer.start()
+
+    def cancel(self) -> bool:
+        """
+        Cancels the job. A pending job never runs. A running job is stopped the next time it reports
+        progress, and every command it is running is terminated.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True if the job was cancelled, False if it had already finished
+        """
+
+        if self.done:
+            return False
+
+        self.__cancelled = True
+        logger.info(f"Cancelling job {self.id} ({self.name})")
+
+        with self.__lock:
+            processes = list(self.__processes)
+
+        for process in processes:
+            self.__terminate__(process)
+
+        if self.status == PENDING:
+            self.__finish__(CANCELLED)
+
+        return True
+
+    def __finish__(self, status: str, result: Any = None, error: str = "") -> None:
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished = time.time()
+        self.__notify(self)
+
+    def run(self) -> None:
+        """
+        Runs the task, recording its result or why it failed. Called by the JobManager's executor.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        if self.__cancelled:
+            return
+
+        self.status = RUNNING
+        self.started = time.time()
+        self.__notify(self)
+
+        token = CURRENT_JOB.set(self)
+
+        try:
+            result = self.__task(self)
+        except JobCancelled:
+            self.__finish__(CANCELLED)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.error(f"Job {self.id} ({self.name}) failed: {error}")
+            self.__finish__(FAILED, error=str(error) or type(error).__name__)
+        else:
+            # commands killed by a cancellation typically just fail, so the task may not have noticed
+            self.__finish__(CANCELLED if self.__cancelled else SUCCEEDED, result=None if self.__cancelled else result)
+        finally:
+            CURRENT_JOB.reset(token)
+
+    def serialize(self) -> Dict[str, Any]:
+        """
+        Converts the job into a dictionary sent to the UI.
+
+        Parameters:
+            None
+
+        Returns:
+            job (Dict[str, Any]): the attributes of the job
+        """
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "progress": {"step": self.step, "total": self.total, "message": self.message},
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobManager(Singleton):
+    """
+    Submits jobs to a bounded executor, and keeps track of them.
+
+    Attributes:
+        max_workers (int): the maximum number of jobs running at once
+        max_pending (int): the maximum number of jobs waiting to run
+        retain (int): the number of finished jobs kept
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, retain: int = 50):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retain = retain
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mmpm-job")
+        self.__jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.__listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.__expired: Dict[str, float] = {}
+        self.__lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Registers a callback which is passed the serialized job every time any job changes.
+
+        Parameters:
+            listener (Callable[[Dict[str, Any]], None]): the callback
+
+        Returns:
+            None
+        """
+
+        self.__listeners.append(listener)
+
+    def __notify__(self, job: Job) -> None:
+        if job.done:
+            for name in job.invalidates:
+                self.expire(name)
+
+        serialized = job.serialize()
+
+        for listener in self.__listeners:
+            try:
+                listener(serialized)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.warning(f"Failed to publish update of job {job.id}: {error}")
+
+    def __prune__(self) -> None:
+        finished = [job.id for job in self.__jobs.values() if job.done]
+
+        for job_id in finished[: max(0, len(finished) - self.retain)]:
+            del self.__jobs[job_id]
+
+    def expire(self, name: str) -> None:
+        """
+        Marks the results of every job with the given name as stale, so the next coalesced submission
+        runs the task again, rather than attaching to a job started before now.
+
+        Parameters:
+            name (str): what the jobs do, ie. 'db/update'
+
+        Returns:
+            None
+        """
+
+        self.__expired[name] = time.time()
+
+    def __reusable__(self, name: str, fresh_for: float) -> Optional[Job]:
+        """
+        Finds the most recent job with the given name, if it's still running, or succeeded within the
+        last `fresh_for` seconds, and was submitted since the jobs with that name last expired.
+        """
+
+        expired = self.__expired.get(name, 0.0)
+
+        for job in reversed(self.__jobs.values()):
+            if job.name != name or job.status in (FAILED, CANCELLED) or job.cancelled:
+                continue
+
+            if job.created <= expired:
+                return None
+
+            if not job.done or (fresh_for > 0 and time.time() - (job.finished or 0.0) < fresh_for):
+                return job
+
+            return None
+
+        return None
+
+    def submit(
+        self,
+        name: str,
+        task: Callable[[Job], Any],
+        coalesce: bool = False,
+        fresh_for: float = 0.0,
+        invalidates: Tuple[str, ...] = (),
+        excludes: Tuple[str, ...] = (),
+    ) -> Job:
+        """
+        Queues a task to run in the background.
+
+        Parameters:
+            name (str): what the job does, ie. 'packages/install'
+            task (Callable[[Job], Any]): the operation, which is passed the job to report its progress
+                through. Its return value (which must be JSON serializable) becomes the result of the job
+            coalesce (bool): if True, an unfinished job with the same name is returned instead of a new one
+            fresh_for (float): if coalescing, the number of seconds a succeeded job with the same name is returned for
+            invalidates (Tuple[str, ...]): the names of the jobs whose results are stale once this job finishes
+            excludes (Tuple[str, ...]): the names of the jobs this job must not run alongside (checked after coalescing)
+
+        Returns:
+            job (Job): the queued job, or the job it was coalesced with
+
+        Raises:
+            JobQueueFull: if `max_pending` jobs are already waiting to run
+            JobConflict: if a job named in `excludes` hasn't finished
+        """
+
+        with self.__lock:
+            existing = self.__reusable__(name, fresh_for) if coalesce else None
+
+            if coalesce:
+                metrics.cache_lookup(name, existing is not None)
+
+            if existing is not None:
+                logger.info(f"Attaching to job {existing.id} ({name}), rather than starting another")
+                return existing
+
+            conflict = next((job for job in self.__jobs.values() if job.name in excludes and not job.done), None)
+
+            if conflict is not None:
+                raise JobConflict(f"Job {name} can't run until job {conflict.id} ({conflict.name}) has finished")
+
+            if sum(1 for job in self.__jobs.values() if job.status == PENDING) >= self.max_pending:
+                raise JobQueueFull(f"Too many jobs waiting to run, the limit is {self.max_pending}")
+
+            self.__prune__()
+            job = Job(name, task, self.__notify__)
+            job.invalidates = invalidates
+            self.__jobs[job.id] = job
+
+        logger.info(f"Submitted job {job.id} ({name})")
+        self.__notify__(job)
+        self.__executor.submit(job.run)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.__jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        """
+        Lists the jobs that are running, waiting to run, or recently finished, oldest first.
+
+        Parameters:
+            None
+
+        Returns:
+            jobs (List[Job]): the jobs
+        """
+
+        return list(self.__jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancels a job (see Job.cancel).
+
+        Parameters:
+            job_id (str): the ID of the job
+
+        Returns:
+            job (Optional[Job]): the job, or None if there is no job with that ID
+        """
+
+        job = self.__jobs.get(job_id)
+
+        if job is not None:
+            job.cancel()
+
+        return job
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling of requests to the API, for diagnosing slow requests on a device without redeploying.
+
+Profiling is controlled by MMPM_API_PROFILING:
+    'off' (default): no request is profiled
+    'header': only requests with the X-MMPM-Profile header are profiled
+    a fraction, ie. '0.05': that fraction of requests is profiled, along with requests with the header
+
+Requests are profiled with cProfile. Each profile is saved to MMPM_PROFILES_DIR as '<id>.pstats' (load
+it with `python -m pstats`, or snakeviz), '<id>.collapsed' (one 'frame;frame;frame <microseconds>' line
+per stack, ie. for flamegraph.pl or speedscope), and '<id>.json' (what the request was). cProfile only
+records the caller of each call, not the entire stack, so the collapsed stacks are reconstructed from
+those, which is exact for code called from a single place, and an estimate otherwise.
+
+The API serves every request on a single thread (greenlets), so only one request is profiled at a time,
+and time spent in other greenlets while the request waits (ie. for a subprocess) counts towards it.
+"""
+import cProfile
+import json
+import pstats
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from mmpm.constants import paths
+from mmpm.env import MMPMEnv
+from mmpm.log.factory import MMPMLogFactory
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+HEADER = "X-MMPM-Profile"
+FORMATS = ("pstats", "collapsed")
+PROFILE_ID = re.compile(r"^[0-9]{8}T[0-9]{12}-[0-9a-f]{4}$")  # ie. 20240131T180005123456-0a1b, sorts by time
+
+Function = Tuple[str, int, str]
+
+
+def __frame__(function: Function) -> str:
+    filename, line, name = function
+
+    if filename == "~":  # built-in functions, ie. "<method 'read' of '_io.BufferedReader' objects>"
+        return name
+
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapse(stats: pstats.Stats, max_depth: int = 64) -> Dict[str, int]:
+    """
+    Reconstructs the stacks of a profile in the collapsed format used by flame graphs.
+
+    Starting from the functions without callers, each function's own time along a path is the time it
+    spent when called by the previous function, and the time of the functions it calls is scaled by the
+    share of its total time spent along that path.
+
+    Parameters:
+        stats (pstats.Stats): the profile
+        max_depth (int): the deepest stack reconstructed, deeper calls count towards the last frame
+
+    Returns:
+        stacks (Dict[str, int]): the microseconds spent in each stack, ie. {"main;load;read": 1200}
+    """
+
+    raw = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[Function, Dict[Function, Tuple[float, float]]] = defaultdict(dict)
+
+    for function, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, own, total) in callers.items():
+            callees[caller][function] = (own, total)
+
+    stacks: Dict[str, float] = defaultdict(float)
+
+    def walk(function: Function, stack: List[str], seen: set, own: float, total: float) -> None:
+        if total < 1e-6:  # too little to show up, and there may be a great many such paths
+            return
+
+        frames = stack + [__frame__(function)]
+        children = callees.get(function, {})
+        overall = raw[function][3]
+        share = total / overall if overall else 0.0
+
+        if len(frames) >= max_depth:
+            stacks[";".join(frames)] += total
+            return
+
+        stacks[";".join(frames)] += own
+
+        for child, (child_own, child_total) in children.items():
+            if child in seen:  # recursion, the time is already part of the caller
+                continue
+
+            walk(child, frames, seen | {child}, child_own * share, child_total * share)
+
+    for function, (_, _, own, total, callers) in raw.items():
+        if not callers:
+            walk(function, [], {function}, own, total)
+
+    return {stack: round(seconds * 1e6) for stack, seconds in stacks.items() if round(seconds * 1e6) > 0}
+
+
+class RequestProfiler:
+    """
+    Decides which requests are profiled, profiles them, and keeps the most recent profiles.
+
+    Attributes:
+        directory (Path): where the profiles are saved
+        retain (int): the number of profiles kept, older profiles are deleted
+    """
+
+    def __init__(self, directory: Path = paths.MMPM_PROFILES_DIR, retain: int = 50):
+        self.directory = directory
+        self.retain = retain
+        self.env = MMPMEnv()
+        self.__lock = threading.Lock()
+        self.__profile: Optional[cProfile.Profile] = None
+        self.__start = 0.0
+
+    def wanted(self, headers: Dict[str, str]) -> bool:
+        """
+        Decides whether a request should be profiled, according to MMPM_API_PROFILING.
+
+        Parameters:
+            headers (Dict[str, str]): the headers of the request
+
+        Returns:
+            bool: True if the request should be profiled
+        """
+
+        mode = str(self.env.MMPM_API_PROFILING.get()).strip().lower()
+
+        if mode in ("", "off", "0", "false"):
+            return False
+
+        if headers.get(HEADER):
+            return True
+
+        if mode == "header":
+            return False
+
+        try:
+            return random.random() < float(mode)
+        except ValueError:
+            logger.warning(f"Invalid MMPM_API_PROFILING value '{mode}', expected 'off', 'header', or a fraction such as '0.1'")
+            return False
+
+    def start(self) -> bool:
+        """
+        Starts profiling, unless another request is already being profiled.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True if profiling started, in which case `stop` must be called
+        """
+
+        if not self.__lock.acquire(blocking=False):
+            return False
+
+        self.__profile = cProfile.Profile()
+        self.__start = time.perf_counter()
+        self.__profile.enable()
+        return True
+
+    def stop(self, method: str, route: str, path: str, status: int) -> Optional[str]:
+        """
+        Stops profiling and saves the profile.
+
+        Parameters:
+            method (str): the method of the request, ie. 'GET'
+            route (str): the route which handled the request, ie. '/api/packages/'
+            path (str): the path of the request
+            status (int): the status of the response
+
+        Returns:
+            profile_id (Optional[str]): the ID of the saved profile, None if it couldn't be saved
+        """
+
+        profile = self.__profile
+
+        try:
+            if profile is None:
+                return None
+
+            profile.disable()
+            duration = time.perf_counter() - self.__start
+            return self.__save__(profile, {"method": method, "route": route, "path": path, "status": status, "duration": duration})
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.error(f"Failed to save the profile of {method} {path}: {error}")
+            return None
+        finally:
+            self.__profile = None
+            self.__lock.release()
+
+    def __save__(self, profile: cProfile.Profile, details: dict) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        now = datetime.now()
+        profile_id = f"{now.strftime('%Y%m%dT%H%M%S%f')}-{uuid4().hex[:4]}"
+        stats = pstats.Stats(profile)
+
+        stats.dump_stats(str(self.directory / f"{profile_id}.pstats"))
+
+        with open(self.directory / f"{profile_id}.collapsed", "w", encoding="utf-8") as collapsed:
+            for stack, microseconds in sorted(collapse(stats).items()):
+                collapsed.write(f"{stack} {microseconds}\n")
+
+        with open(self.directory / f"{profile_id}.json", "w", encoding="utf-8") as metadata:
+            json.dump({"id": profile_id, "created": str(now.replace(microsecond=0)), **details}, metadata)
+
+        logger.info(f"Saved profile {profile_id} of {details['method']} {details['path']} ({details['duration']:.3f}s)")
+        self.__prune__()
+        return profile_id
+
+    def __prune__(self) -> None:
+        for metadata in sorted(self.directory.glob("*.json"))[: -self.retain or None]:
+            for suffix in (".json", *(f".{fmt}" for fmt in FORMATS)):
+                metadata.with_suffix(suffix).unlink(missing_ok=True)
+
+    def profiles(self) -> List[dict]:
+        """
+        Lists the saved profiles, most recent first.
+
+        Parameters:
+            None
+
+        Returns:
+            profiles (List[dict]): what each profiled request was, ie. {"id": "...", "route": "/api/packages/", "duration": 1.2, ...}
+        """
+
+        if not self.directory.exists():
+            return []
+
+        profiles = []
+
+        for metadata in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                with open(metadata, "r", encoding="utf-8") as details:
+                    profiles.append(json.load(details))
+            except (OSError, ValueError) as error:
+                logger.debug(f"Skipping unreadable profile {metadata}: {error}")
+
+        return profiles
+
+    def path(self, profile_id: str, fmt: str) -> Optional[Path]:
+        """
+        Finds the file of a saved profile.
+
+        Parameters:
+            profile_id (str): the ID of the profile
+            fmt (str): one of FORMATS
+
+        Returns:
+            path (Optional[Path]): the file, or None if there is no such profile or format
+        """
+
+        if fmt not in FORMATS or not PROFILE_ID.match(profile_id):
+            return None
+
+        path = self.directory / f"{profile_id}.{fmt}"
+        return path if path.exists() else None
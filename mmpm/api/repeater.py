@@ -6,48 +6,126 @@ other than the one hosting MMPM. It's weird, it's annoying, but it's the workaro
 solution later on, but for now this is what works. Otherwise, users would need to be told how to modify MagicMirror's
 source code, and let's face it, practically nobody is going to want to do that. The other option is to make a PR to MagicMirror
 but I'm sure it won't get accepted for security purposes.
+
+The repeater keeps the last state of the modules it heard of, which it sends to UI clients as soon as they connect,
+rather than asking MagicMirror again for every client. The state is refreshed when the repeater (re)connects to
+MagicMirror, and every REFRESH_INTERVAL seconds while UI clients are connected.
+
+Clients which already have the state of the modules are only sent what changed ('modules_changed' events, holding the
+key and changed fields of each module that changed), unless modules were added, removed, or reordered.
+
+The repeater connects to MagicMirror in the background while UI clients are connected, waiting longer after each
+failed attempt, and tells the UI clients whether it is connected with 'magicmirror' events.
 """
 from gevent import monkey
 
 monkey.patch_all()
 
-from time import sleep
+import random
+from typing import List, Optional
 
 import socketio
 
 from mmpm.env import MMPMEnv
 from mmpm.log.factory import MMPMLogFactory
+from mmpm.magicmirror.controller import TIMEOUT
+from mmpm.magicmirror.modules import ModuleStates
 
 logger = MMPMLogFactory.get_logger(__name__)
 
+REFRESH_INTERVAL = 30.0
+ROOM = "modules"  # every UI client, which the state of the modules is broadcast to
+RECONNECT_DELAY = (1.0, 30.0)  # the first and longest wait between attempts to connect to MagicMirror
+
+
+def attach(server: socketio.Server, namespace: str = "/", refresh: float = REFRESH_INTERVAL) -> None:
+    """
+    Serves the repeater from a namespace of a SocketIO server.
+
+    Parameters:
+        server (socketio.Server): the SocketIO server
+        namespace (str): the namespace the UI clients connect to, ie. '/repeater' when served alongside the API (see mmpm.server)
+        refresh (float): seconds between refreshes of the state of the modules while UI clients are connected
+
+    Returns:
+        None
+    """
 
-def create():
-    server = socketio.Server(cors_allowed_origins="*", async_mode="gevent", logger=logger)
-    app = socketio.WSGIApp(server)
     env = MMPMEnv()
-    mm_client = socketio.Client(request_timeout=300, logger=logger)
+    mm_client = socketio.Client(reconnection=False, request_timeout=TIMEOUT, logger=logger)
     client_ids = set()
-
-    def setup_mm_client():
+    states = ModuleStates()
+    refresher = []  # the background task refreshing the state of the modules, once started
+    connection = {"connecting": False, "retry_in": None, "reconnected": False}  # the state of the background connection to MagicMirror
+
+    def request_states():
+        # rather than mm_client.connected, which is only set once connect() returns, after the namespace connects
+        if "/MMM-mmpm" in mm_client.namespaces:
+            mm_client.emit("FROM_MMPM_APP_get_active_modules", namespace="/MMM-mmpm", data={})
+            logger.debug("Emitted data request to MagicMirror SocketIO server")
+
+    def refresh_states():
+        # stops once the last client leaves, and is started again by the next one to connect
+        while client_ids:
+            server.sleep(refresh)
+
+            if client_ids:
+                request_states()
+
+        refresher.clear()
+
+    def send_states(before: Optional[List[dict]] = None):
+        changes = None if before is None else states.delta(before)
+
+        if changes is None:
+            logger.debug(f"Repeating the state of the modules to {len(client_ids)} client(s)")
+            server.emit("modules", data=states.snapshot(), to=ROOM, namespace=namespace)
+        elif changes:
+            logger.debug(f"Repeating the changes to the state of the modules to {len(client_ids)} client(s): {changes}")
+            server.emit("modules_changed", data=changes, to=ROOM, namespace=namespace)
+
+    def send_snapshot(sid: str):
+        # otherwise the client is told MagicMirror is disconnected, and is sent the modules once it's connected again
+        if states.known and "/MMM-mmpm" in mm_client.namespaces:
+            server.emit("modules", data=states.snapshot(), to=sid, namespace=namespace)
+
+    def publish_connection(connected: bool, to=None):
+        state = {"connected": connected, "retry_in": None if connected else connection["retry_in"]}
+        server.emit("magicmirror", data=state, to=to, namespace=namespace)
+
+    def connect_to_magicmirror(delay: float):
         attempt = 0
-        max_retries = 250
-
-        logger.debug("Attempting to connect to MagicMirror SocketIO server. Using a maximum of 250 retries")
 
-        while attempt < max_retries and not mm_client.connected:
-            try:
-                mm_client.connect(env.MMPM_MAGICMIRROR_URI.get(), wait_timeout=10, wait=True)
-                logger.debug("Successfully connected to the MagicMirror SocketIO server")
-                break  # Connection successful, break out of the loop
-            except Exception:
-                attempt += 1
-                sleep(1)
+        try:
+            while client_ids and not mm_client.connected:
+                server.sleep(delay)
+
+                try:
+                    mm_client.connect(env.MMPM_MAGICMIRROR_URI.get(), wait_timeout=10, wait=True)
+                    logger.debug("Successfully connected to the MagicMirror SocketIO server")
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    # the jitter keeps repeaters (ie. of several UIs) from retrying in lockstep after MagicMirror restarts
+                    delay = min(RECONNECT_DELAY[0] * 2**attempt, RECONNECT_DELAY[1]) * random.uniform(0.5, 1.0)
+                    attempt += 1
+                    connection["retry_in"] = round(delay, 1)
+
+                    logger.debug(f"Failed to connect to the MagicMirror SocketIO server ({error}), retrying in {delay:.1f} seconds")
+                    publish_connection(False)
+        finally:
+            connection["connecting"] = False
+            connection["retry_in"] = None
+
+        # every client left while connecting
+        if mm_client.connected and not client_ids:
+            mm_client.disconnect()
 
-        if attempt == max_retries:
-            logger.error("Maximum retry attempts reached, failed to connect.")
+    def ensure_connection(delay: float = 0.0):
+        if not connection["connecting"]:
+            connection["connecting"] = True
+            server.start_background_task(connect_to_magicmirror, delay)
 
-    @server.on("reconnect")
-    @server.on("connect")
+    @server.on("reconnect", namespace=namespace)
+    @server.on("connect", namespace=namespace)
     def connect(sid, environ):  # pylint: disable=unused-argument
         logger.debug(f"Client connected to SocketIO-Repeater: {sid}")
 
@@ -55,10 +133,25 @@ def create():
             logger.debug(f"Added {sid} to known Client IDs")
             client_ids.add(sid)
 
+        server.enter_room(sid, ROOM, namespace=namespace)
+
+        # emitted after this handler returns, so it follows, rather than precedes, the acceptance of the connection.
+        # The UI doesn't ask for the modules once connected, this is the only time the client is sent them in full
+        server.start_background_task(send_snapshot, sid)
+
+        if states.age() > refresh:
+            request_states()
+
+        if not refresher:
+            refresher.append(server.start_background_task(refresh_states))
+
+        # the connection is made in the background, so MagicMirror being down doesn't hold up the connection of the client
+        server.start_background_task(publish_connection, mm_client.connected, sid)
+
         if not mm_client.connected:
-            setup_mm_client()
+            ensure_connection()
 
-    @server.event
+    @server.on("disconnect", namespace=namespace)
     def disconnect(sid):
         logger.debug(f"Client disconnected: {sid}")
 
@@ -70,32 +163,62 @@ def create():
             logger.debug("No clients connected. Disconnecting from MagicMirror SocketIO Server.")
             mm_client.disconnect()
 
-    @server.event
-    def request_modules(sid):  # pylint: disable=unused-argument
+    # the modules are sent on connect, but a client may ask for them again
+    @server.on("request_modules", namespace=namespace)
+    def request_modules(sid):
         logger.debug(f"SocketIO-Repeater connected to MagicMirror SocketIO server: {mm_client.connected}")
-        mm_client.emit("FROM_MMPM_APP_get_active_modules", namespace="/MMM-mmpm", data={})
-        logger.debug("Emitted data request to MagicMirror SocketIO server")
 
-    @server.event
+        send_snapshot(sid)
+
+        if states.age() > refresh:
+            request_states()
+
+    @server.on("error", namespace=namespace)
     def error(sid):
         logger.debug(f"Client encountered error: {sid}")
 
+    @mm_client.on("connect", namespace="/MMM-mmpm")
+    def mm_connect():
+        logger.debug("Connected to MagicMirror SocketIO server, refreshing the state of the modules")
+        connection["reconnected"] = True
+        request_states()
+        publish_connection(True)
+
+    @mm_client.on("disconnect", namespace="/MMM-mmpm")
+    def mm_disconnect(*_):
+        logger.debug("Disconnected from MagicMirror SocketIO server")
+        publish_connection(False)
+
+        if client_ids:
+            # ie. MagicMirror restarting, which takes a moment
+            ensure_connection(RECONNECT_DELAY[0])
+
     # Event handler for receiving data from server2
     @mm_client.on("ACTIVE_MODULES", namespace="/MMM-mmpm")
     def active_modules(data):
         logger.debug(f"Received data from MagicMirror SocketIO Server: {data}")
 
-        for client_id in client_ids:
-            logger.debug(f"Repeating data to {client_id}")
-            server.emit("modules", data=data, to=client_id)
+        # the clients were told MagicMirror was disconnected, so they need the entire state again after reconnecting
+        before = states.snapshot() if states.known and not connection["reconnected"] else None
+        connection["reconnected"] = False
+
+        if states.replace(data) or before is None:
+            send_states(before)
 
     # Event handler for receiving data from server2
     @mm_client.on("MODULES_TOGGLED", namespace="/MMM-mmpm")
     def modules_toggled(data):
         logger.debug(f"Received toggled modules from MagicMirror SocketIO Server: {data}")
 
-        for client_id in client_ids:
-            logger.debug(f"Repeating data to {client_id}")
-            server.emit("modules", data=data, to=client_id)
+        before = states.snapshot()
+
+        if states.merge(data):
+            send_states(before)
 
+
+def create():
+    server = socketio.Server(cors_allowed_origins="*", async_mode="gevent", logger=logger)
+    attach(server)
+
+    app = socketio.WSGIApp(server)
     return app
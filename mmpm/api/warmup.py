@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Loads what the first requests to the API need before the API starts serving them, so the first visit to
+the UI after a reboot isn't the one paying for it.
+
+The warmup is run by the gunicorn hooks in mmpm.api.gunicorn_config: by each worker once it has booted,
+or, when gunicorn is started with `--preload`, once by the master process before it forks the workers,
+which then share the loaded state (copy-on-write) rather than each loading their own.
+"""
+import time
+
+from mmpm.constants import paths
+from mmpm.env import MMPM_DEFAULT_ENV, MMPMEnv
+from mmpm.log.factory import MMPMLogFactory
+from mmpm.magicmirror.database import MagicMirrorDatabase
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+def warmup() -> bool:
+    """
+    Reads the environment variables, loads the package database, and discovers the installed packages,
+    filling the caches of each. The database is only loaded if it has already been downloaded, so a
+    worker never waits on the network to boot. Failures are logged rather than raised, since the API
+    can still serve requests without the warmup.
+
+    Parameters:
+        None
+
+    Returns:
+        bool: True if everything was loaded, False otherwise
+    """
+
+    start = time.perf_counter()
+
+    try:
+        env = MMPMEnv()
+
+        for name in MMPM_DEFAULT_ENV:
+            getattr(env, name).get()
+
+        db = MagicMirrorDatabase()
+        downloaded = [paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_FILE, paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_LAST_UPDATE_FILE]
+
+        if not all(path.exists() and path.stat().st_size for path in downloaded):
+            logger.info("Skipping the warmup of the package database, it hasn't been downloaded yet")
+            return False
+
+        db.load()
+        db.upgradable()
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        logger.error(f"Failed to warm up the API: {error}")
+        return False
+
+    logger.info(f"Warmed up the API in {time.perf_counter() - start:.3f}s ({len(db.packages)} packages)")
+    return True
@@ -10,6 +10,9 @@ MMPM_CUSTOM_PACKAGES_FILE = MMPM_CONFIG_DIR / "mmpm-custom-packages.json"
 MMPM_AVAILABLE_UPGRADES_FILE = MMPM_CONFIG_DIR / "mmpm-available-upgrades.json"
 MAGICMIRROR_3RD_PARTY_PACKAGES_DB_FILE = MMPM_CONFIG_DIR / "MagicMirror-3rd-party-packages-db.json"
 MAGICMIRROR_3RD_PARTY_PACKAGES_DB_LAST_UPDATE_FILE = MMPM_CONFIG_DIR / "MagicMirror-3rd-party-packages-db-last-update.json"
+MMPM_LOG_SERVER_SOCKET_FILE = MMPM_CONFIG_DIR / "mmpm-log-server.sock"  # created by mmpm.log.server
+MMPM_PROFILES_DIR = MMPM_LOG_DIR / "profiles"  # created by mmpm.api.profiling
+MMPM_SUPERVISOR_STATE_FILE = MMPM_CONFIG_DIR / "mmpm-supervisor.json"  # created by mmpm.supervisor
 
 # Setup the directories and files
 MMPM_CONFIG_DIR.mkdir(exist_ok=True, parents=True)
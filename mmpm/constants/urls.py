@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
-from mmpm.utils import get_host_ip
-
-HOST = f"{get_host_ip()}"
+from typing import Any
 
 MMPM_UI_PORT = 7890
 MMPM_API_SERVER_PORT = 7891
@@ -15,3 +13,27 @@ MMPM_WIKI_URL = "https://github.com/Bee-Mar/mmpm/wiki"
 MAGICMIRROR_WIKI_URL: str = "https://github.com/MagicMirrorOrg/MagicMirror/wiki"
 MAGICMIRROR_DOCUMENTATION_URL: str = "https://docs.magicmirror.builders/"
 MAGICMIRROR_MODULES_URL: str = "https://github.com/MagicMirrorOrg/MagicMirror/wiki/3rd-party-modules"
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Lazily resolves network facts about the host the first time they are
+    accessed (ie. `urls.HOST`), rather than when this module is imported. The
+    result is cached as a regular module attribute, so the lookup only happens
+    once per process, and only for commands that actually need it.
+
+    Parameters:
+        name (str): the name of the attribute being accessed
+
+    Returns:
+        value (Any): the resolved value of the attribute
+    """
+
+    if name == "HOST":
+        from mmpm.utils import get_host_ip  # pylint: disable=import-outside-toplevel
+
+        host = f"{get_host_ip()}"
+        globals()[name] = host
+        return host
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -4,10 +4,9 @@ from argparse import ArgumentParser
 
 import argcomplete
 
-import mmpm.subcommands
 from mmpm.constants import urls
 from mmpm.log.factory import MMPMLogFactory
-from mmpm.subcommands.loader import Loader
+from mmpm.subcommands import manifest
 
 logger = MMPMLogFactory.get_logger(__name__)
 
@@ -15,7 +14,8 @@ logger = MMPMLogFactory.get_logger(__name__)
 # for the console script
 def main():
     """
-    Initializes all subcommand and their options.
+    Registers all subcommands and their options from the subcommand manifest,
+    then imports and executes only the subcommand that was invoked.
 
     Parameters:
         None
@@ -47,20 +47,11 @@ def main():
         metavar="",
     )
 
-    loader = Loader(
-        module_path=mmpm.subcommands.__path__,
-        module_name="mmpm.subcommands",
-        app_name=app_name,
-        prefix="_sub_cmd",
-    )
-
-    for subcommand in loader.objects.values():
-        subcommand.register(subparser)
-
+    manifest.register(subparser, app_name)
     argcomplete.autocomplete(parser)
 
     args, extra = parser.parse_known_args()
-    subcommand = loader.objects.get(args.subcmd)
+    subcommand = manifest.load(args.subcmd, app_name)
 
     if not subcommand:
         logger.debug(f"Unable to match '{args.subcmd}' to a valid subcommand")
@@ -3,10 +3,7 @@ import json
 from os.path import getmtime
 from pathlib import Path
 
-from pygments import highlight
-from pygments.formatters.terminal import TerminalFormatter
-from pygments.lexers.data import JsonLexer
-
+from mmpm import metrics
 from mmpm.constants import color, paths
 from mmpm.singleton import Singleton
 
@@ -17,6 +14,11 @@ MMPM_DEFAULT_ENV: dict = {
     "MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE": "",
     "MMPM_IS_DOCKER_IMAGE": False,
     "MMPM_LOG_LEVEL": "INFO",
+    "MMPM_LOG_MODE": "immediate",
+    "MMPM_LOG_JSON_BACKEND": "json",
+    "MMPM_LOG_SAMPLING": "",
+    "MMPM_DB_UPDATE_INTERVAL": 60,
+    "MMPM_API_PROFILING": "off",
 }
 
 
@@ -61,8 +63,11 @@ class EnvVar:
         """
 
         mtime: float = getmtime(paths.MMPM_ENV_FILE)
+        cached = mtime == self.__mtime and self.__value is not None
+
+        metrics.cache_lookup("env", cached)
 
-        if mtime != self.__mtime or self.__value is None:  # cache the value until the file modification time changes
+        if not cached:  # cache the value until the file modification time changes
             with open(paths.MMPM_ENV_FILE, "r", encoding="utf-8") as env:
                 env_vars = {}
 
@@ -97,6 +102,11 @@ class MMPMEnv(Singleton):
         MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE (EnvVar): Environment variable for the Docker compose file path.
         MMPM_IS_DOCKER_IMAGE (EnvVar): Environment variable indicating if MMPM is running as a Docker image.
         MMPM_LOG_LEVEL (EnvVar): Environment variable for the logging level.
+        MMPM_LOG_MODE (EnvVar): Environment variable for how log files are written, either 'immediate' or 'buffered'.
+        MMPM_LOG_JSON_BACKEND (EnvVar): Environment variable for how log records are serialized, either 'json' or 'orjson'.
+        MMPM_LOG_SAMPLING (EnvVar): Environment variable for the fraction of records of each level the log server sends to the UI, ie. 'DEBUG=0.1'.
+        MMPM_DB_UPDATE_INTERVAL (EnvVar): Environment variable for the number of seconds the UI reuses the result of a database update for.
+        MMPM_API_PROFILING (EnvVar): Environment variable for which API requests are profiled, either 'off', 'header', or a fraction of requests.
 
     Methods:
         __init__(): Initializes the MMPMEnv instance, loading environment variables from MMPM_ENV_FILE.
@@ -114,6 +124,11 @@ class MMPMEnv(Singleton):
         self.MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE: EnvVar = None
         self.MMPM_IS_DOCKER_IMAGE: EnvVar = None
         self.MMPM_LOG_LEVEL: EnvVar = None
+        self.MMPM_LOG_MODE: EnvVar = None
+        self.MMPM_LOG_JSON_BACKEND: EnvVar = None
+        self.MMPM_LOG_SAMPLING: EnvVar = None
+        self.MMPM_DB_UPDATE_INTERVAL: EnvVar = None
+        self.MMPM_API_PROFILING: EnvVar = None
 
         env_vars = {}
 
@@ -147,4 +162,9 @@ class MMPMEnv(Singleton):
         return current_env
 
     def display(self) -> None:  # pragma: no cover
+        # pylint: disable=import-outside-toplevel
+        from pygments import highlight
+        from pygments.formatters.terminal import TerminalFormatter
+        from pygments.lexers.data import JsonLexer
+
         print(highlight(json.dumps(self.get(), indent=2), JsonLexer(), TerminalFormatter()))
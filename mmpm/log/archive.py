@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Builds archives of the MMPM log files as a stream of chunks, so an archive can be sent straight to an
+HTTP response (or written to a file by the CLI) without ever being written to a temporary file.
+
+Without a time range, every file in the log directory is archived as-is. With a time range, the
+records of the JSON log files (including rotated files) within the range are archived as a single
+mmpm-cli.log, along with any other files modified since the start of the range.
+"""
+import io
+import os
+import json
+import tarfile
+import time
+import zipfile
+from datetime import datetime
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from mmpm.constants import paths
+from mmpm.log import reader
+
+# format: (MIME type, file extension)
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "zip": ("application/zip", "zip"),
+    "tar.gz": ("application/gzip", "tar.gz"),
+    "tar.zst": ("application/zstd", "tar.zst"),
+}
+
+CHUNK_SIZE = 64 * 1024
+
+Member = Tuple[str, float, Union[Path, Iterator[bytes]]]
+
+
+def available_formats() -> List[str]:
+    """
+    Lists the archive formats supported in this environment. Zstandard compression is only available
+    if the zstandard package is installed.
+
+    Parameters:
+        None
+
+    Returns:
+        formats (List[str]): the names of the formats, ie. ['zip', 'tar.gz']
+    """
+
+    return [name for name in FORMATS if name != "tar.zst" or find_spec("zstandard") is not None]
+
+
+def file_name(archive_format: str = "zip") -> str:
+    """
+    The name an archive created today is saved as, ie. 'mmpm-logs-2024-1-31.zip'.
+
+    Parameters:
+        archive_format (str): one of FORMATS
+
+    Returns:
+        name (str): the file name
+    """
+
+    today = datetime.now()
+    return f"mmpm-logs-{today.year}-{today.month}-{today.day}.{FORMATS[archive_format][1]}"
+
+
+class ChunkSink(io.RawIOBase):
+    """
+    A write-only, unseekable file object which collects whatever the archive writer produces until
+    it's drained. The zipfile and tarfile modules both support streaming into such an object.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__chunks: List[bytes] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.__chunks.append(data)
+        self.size += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        """
+        Returns everything written since the last call, and empties the sink.
+
+        Returns:
+            data (bytes): the archive data
+        """
+
+        data = b"".join(self.__chunks)
+        self.__chunks.clear()
+        self.size = 0
+        return data
+
+
+def __read__(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as source:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+
+            if not chunk:
+                return
+
+            yield chunk
+
+
+def __filtered__(path: Path, log_filter: reader.LogFilter) -> Iterator[bytes]:
+    for record in reader.read(path, log_filter):
+        yield (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def members(directory: Path = paths.MMPM_LOG_DIR, log_filter: Optional[reader.LogFilter] = None) -> Iterator[Member]:
+    """
+    Lists the contents of the archive.
+
+    Parameters:
+        directory (Path): the log directory
+        log_filter (Optional[reader.LogFilter]): if given, only records within its time range are archived
+
+    Returns:
+        members (Iterator[Member]): the name, modification time, and either the path or contents of each file
+    """
+
+    files = sorted(path for path in directory.iterdir() if path.is_file() and not path.is_symlink())
+
+    if log_filter is None or not (log_filter.since or log_filter.until):
+        for path in files:
+            yield path.name, path.stat().st_mtime, path
+        return
+
+    log_file = directory / paths.MMPM_CLI_LOG_FILE.name
+    json_files = set(reader.log_files(log_file))
+
+    yield log_file.name, time.time(), __filtered__(log_file, log_filter)
+
+    since = datetime.strptime(log_filter.since, reader.TIMESTAMP_FORMAT).timestamp() if log_filter.since else 0
+
+    for path in files:
+        if path not in json_files and path.stat().st_mtime >= since:
+            yield path.name, path.stat().st_mtime, path
+
+
+def __zip__(sink: ChunkSink, contents: Iterator[Member]) -> Iterator[bytes]:
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, mtime, source in contents:
+            info = zipfile.ZipInfo(name, date_time=time.localtime(mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+
+            with archive.open(info, "w") as member:
+                for chunk in __read__(source) if isinstance(source, Path) else source:
+                    member.write(chunk)
+
+                    if sink.size >= CHUNK_SIZE:
+                        yield sink.drain()
+
+
+def __tar__(output, sink: ChunkSink, contents: Iterator[Member]) -> Iterator[bytes]:
+    with tarfile.open(fileobj=output, mode="w|gz" if output is sink else "w|") as archive:
+        for name, mtime, source in contents:
+            info = tarfile.TarInfo(name)
+            info.mtime = int(mtime)
+            info.mode = 0o644
+
+            # a tar header needs the size up front, so each file is held in memory (bounded by the size of the log
+            # files), rather than streamed, since a live log file may grow or be rotated while it's being read
+            if isinstance(source, Path):
+                with open(source, "rb") as member:
+                    data = member.read(os.fstat(member.fileno()).st_size)
+            else:
+                data = b"".join(source)
+
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+            if sink.size >= CHUNK_SIZE:
+                yield sink.drain()
+
+
+def stream(archive_format: str = "zip", log_filter: Optional[reader.LogFilter] = None, directory: Path = paths.MMPM_LOG_DIR) -> Iterator[bytes]:
+    """
+    Builds an archive of the log files, yielding it in chunks of roughly CHUNK_SIZE bytes as it's built.
+
+    Parameters:
+        archive_format (str): one of `available_formats()`
+        log_filter (Optional[reader.LogFilter]): if given, only records within its time range are archived
+        directory (Path): the log directory
+
+    Returns:
+        chunks (Iterator[bytes]): the archive
+
+    Raises:
+        ValueError: if the format isn't available
+    """
+
+    if archive_format not in available_formats():
+        raise ValueError(f"Unsupported archive format '{archive_format}', expected one of {available_formats()}")
+
+    sink = ChunkSink()
+    contents = members(directory, log_filter)
+
+    if archive_format == "zip":
+        yield from __zip__(sink, contents)
+    elif archive_format == "tar.gz":
+        yield from __tar__(sink, sink, contents)
+    else:
+        import zstandard  # pylint: disable=import-outside-toplevel
+
+        compressor = zstandard.ZstdCompressor().stream_writer(sink, closefd=False)
+        yield from __tar__(compressor, sink, contents)
+        compressor.close()
+
+    yield sink.drain()
@@ -1,24 +1,104 @@
 #!/usr/bin/env python3
-import datetime
+import atexit
+import gzip
+import importlib
 import json
 import logging
 import logging.handlers
 import os
+import queue
 import shutil
-from threading import Lock
-
-import socketio
+import socket
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from json.encoder import encode_basestring
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from mmpm.__version__ import version
-from mmpm.constants import paths
+from mmpm.constants import paths, urls
 from mmpm.env import MMPMEnv
 
 
+def __native__(module: str, name: str) -> Any:
+    """
+    Returns `module.name` as it was before gevent monkey patched the process (if it has). Without
+    this, a "thread" started from within the API would just be another greenlet, and any blocking
+    I/O it performs would stall every request being handled.
+
+    Parameters:
+        module (str): the name of the module, ie. '_thread'
+        name (str): the name of the attribute within the module
+
+    Returns:
+        attribute (Any): the unpatched attribute
+    """
+
+    monkey = sys.modules.get("gevent.monkey")
+
+    if monkey is not None:
+        return monkey.get_original(module, name)
+
+    return getattr(importlib.import_module(module), name)
+
+
 class JsonFormatter(logging.Formatter):
     """
     A custom formatter for logging, which outputs log records in a JSON format.
+
+    Formatting happens for every record written to the log files and the log server, so rather than
+    building a dict and serializing it, the fields which rarely change are encoded once and cached:
+    the timestamp (per second), and the level, logger name, module and function of each call site.
+    Only the message and line number are encoded for each record.
+
+    With backend='orjson', records are serialized by orjson instead (if it's installed). The output
+    is compact (no spaces after separators), but otherwise has the same fields.
     """
 
+    BACKENDS = ("json", "orjson")
+
+    def __init__(self, backend: str = "json"):
+        """
+        Initializes the JsonFormatter.
+
+        Parameters:
+            backend (str): Either 'json' (the standard library), or 'orjson'. Falls back to 'json' if orjson isn't installed.
+        """
+
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Invalid JSON backend '{backend}', expected one of {self.BACKENDS}")
+
+        super().__init__()
+        self.__timestamp = (-1, "")  # (second, formatted), a single tuple so it's replaced atomically
+        self.__fields: Dict[tuple, tuple] = {}
+        self.__dumps: Optional[Callable[[Dict[str, Any]], bytes]] = None
+
+        if backend == "orjson":
+            try:
+                import orjson  # pylint: disable=import-outside-toplevel
+            except ImportError:
+                pass
+            else:
+                self.__dumps = orjson.dumps
+
+        self.backend = "json" if self.__dumps is None else backend
+
+    def __timestamp__(self, record: logging.LogRecord) -> str:
+        """
+        Equivalent to `self.formatTime(record)`, but only calls strftime once per second.
+        """
+
+        second = int(record.created)
+        cached_second, timestamp = self.__timestamp
+
+        if second != cached_second:
+            timestamp = time.strftime(self.default_time_format, self.converter(second))
+            self.__timestamp = (second, timestamp)
+
+        return self.default_msec_format % (timestamp, record.msecs)
+
     def format(self, record):
         """
         Formats the log record into JSON.
@@ -36,66 +116,552 @@ class JsonFormatter(logging.Formatter):
             # Handling the case where formatting fails
             message = {"raw_message": record.msg, "args": record.args}
 
-        log_data = {
-            "timestamp": self.formatTime(record),
-            "level": record.levelname,
-            "version": version,
-            "message": message,
-            "logger_name": record.name,
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno,
-        }
+        timestamp = self.__timestamp__(record)
+
+        if self.__dumps is not None:
+            log_data = {
+                "timestamp": timestamp,
+                "level": record.levelname,
+                "version": version,
+                "message": message,
+                "logger_name": record.name,
+                "module": record.module,
+                "function": record.funcName,
+                "line": record.lineno,
+            }
+
+            return self.__dumps(log_data, default=str).decode("utf-8")
+
+        key = (record.levelname, record.name, record.module, record.funcName)
+        fields = self.__fields.get(key)
+
+        if fields is None:
+            level, name, module, function = (json.dumps(value, ensure_ascii=False) for value in key)
+            fields = (
+                f', "level": {level}, "version": {json.dumps(version)}, "message": ',
+                f', "logger_name": {name}, "module": {module}, "function": {function}, "line": ',
+            )
+            self.__fields[key] = fields
+
+        if isinstance(message, str):
+            message = encode_basestring(message)
+        else:
+            message = json.dumps(message, ensure_ascii=False, default=str)
 
-        return json.dumps(log_data, ensure_ascii=False)
+        return f'{{"timestamp": "{timestamp}"{fields[0]}{message}{fields[1]}{record.lineno}}}'
 
 
 class SocketIOHandler(logging.Handler):
-    """A logging handler that emits records with SocketIO."""
+    """
+    A logging handler that emits records with SocketIO, to the 'logs' event of the log server. It's the
+    fallback for platforms without Unix sockets (see MMPMLogFactory.__server_handler__), where the
+    UnixDatagramHandler can't be used.
+
+    Records are placed in a bounded buffer, and a background thread connects to the SocketIO server the
+    first time a record is emitted, then drains the buffer. Logging never waits on the network, and
+    processes that never emit a record never import socketio or open a connection.
+
+    If the SocketIO server can't be reached, or the connection is lost, records are dropped until
+    the next attempt to connect, which is made by the first record emitted after a delay. The delay
+    doubles after each failed attempt (up to `retry[1]`), and is reset once a connection succeeds, so
+    a long-lived process picks the log server up when it's started after it.
+
+    Attributes:
+        url (str): The URL of the SocketIO server.
+        capacity (int): The maximum number of records buffered while the handler is (re)connecting.
+        retry (Tuple[float, float]): The first and longest delay, in seconds, between attempts to connect.
+        sent (int): The number of records delivered to the SocketIO server.
+        dropped (int): The number of records discarded because the buffer was full, or the server was unreachable.
+    """
 
-    def __init__(self, host, port):
+    def __init__(self, host: str, port: int, capacity: int = 1000, timeout: float = 1.0, retry: Tuple[float, float] = (1.0, 60.0)):
         """
         Initializes the SocketIOHandler with a specified host and port for the SocketIO server.
 
         Parameters:
             host (str): The host name of the SocketIO server.
             port (int): The port number of the SocketIO server.
+            capacity (int): The maximum number of records to buffer before dropping new records.
+            timeout (float): The number of seconds to wait for a connection, and for buffered records to be sent on close.
+            retry (Tuple[float, float]): The first and longest delay, in seconds, between attempts to connect.
         """
 
         super().__init__()
         self.formatter = JsonFormatter()
-        self.sio = socketio.Client()
+        self.host = host
+        self.port = port
+        self.url = f"http://{host}:{port}"
+        self.capacity = capacity
+        self.timeout = timeout
+        self.retry = retry
+        self.sio = None
+        self.sent = 0
+        self.dropped = 0
+        self.__buffer: Deque[str] = deque()
+        self.__condition = Condition()
+        self.__thread: Optional[Thread] = None
+        self.__closed = False
+        self.__retry_at = 0.0  # the time.monotonic() before which records are dropped, rather than connecting
+        self.__delay = retry[0]
+
+    @property
+    def connected(self) -> bool:
+        """
+        Whether the handler is currently connected to the SocketIO server.
+
+        Returns:
+            bool: True if connected, False otherwise.
+        """
+        return self.sio is not None and self.sio.connected
+
+    def emit(self, record):
+        """
+        Buffers the log record to be sent to the SocketIO server by the background thread, starting
+        the thread if this is the first record.
+
+        Parameters:
+            record (logging.LogRecord): The log record to be emitted.
+        """
+
+        message = self.format(record)
+
+        with self.__condition:
+            unavailable = self.__thread is None and time.monotonic() < self.__retry_at
+
+            if self.__closed or unavailable or len(self.__buffer) >= self.capacity:
+                self.dropped += 1
+                return
+
+            self.__buffer.append(message)
+
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__run__, name="mmpm-socketio-log-handler", daemon=True)
+                self.__thread.start()
+
+            self.__condition.notify()
+
+    def __unavailable__(self) -> None:
+        """
+        Drops the buffered records, and schedules the next attempt to connect. The thread calling this exits
+        right after, and the next record emitted once the delay has passed starts a new one.
+        """
+
+        with self.__condition:
+            self.__retry_at = time.monotonic() + self.__delay
+            self.__delay = min(self.__delay * 2, self.retry[1])
+            self.dropped += len(self.__buffer)
+            self.__buffer.clear()
+            self.__thread = None
+
+    def __run__(self) -> None:
+        """
+        Connects to the SocketIO server, and sends buffered records until the handler is closed, or the
+        connection is lost. Nothing in here may use the MMPM logger, otherwise the records would be fed
+        back into this handler.
+        """
 
         try:
-            self.sio.connect(f"http://{host}:{port}", wait=False)
-        except socketio.exceptions.ConnectionError:
-            pass
+            # probing the port is far cheaper than importing socketio when the log server isn't running
+            socket.create_connection((self.host, self.port), timeout=self.timeout).close()
+
+            import socketio  # pylint: disable=import-outside-toplevel
+
+            self.sio = socketio.Client(reconnection=False)
+            self.sio.connect(self.url, transports=["websocket"], wait_timeout=self.timeout)
+        except Exception:  # the log server is optional, so any failure just means the records go nowhere for now
+            self.__unavailable__()
+            return
+
+        with self.__condition:
+            self.__delay = self.retry[0]
+
+        while True:
+            with self.__condition:
+                while not self.__buffer and not self.__closed:
+                    self.__condition.wait()
+
+                if not self.__buffer:
+                    break
+
+                messages = list(self.__buffer)
+                self.__buffer.clear()
+
+            for message in messages:
+                try:
+                    self.sio.emit("logs", message)
+                    self.sent += 1
+                except Exception:
+                    with self.__condition:
+                        self.dropped += 1
+
+            if not self.sio.connected:
+                self.__unavailable__()
+                return
+
+        self.sio.disconnect()
+
+    def close(self):
+        """
+        Sends any remaining buffered records, waiting at most `timeout` seconds, then closes the
+        connection to the SocketIO server.
+
+        Parameters:
+            None
+        """
+
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+            thread = self.__thread
+
+        if thread is not None:
+            thread.join(self.timeout)
+
+        super().close()
+
+
+class UnixDatagramHandler(logging.Handler):
+    """
+    A logging handler that sends each record as a single datagram to the Unix socket the log server
+    listens on (see mmpm.log.server). Unlike the SocketIOHandler, there is no connection to set up,
+    so short-lived CLI processes pay nothing beyond a sendto call per record. If the log server isn't
+    running, or can't keep up, records are dropped rather than blocking the caller.
+
+    Attributes:
+        path (str): The path of the Unix socket the log server listens on.
+        sent (int): The number of records sent to the log server.
+        dropped (int): The number of records that could not be sent.
+    """
+
+    MAX_DATAGRAM_SIZE: int = 64 * 1024
+
+    def __init__(self, path: Path):
+        """
+        Initializes the UnixDatagramHandler. The socket itself is created when the first record is emitted.
+
+        Parameters:
+            path (Path): The path of the Unix socket the log server listens on.
+        """
+
+        super().__init__()
+        self.formatter = JsonFormatter()
+        self.path = str(path)
+        self.sent = 0
+        self.dropped = 0
+        self.__socket: Optional[socket.socket] = None
 
     def emit(self, record):
         """
-        Emits the log record to the connected SocketIO server.
+        Sends the log record to the log server.
 
         Parameters:
             record (logging.LogRecord): The log record to be emitted.
         """
 
-        if self.sio.connected:
+        message = self.format(record).encode("utf-8")
+
+        if len(message) > self.MAX_DATAGRAM_SIZE:
+            self.dropped += 1
+            return
+
+        try:
+            if self.__socket is None:
+                self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                self.__socket.setblocking(False)
+
+            self.__socket.sendto(message, self.path)
+            self.sent += 1
+        except OSError:  # the log server isn't running, or its receive queue is full
+            self.dropped += 1
+
+    def close(self):
+        """
+        Closes the socket used to send records to the log server.
+
+        Parameters:
+            None
+        """
+
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
+
+        super().close()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    A QueueHandler with a maximum capacity, so a handler that can't keep up (ie. a slow SD card)
+    never causes memory to grow without bound, and the callers never wait on it. When the queue is
+    full, the overflow policy decides which record is discarded.
+
+    Attributes:
+        capacity (int): The maximum number of records held in the queue.
+        overflow (str): Either 'drop_oldest' or 'drop_newest'.
+        dropped (int): The number of records discarded because the queue was full.
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+    def __init__(self, capacity: int = 10000, overflow: str = "drop_oldest"):
+        """
+        Initializes the BoundedQueueHandler.
+
+        Parameters:
+            capacity (int): The maximum number of records held in the queue.
+            overflow (str): Either 'drop_oldest' to make room for new records, or 'drop_newest' to discard them.
+        """
+
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy '{overflow}', expected one of {self.OVERFLOW_POLICIES}")
+
+        # the unpatched SimpleQueue can be shared between greenlets and a native thread, and put never blocks
+        super().__init__(__native__("queue", "SimpleQueue")())
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of records waiting to be handled.
+
+        Returns:
+            int: the (approximate) size of the queue
+        """
+        return self.queue.qsize()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges the arguments into the message, so objects mutated after the call to the logger are
+        recorded as they were at the time. Unlike the base class, the record is otherwise left intact
+        for the formatters of the handlers behind the queue.
+
+        Parameters:
+            record (logging.LogRecord): The log record to be enqueued.
+
+        Returns:
+            logging.LogRecord: the prepared record
+        """
+
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+        except TypeError:
+            pass  # left as is, the JsonFormatter records the raw message and arguments
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Adds the record to the queue, applying the overflow policy if the queue is full.
+
+        Parameters:
+            record (logging.LogRecord): The log record to be enqueued.
+        """
+
+        if self.queue.qsize() >= self.capacity:
+            self.dropped += 1
+
+            if self.overflow == "drop_newest":
+                return
+
             try:
-                self.sio.emit("logs", self.formatter.format(record))
-            except Exception:
+                self.queue.get_nowait()
+            except queue.Empty:
                 pass
 
-    def close(self):
+        self.queue.put_nowait(record)
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    A RotatingFileHandler meant for SD cards, which holds formatted records in memory and writes them
+    in batches, rather than writing each record as it arrives. A batch is written once it reaches
+    `capacity` bytes, once the oldest record in it is `interval` seconds old, as soon as a record at
+    or above `flush_level` arrives, and when the handler is closed. Rotated files are gzip compressed.
+
+    Records still in memory are lost if the process is killed, so at most `interval` seconds of
+    records below `flush_level` are at risk.
+
+    Attributes:
+        interval (float): The maximum number of seconds a record is held in memory.
+        capacity (int): The number of bytes held in memory before they are written.
+        flush_level (int): Records at or above this level are written immediately, along with the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        interval: float = 30.0,
+        capacity: int = 64 * 1024,
+        flush_level: int = logging.WARNING,
+        **kwargs,
+    ):
+        """
+        Initializes the BufferedRotatingFileHandler.
+
+        Parameters:
+            filename (Path): The path of the log file.
+            interval (float): The maximum number of seconds a record is held in memory.
+            capacity (int): The number of bytes held in memory before they are written.
+            flush_level (int): Records at or above this level cause the batch to be written immediately.
+            kwargs: passed through to the RotatingFileHandler
+        """
+
+        self.interval = interval
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.__buffer: List[str] = []
+        self.__size = 0
+        self.__since = 0.0
+
+        super().__init__(filename, **kwargs)
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self.__compress__
+
+    @staticmethod
+    def __compress__(source: str, destination: str) -> None:
+        with open(source, "rb") as original, gzip.open(destination, "wb") as compressed:
+            shutil.copyfileobj(original, compressed)
+
+        os.remove(source)
+
+    def emit(self, record):
+        """
+        Adds the formatted record to the batch, writing the batch if any of the thresholds are reached.
+
+        Parameters:
+            record (logging.LogRecord): The log record to be emitted.
+        """
+
+        try:
+            message = self.format(record) + self.terminator
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+            return
+
+        now = time.monotonic()
+
+        if not self.__buffer:
+            self.__since = now
+
+        self.__buffer.append(message)
+        self.__size += len(message)
+
+        if record.levelno >= self.flush_level or self.__size >= self.capacity or now - self.__since >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the batch to the log file, rotating the file first if the batch doesn't fit.
+
+        Parameters:
+            None
+        """
+
+        with self.lock:
+            if not self.__buffer:
+                return
+
+            data = "".join(self.__buffer)
+            self.__buffer.clear()
+            self.__size = 0
+
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+
+                if self.maxBytes > 0 and self.stream.tell() + len(data) >= self.maxBytes:
+                    self.doRollover()
+
+                self.stream.write(data)
+                self.stream.flush()
+            except Exception:  # pylint: disable=broad-except
+                self.handleError(None)
+
+
+class NativeQueueListener(logging.handlers.QueueListener):
+    """
+    A QueueListener which handles records on a native thread, even when gevent has monkey patched
+    the process. Writing to the log files and the log server happens in parallel to the caller,
+    rather than on the caller's thread (or greenlet). If an `interval` is given, the handlers are
+    flushed whenever no record has arrived for that many seconds.
+    """
+
+    def __init__(self, log_queue, *handlers, respect_handler_level: bool = False, interval: Optional[float] = None):
+        """
+        Initializes the NativeQueueListener.
+
+        Parameters:
+            log_queue: The queue records are taken from.
+            handlers (logging.Handler): The handlers records are passed to.
+            respect_handler_level (bool): If True, the level of each handler is checked before passing it a record.
+            interval (Optional[float]): The number of idle seconds after which the handlers are flushed.
+        """
+
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.interval = interval
+        self.__done = None  # held by the thread until it exits, once started
+
+    def start(self):
         """
-        Closes the connection to the SocketIO server and performs any necessary cleanup.
+        Starts the thread handling records from the queue.
 
         Parameters:
             None
         """
 
-        if self.sio.connected:
-            self.sio.disconnect()
-            super().close()
+        self.__done = __native__("_thread", "allocate_lock")()
+        self.__done.acquire()
+        __native__("_thread", "start_new_thread")(self.__run__, (self.__done,))
+
+    def __run__(self, done) -> None:
+        try:
+            while True:
+                try:
+                    record = self.dequeue(True)
+                except queue.Empty:  # only raised when idle for longer than the interval
+                    for handler in self.handlers:
+                        handler.flush()
+                    continue
+
+                if record is self._sentinel:
+                    break
+
+                self.handle(record)
+        finally:
+            done.release()
+
+    def dequeue(self, block):
+        """
+        Takes the next record from the queue, waiting at most `interval` seconds if one was given.
+
+        Parameters:
+            block (bool): whether to wait for a record
+
+        Returns:
+            record (logging.LogRecord): the next record
+        """
+
+        return self.queue.get(block, self.interval)
+
+    def stop(self, timeout: float = 5.0):  # pylint: disable=arguments-differ
+        """
+        Handles the records remaining in the queue, waiting at most `timeout` seconds, then stops the thread.
+        Does nothing if the thread isn't running.
+
+        Parameters:
+            timeout (float): the number of seconds to wait for the queue to drain
+        """
+
+        done, self.__done = self.__done, None
+
+        if done is None:
+            return
+
+        self.enqueue_sentinel()
+        done.acquire(True, timeout)
 
 
 class StdoutFormatter(logging.Formatter):
@@ -121,61 +687,152 @@ class StdoutFormatter(logging.Formatter):
 
 class MMPMLogFactory:
     """
-    A custom logging class for MMPM, providing functionalities for logging to files, stdout, and SocketIO.
+    A custom logging class for MMPM, providing functionalities for logging to files, stdout, and the log server.
     Logs can be found in ~/.config/mmpm/log.
     """
 
     __logger: logging.Logger = None
-    __socketio_handler: SocketIOHandler = None
+    __log_server_handler: logging.Handler = None
+    __queue_handler: BoundedQueueHandler = None
+    __listener: NativeQueueListener = None
     __lock: Lock = Lock()
 
     @staticmethod
     def __setup__(name: str) -> None:
         MMPMLogFactory.__logger = logging.getLogger(name)
 
-        file_handler = logging.handlers.RotatingFileHandler(
-            paths.MMPM_CLI_LOG_FILE,
-            mode="a",
-            maxBytes=1024 * 1024,
-            backupCount=2,
-            encoding="utf-8",
-            delay=False,
-        )
+        env = MMPMEnv()
+        level = env.MMPM_LOG_LEVEL.get()
+        backend = str(env.MMPM_LOG_JSON_BACKEND.get()).strip().lower()
+        interval = None
+
+        options = {"mode": "a", "maxBytes": 1024 * 1024, "backupCount": 2, "encoding": "utf-8", "delay": False}
+
+        if env.MMPM_LOG_MODE.get() == "buffered":
+            # batches writes to spare SD cards, see BufferedRotatingFileHandler
+            file_handler = BufferedRotatingFileHandler(paths.MMPM_CLI_LOG_FILE, **options)
+            interval = file_handler.interval
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(paths.MMPM_CLI_LOG_FILE, **options)
 
-        level = MMPMEnv().MMPM_LOG_LEVEL.get()
         MMPMLogFactory.__logger.setLevel(logging.DEBUG)  # set the main logging handler set to the lowest level possible
 
-        file_handler.setFormatter(JsonFormatter())
+        # the log files and the log server share a formatter, since both are written to from the same thread
+        formatter = JsonFormatter(backend if backend in JsonFormatter.BACKENDS else "json")
+        file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.DEBUG)  # always have the log files be DEBUG
-        MMPMLogFactory.__logger.addHandler(file_handler)
 
+        # the stdout handler stays synchronous, so CLI output remains in order with anything printed
         stdout_handler = logging.StreamHandler()
         stdout_handler.setFormatter(StdoutFormatter())
         stdout_handler.setLevel(level)
 
         MMPMLogFactory.__logger.addHandler(stdout_handler)
 
-        socketio_handler = SocketIOHandler("localhost", 6789)
+        MMPMLogFactory.__log_server_handler = MMPMLogFactory.__server_handler__()
+        MMPMLogFactory.__log_server_handler.setFormatter(formatter)
+        MMPMLogFactory.__log_server_handler.setLevel(logging.DEBUG)
+
+        # the log files and the log server are written to from a separate thread, see NativeQueueListener
+        MMPMLogFactory.__queue_handler = BoundedQueueHandler()
+        MMPMLogFactory.__listener = NativeQueueListener(
+            MMPMLogFactory.__queue_handler.queue,
+            file_handler,
+            MMPMLogFactory.__log_server_handler,
+            respect_handler_level=True,
+            interval=interval,
+        )
+
+        MMPMLogFactory.__logger.addHandler(MMPMLogFactory.__queue_handler)
+        MMPMLogFactory.__listener.start()
 
-        if socketio_handler.sio.connected:
-            MMPMLogFactory.__socketio_handler = socketio_handler
-            MMPMLogFactory.__socketio_handler.setLevel(logging.DEBUG)
-            MMPMLogFactory.__logger.addHandler(MMPMLogFactory.__socketio_handler)
-        else:
-            MMPMLogFactory.__logger.debug("Failed to connect to SocketIO server")
+        if backend not in JsonFormatter.BACKENDS:
+            MMPMLogFactory.__logger.warning(f"Invalid MMPM_LOG_JSON_BACKEND value '{backend}', expected one of {JsonFormatter.BACKENDS}")
+        elif formatter.backend != backend:
+            MMPMLogFactory.__logger.warning(f"MMPM_LOG_JSON_BACKEND is '{backend}', which isn't installed, so 'json' is used instead")
+
+        atexit.register(MMPMLogFactory.shutdown)
+        os.register_at_fork(after_in_child=MMPMLogFactory.__after_fork__)
+
+    @staticmethod
+    def __server_handler__() -> logging.Handler:
+        """
+        The handler sending records to the log server: a UnixDatagramHandler wherever Unix sockets are
+        available (ie. Linux and macOS), and otherwise a SocketIOHandler, which connects to the SocketIO
+        port of the log server in the background once the first record is emitted.
+        """
+
+        if hasattr(socket, "AF_UNIX"):
+            return UnixDatagramHandler(paths.MMPM_LOG_SERVER_SOCKET_FILE)
+
+        return SocketIOHandler("localhost", urls.MMPM_LOG_SERVER_PORT)
+
+    @staticmethod
+    def __after_fork__() -> None:
+        # only the forking thread survives in a child process (ie. a gunicorn worker), so the listener
+        # thread is gone. The child gets a queue and listener of its own, sharing the handlers, and the
+        # records queued before the fork are left to the parent, which still writes them.
+        listener = MMPMLogFactory.__listener
+
+        MMPMLogFactory.__lock = Lock()
+
+        if listener is None:
+            return
+
+        previous = MMPMLogFactory.__queue_handler
+        MMPMLogFactory.__queue_handler = BoundedQueueHandler(previous.capacity, previous.overflow)
+        MMPMLogFactory.__listener = NativeQueueListener(
+            MMPMLogFactory.__queue_handler.queue,
+            *listener.handlers,
+            respect_handler_level=listener.respect_handler_level,
+            interval=listener.interval,
+        )
+
+        MMPMLogFactory.__logger.removeHandler(previous)
+        MMPMLogFactory.__logger.addHandler(MMPMLogFactory.__queue_handler)
+        MMPMLogFactory.__listener.start()
 
     @staticmethod
     def shutdown() -> None:
         """
-        Shuts down the logger, closing any SocketIO connections.
+        Shuts down the logger, writing any queued records to the log files and the log server, then
+        closing them. Anything logged afterwards is only written to stdout.
+
+        Parameters:
+            None
+        """
+
+        with MMPMLogFactory.__lock:
+            listener = MMPMLogFactory.__listener
+            MMPMLogFactory.__listener = None
+
+        if listener is None:
+            return
+
+        MMPMLogFactory.__logger.removeHandler(MMPMLogFactory.__queue_handler)
+        listener.stop()
+
+        for handler in listener.handlers:
+            handler.close()
+
+    @staticmethod
+    def metrics() -> Dict[str, int]:
+        """
+        Reports the state of the queue between the logger and the log files/log server.
 
         Parameters:
             None
+
+        Returns:
+            metrics (Dict[str, int]): the queue depth and capacity, and the number of dropped records
         """
 
-        if MMPMLogFactory.__socketio_handler is not None:
-            MMPMLogFactory.__logger.debug("Disconnecting from SocketIO server")
-            MMPMLogFactory.__socketio_handler.close()
+        handler = MMPMLogFactory.__queue_handler
+
+        if handler is None:
+            return {"queue_depth": 0, "queue_capacity": 0, "dropped": 0}
+
+        return {"queue_depth": handler.depth, "queue_capacity": handler.capacity, "dropped": handler.dropped}
 
     @staticmethod
     def get_logger(name: str) -> logging.Logger:
@@ -197,40 +854,56 @@ class MMPMLogFactory:
         return MMPMLogFactory.__logger
 
     @classmethod
-    def display(cls, tail: bool = False) -> None:
+    def display(cls, tail: bool = False, log_filter=None, raw: bool = False) -> None:
         """
-        Displays contents of log files to stdout. If the tail option is supplied, log contents will be displayed in real-time.
+        Displays the records in the log files (including rotated files) to stdout. If the tail option
+        is supplied, records are displayed in real-time as they are written.
 
         Parameters:
             tail (bool): If True, displays the log contents in real time.
+            log_filter (Optional[mmpm.log.reader.LogFilter]): Only display records matching the filter.
+            raw (bool): If True, displays each record as JSON, rather than formatted for humans.
 
         Returns:
             None
         """
-        if paths.MMPM_CLI_LOG_FILE.exists():
-            os.system(f"{'tail -F' if tail else 'cat'} {paths.MMPM_CLI_LOG_FILE}")
-        else:
+        from mmpm.log import reader  # pylint: disable=import-outside-toplevel
+
+        if not reader.log_files(paths.MMPM_CLI_LOG_FILE):
             MMPMLogFactory.__logger.error("MMPM log file not found")
+            return
+
+        try:
+            for record in reader.read(paths.MMPM_CLI_LOG_FILE, log_filter, follow=tail):
+                print(json.dumps(record, ensure_ascii=False) if raw else reader.format_record(record), flush=tail)
+        except KeyboardInterrupt:
+            pass
+        except BrokenPipeError:  # ie. piped into `head`, silence the error raised when stdout is flushed on exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
 
     @classmethod
-    def archive(cls) -> None:
+    def archive(cls, archive_format: str = "zip", log_filter=None) -> None:
         """
-        Compresses all log files in ~/.config/mmpm/log, excluding NGINX logs.
+        Compresses all log files in ~/.config/mmpm/log into an archive in the current directory.
 
         Parameters:
-            None
+            archive_format (str): one of mmpm.log.archive.available_formats(), ie. 'zip' or 'tar.gz'
+            log_filter (Optional[mmpm.log.reader.LogFilter]): if it has a time range, only records within it are archived
 
         Returns:
             None
         """
-        today = datetime.datetime.now()
+        from mmpm.log import archive  # pylint: disable=import-outside-toplevel
 
-        file_name: str = f"mmpm-logs-{today.year}-{today.month}-{today.day}"
+        file_name = Path(os.getcwd()) / archive.file_name(archive_format)
 
         try:
-            shutil.make_archive(file_name, "zip", paths.MMPM_LOG_DIR)
-        except Exception as error:
+            with open(file_name, "wb") as output:
+                for chunk in archive.stream(archive_format, log_filter):
+                    output.write(chunk)
+        except (OSError, ValueError) as error:
             MMPMLogFactory.__logger.error(f"{error}")
+            file_name.unlink(missing_ok=True)
             return
 
-        MMPMLogFactory.__logger.info(f"Compressed MMPM log files to {os.getcwd()}/{file_name}.zip ")
+        MMPMLogFactory.__logger.info(f"Compressed MMPM log files to {file_name}")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Delivers log records from the log server (see mmpm.log.server) to its UI clients in batches, rather
+than emitting every record to every client as it arrives.
+
+Each client has its own bounded outbox. A batch is only sent to a client once it has acknowledged the
+previous one, so a slow client (ie. a browser on a busy Raspberry Pi) receives fewer, larger batches,
+and once its outbox is full, the oldest records are dropped and the client is told how many. Optionally,
+records of chatty levels (ie. DEBUG) can be sampled, so only a fraction of them are sent at all.
+
+A batch is sent as {"records": [{"seq": 1, "data": "..."}, ...], "dropped": 0, "sampled": 0, "last": 1}, where
+dropped and sampled are the number of records left out since the previous batch for either reason, and last is
+the sequence number up to which the client has been sent every record it will be sent, so a batch holding no
+records (ie. when every record was sampled out) still tells the client which records it won't receive.
+"""
+import json
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from mmpm.log.history import LogEntry
+
+Emit = Callable[[str, dict, Callable[..., None]], None]
+
+
+def sampling(value: str) -> Dict[str, float]:
+    """
+    Parses the sampling rates of MMPM_LOG_SAMPLING, ie. 'DEBUG=0.1, INFO=0.5' sends a tenth of the DEBUG
+    records, and half of the INFO records. An empty value samples nothing.
+
+    Parameters:
+        value (str): comma separated LEVEL=RATE pairs, where each rate is between 0 and 1
+
+    Returns:
+        sample (Dict[str, float]): the rate of each level, ie. {"DEBUG": 0.1, "INFO": 0.5}
+
+    Raises:
+        ValueError: if a pair isn't LEVEL=RATE, or a rate isn't between 0 and 1
+    """
+
+    sample: Dict[str, float] = {}
+
+    for pair in filter(None, (pair.strip() for pair in str(value).split(","))):
+        level, separator, rate = pair.partition("=")
+        level = level.strip().upper()
+
+        if not separator or not level:
+            raise ValueError(f"Invalid sampling rate '{pair}', expected LEVEL=RATE, ie. 'DEBUG=0.1'")
+
+        sample[level] = float(rate)
+
+        if not 0 <= sample[level] <= 1:
+            raise ValueError(f"Invalid sampling rate '{pair}', the rate must be between 0 and 1")
+
+    return sample
+
+
+class Outbox:
+    """
+    The records waiting to be sent to a single client.
+
+    Attributes:
+        records (Deque[LogEntry]): the records, oldest first
+        dropped (int): the number of records dropped since the last batch, because the outbox was full
+        sampled (int): the number of records left out since the last batch, due to sampling
+        in_flight (float): when the unacknowledged batch was sent (time.monotonic), 0 if there is none
+        last (int): the sequence number of the most recent record published, whether or not it's sent to the client
+    """
+
+    __slots__ = "records", "dropped", "sampled", "in_flight", "last"
+
+    def __init__(self):
+        self.records: Deque[LogEntry] = deque()
+        self.dropped = 0
+        self.sampled = 0
+        self.in_flight = 0.0
+        self.last = 0
+
+
+class LogFanout:
+    """
+    Batches log records per client, with backpressure and optional per-level sampling.
+
+    Attributes:
+        capacity (int): the maximum number of records waiting for any one client
+        max_batch (int): the maximum number of records sent in one batch
+        ack_timeout (float): the number of seconds after which an unacknowledged batch is considered delivered
+        sample (Dict[str, float]): the fraction of records of each level to send, ie. {"DEBUG": 0.1}
+    """
+
+    def __init__(
+        self,
+        emit: Emit,
+        capacity: int = 1000,
+        max_batch: int = 500,
+        ack_timeout: float = 5.0,
+        sample: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Parameters:
+            emit (Emit): sends a batch to a client, ie. emit(sid, batch, callback), where callback is
+                called once the client has acknowledged the batch
+            capacity (int): the maximum number of records waiting for any one client
+            max_batch (int): the maximum number of records sent in one batch
+            ack_timeout (float): the number of seconds after which an unacknowledged batch is considered delivered
+            sample (Optional[Dict[str, float]]): the fraction of records of each level to send, ie. {"DEBUG": 0.1}
+        """
+
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.ack_timeout = ack_timeout
+        self.sample = {level.upper(): rate for level, rate in (sample or {}).items()}
+        self.__emit = emit
+        self.__outboxes: Dict[str, Outbox] = {}
+        self.__seen: Dict[str, int] = {}
+
+    def add_client(self, sid: str) -> None:
+        self.__outboxes[sid] = Outbox()
+
+    def remove_client(self, sid: str) -> None:
+        self.__outboxes.pop(sid, None)
+
+    def __sampled_out__(self, entry: LogEntry) -> bool:
+        """
+        Whether the record should be left out due to sampling. Sampling is deterministic: a rate of 0.25
+        sends every 4th record of that level.
+        """
+
+        if not self.sample:
+            return False
+
+        try:
+            level = json.loads(entry["data"]).get("level", "")
+        except (ValueError, AttributeError):
+            return False
+
+        rate = self.sample.get(level)
+
+        if rate is None or rate >= 1:
+            return False
+
+        seen = self.__seen.get(level, 0)
+        self.__seen[level] = seen + 1
+
+        return int((seen + 1) * rate) == int(seen * rate)
+
+    def publish(self, entry: LogEntry, skip_sid: Optional[str] = None) -> None:
+        """
+        Adds a record to the outbox of every client, dropping the oldest record of any outbox that is full.
+
+        Parameters:
+            entry (LogEntry): the record, as returned by LogHistory.append
+            skip_sid (Optional[str]): a client the record isn't sent to (ie. the client it came from)
+
+        Returns:
+            None
+        """
+
+        sampled_out = self.__sampled_out__(entry)
+
+        for sid, outbox in self.__outboxes.items():
+            outbox.last = entry["seq"]
+
+            if sid == skip_sid:
+                continue
+
+            if sampled_out:
+                outbox.sampled += 1
+                continue
+
+            if len(outbox.records) >= self.capacity:
+                outbox.records.popleft()
+                outbox.dropped += 1
+
+            outbox.records.append(entry)
+
+    def acknowledge(self, sid: str) -> None:
+        """
+        Marks the batch sent to a client as delivered, so the next batch can be sent.
+
+        Parameters:
+            sid (str): the client
+
+        Returns:
+            None
+        """
+
+        outbox = self.__outboxes.get(sid)
+
+        if outbox is not None:
+            outbox.in_flight = 0.0
+
+    def flush(self) -> None:
+        """
+        Sends a batch to every client with records waiting, unless it hasn't acknowledged its previous batch.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        now = time.monotonic()
+
+        for sid, outbox in list(self.__outboxes.items()):
+            if not outbox.records and not outbox.dropped and not outbox.sampled:
+                continue
+
+            if outbox.in_flight and now - outbox.in_flight < self.ack_timeout:
+                continue  # backpressure, the records wait (or are dropped) until the client catches up
+
+            records = [outbox.records.popleft() for _ in range(min(self.max_batch, len(outbox.records)))]
+
+            # any record older than those still waiting was either sent, or left out on purpose
+            last = outbox.records[0]["seq"] - 1 if outbox.records else outbox.last
+            batch = {"records": records, "dropped": outbox.dropped, "sampled": outbox.sampled, "last": last}
+
+            outbox.dropped = 0
+            outbox.sampled = 0
+            outbox.in_flight = now
+
+            self.__emit(sid, batch, lambda *_, sid=sid: self.acknowledge(sid))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+The recent history of log records repeated by the log server (see mmpm.log.server), so UI clients
+connecting after an operation started still see what came before, and clients reconnecting can
+request exactly the records they missed.
+"""
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Tuple, Union
+from uuid import uuid4
+
+LogEntry = Dict[str, Union[int, str]]
+
+
+class LogHistory:
+    """
+    A bounded ring buffer of log records. Each record is assigned a sequence number, starting at 1 and
+    increasing by one per record, so clients can ask for every record after the last one they received.
+    Once either limit is exceeded, the oldest records are discarded.
+
+    Sequence numbers restart whenever the log server does, so the buffer also has a random `epoch`,
+    which lets clients tell a sequence number from a previous run of the log server apart from a current one.
+
+    Attributes:
+        max_records (int): the maximum number of records kept
+        max_bytes (int): the maximum total size of the records kept
+        epoch (str): identifies this run of the log server
+        sequence (int): the sequence number of the most recent record, 0 if there are none
+    """
+
+    def __init__(self, max_records: int = 1000, max_bytes: int = 1024 * 1024):
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.epoch = uuid4().hex
+        self.sequence = 0
+        self.__records: Deque[Tuple[int, str]] = deque()
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return len(self.__records)
+
+    def append(self, data: str) -> LogEntry:
+        """
+        Adds a record to the history, discarding the oldest records if the history is full.
+
+        Parameters:
+            data (str): the JSON formatted log record
+
+        Returns:
+            entry (LogEntry): the record along with its sequence number, ie. {"seq": 42, "data": "..."}
+        """
+
+        self.sequence += 1
+        self.__records.append((self.sequence, data))
+        self.__size += len(data)
+
+        while len(self.__records) > self.max_records or (self.__size > self.max_bytes and len(self.__records) > 1):
+            _, discarded = self.__records.popleft()
+            self.__size -= len(discarded)
+
+        return {"seq": self.sequence, "data": data}
+
+    def since(self, sequence: int = 0) -> List[LogEntry]:
+        """
+        Retrieves the records logged after the record with the given sequence number. If that record (or
+        any after it) has already been discarded, every record still in the history is returned.
+
+        Parameters:
+            sequence (int): the sequence number of the last record received, 0 for the entire history
+
+        Returns:
+            entries (List[LogEntry]): the records, oldest first
+        """
+
+        if not self.__records:
+            return []
+
+        # sequence numbers are contiguous, so the position of a record is its offset from the oldest
+        start = min(max(0, sequence - self.__records[0][0] + 1), len(self.__records))
+        return [{"seq": seq, "data": data} for seq, data in islice(self.__records, start, None)]
+
+    def replay(self, sequence: int = 0, epoch: str = "") -> Dict[str, object]:
+        """
+        Builds the 'history' payload sent to clients. A sequence number from another epoch is meaningless
+        (the log server restarted), so the entire history is sent instead.
+
+        Parameters:
+            sequence (int): the sequence number of the last record the client received
+            epoch (str): the epoch the client's sequence number belongs to
+
+        Returns:
+            history (Dict[str, object]): the epoch and the records, ie. {"epoch": "...", "records": [...]}
+        """
+
+        if epoch != self.epoch or sequence > self.sequence:
+            sequence = 0
+
+        return {"epoch": self.epoch, "records": self.since(sequence)}
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Reads the JSON log files written by mmpm.log.factory, including the rotated files (ie. mmpm-cli.log.1,
+or mmpm-cli.log.1.gz in buffered mode), oldest first. Records are streamed one line at a time, so the
+size of the log files doesn't matter, and can be filtered by level, logger, module, time and message.
+
+Every record is a single line, and starts with a timestamp formatted as 'YYYY-mm-dd HH:MM:SS,mmm'.
+Timestamps in that format sort the same way as strings, so they are compared as-is, and because the
+files are only ever appended to, a file can be binary searched for the first record since a given time.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Callable, Iterator, List, Optional, Tuple
+
+from mmpm.constants import color
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S,000"
+
+LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR, "CRITICAL": logging.CRITICAL}
+
+__RELATIVE_TIME = re.compile(r"^(\d+)([smhd])$")
+__UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+__ABSOLUTE_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%Y-%m-%d"]
+
+
+def parse_time(value: str, now: Optional[datetime] = None) -> str:
+    """
+    Converts a point in time given on the command line into a string comparable with record timestamps.
+    The time is either absolute (ie. '2024-01-31', '2024-01-31 18:00', '2024-01-31T18:00:05'), or
+    relative to now (ie. '30s', '15m', '2h', '7d' ago).
+
+    Parameters:
+        value (str): the point in time
+        now (Optional[datetime]): the time relative values are relative to, defaults to the current time
+
+    Returns:
+        timestamp (str): the point in time formatted like the timestamp of a record
+
+    Raises:
+        ValueError: if the value isn't in any of the accepted formats
+    """
+
+    value = value.strip()
+    match = __RELATIVE_TIME.match(value)
+
+    if match:
+        now = now or datetime.now()
+        return (now - timedelta(**{__UNITS[match.group(2)]: int(match.group(1))})).strftime(TIMESTAMP_FORMAT)
+
+    for absolute_format in __ABSOLUTE_FORMATS:
+        try:
+            return datetime.strptime(value, absolute_format).strftime(TIMESTAMP_FORMAT)
+        except ValueError:
+            continue
+
+    raise ValueError(f"Invalid time '{value}'. Expected a date/time such as '2024-01-31 18:00', or a duration such as '15m', '2h', or '1d'")
+
+
+class LogFilter:
+    """
+    Decides which log records are displayed.
+
+    Attributes:
+        level (int): the minimum level of a record, 0 for any
+        logger (str): the name of the logger a record was logged with, including any child loggers
+        module (str): the module a record was logged from
+        since (str): the earliest timestamp of a record (inclusive)
+        until (str): the latest timestamp of a record (exclusive)
+        contains (str): text the message of a record must contain
+    """
+
+    __slots__ = "level", "logger", "module", "since", "until", "contains"
+
+    def __init__(
+        self,
+        level: Optional[str] = None,
+        logger: Optional[str] = None,
+        module: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        contains: Optional[str] = None,
+    ):
+        self.level: int = LEVELS[level.upper()] if level else 0
+        self.logger = logger
+        self.module = module
+        self.since = since
+        self.until = until
+        self.contains = contains
+
+    def matches(self, record: dict) -> bool:
+        """
+        Checks if the record passes all the criteria of the filter.
+
+        Parameters:
+            record (dict): the parsed log record
+
+        Returns:
+            bool: True if the record should be displayed, False otherwise
+        """
+
+        timestamp = record.get("timestamp", "")
+
+        if self.since and timestamp < self.since:
+            return False
+
+        if self.until and timestamp >= self.until:
+            return False
+
+        if self.level and LEVELS.get(record.get("level", ""), 0) < self.level:
+            return False
+
+        if self.logger:
+            name = record.get("logger_name", "")
+
+            if name != self.logger and not name.startswith(f"{self.logger}."):
+                return False
+
+        if self.module and record.get("module") != self.module:
+            return False
+
+        if self.contains and self.contains not in str(record.get("message", "")):
+            return False
+
+        return True
+
+
+def parse(line: bytes) -> Optional[dict]:
+    """
+    Parses a single line of a log file.
+
+    Parameters:
+        line (bytes): the line, as read from the file
+
+    Returns:
+        record (Optional[dict]): the record, or None if the line isn't a valid record (ie. it was truncated)
+    """
+
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+
+    return record if isinstance(record, dict) else None
+
+
+def log_files(path: Path) -> List[Path]:
+    """
+    Finds the log file and its rotated files, ordered from oldest to newest.
+
+    Parameters:
+        path (Path): the path of the current log file
+
+    Returns:
+        files (List[Path]): the rotated files (ie. <path>.2, <path>.1.gz), followed by the current log file
+    """
+
+    rotated = []
+
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        suffix = candidate.name[len(path.name) + 1 :]
+        index = suffix[: -len(".gz")] if suffix.endswith(".gz") else suffix
+
+        if index.isdigit():
+            rotated.append((-int(index), candidate.stat().st_mtime, candidate))
+
+    return [candidate for _, _, candidate in sorted(rotated)] + ([path] if path.exists() else [])
+
+
+def __first_record_at__(handle: IO[bytes], position: int) -> Tuple[int, Optional[dict]]:
+    """
+    Returns the offset of the first valid record starting after `position` along with the record, or
+    the size of the file and None if there is none.
+    """
+
+    handle.seek(position)
+
+    if position:
+        handle.readline()  # the rest of the line `position` falls within
+
+    while True:
+        offset = handle.tell()
+        line = handle.readline()
+
+        if not line:
+            return offset, None
+
+        record = parse(line)
+
+        if record is not None:
+            return offset, record
+
+
+def seek(handle: IO[bytes], since: str) -> None:
+    """
+    Moves the handle to the first record logged at or after `since`, using a binary search over the
+    timestamps in the file, so only a logarithmic number of lines are read.
+
+    Parameters:
+        handle (IO[bytes]): an uncompressed log file, opened in binary mode
+        since (str): the timestamp, as returned by `parse_time`
+
+    Returns:
+        None
+    """
+
+    low, high = 0, handle.seek(0, os.SEEK_END)
+
+    while low < high:
+        middle = (low + high) // 2
+        _, record = __first_record_at__(handle, middle)
+
+        if record is not None and record.get("timestamp", "") < since:
+            low = middle + 1
+        else:
+            high = middle
+
+    handle.seek(__first_record_at__(handle, low)[0])
+
+
+def __open__(path: Path) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def __last_modified__(path: Path) -> str:
+    return datetime.fromtimestamp(path.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
+
+
+def read(
+    path: Path,
+    log_filter: Optional[LogFilter] = None,
+    follow: bool = False,
+    interval: float = 0.5,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[dict]:
+    """
+    Yields the records across the log file and its rotated files, oldest first. Without `follow`, every
+    matching record is yielded. With `follow`, only records logged since `log_filter.since` are yielded
+    (none, if it isn't set), then records are yielded as they are appended to the log file, checking
+    every `interval` seconds. Following continues across rotations of the log file, until `stop` returns
+    True, and is ignored if `log_filter.until` is set.
+
+    Parameters:
+        path (Path): the path of the current log file
+        log_filter (Optional[LogFilter]): the criteria records must match
+        follow (bool): if True, keep yielding records as they are written
+        interval (float): the number of seconds between checks for new records when following
+        stop (Optional[Callable[[], bool]]): called between checks when following, returning True stops following
+
+    Returns:
+        records (Iterator[dict]): the matching records
+    """
+
+    log_filter = log_filter or LogFilter()
+    follow = follow and not log_filter.until
+    history = not follow or log_filter.since
+    handle: Optional[IO[bytes]] = None
+
+    for log_file in log_files(path) if history else []:
+        if log_filter.since and __last_modified__(log_file) < log_filter.since:
+            continue  # nothing has been written to the file since then
+
+        current = log_file == path
+        handle = __open__(log_file)
+
+        try:
+            if log_filter.since and log_file.suffix != ".gz":
+                seek(handle, log_filter.since)
+
+            while True:
+                line = handle.readline()
+
+                if not line:
+                    break
+
+                if current and follow and not line.endswith(b"\n"):
+                    handle.seek(-len(line), os.SEEK_CUR)  # still being written, picked up when following
+                    break
+
+                record = parse(line)
+
+                if record is None:
+                    continue
+
+                if log_filter.until and record.get("timestamp", "") >= log_filter.until:
+                    return
+
+                if log_filter.matches(record):
+                    yield record
+        finally:
+            if not (current and follow):
+                handle.close()
+                handle = None
+
+    if not follow:
+        return
+
+    try:
+        yield from __follow__(path, log_filter, handle, interval, stop)
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+def __follow__(path: Path, log_filter: LogFilter, handle: Optional[IO[bytes]], interval: float, stop: Optional[Callable[[], bool]]) -> Iterator[dict]:
+    pending = b""
+    from_start = False  # only new records, like `tail -F`, unless the file has been rotated since
+
+    while stop is None or not stop():
+        if handle is None:
+            try:
+                handle = open(path, "rb")
+            except FileNotFoundError:
+                from_start = True
+                time.sleep(interval)
+                continue
+
+            if not from_start:
+                handle.seek(0, os.SEEK_END)
+
+        chunk = handle.read()
+
+        if chunk:
+            *lines, pending = (pending + chunk).split(b"\n")
+
+            for line in lines:
+                record = parse(line)
+
+                if record is not None and log_filter.matches(record):
+                    yield record
+
+            continue
+
+        try:
+            stat = os.stat(path)
+            rotated = stat.st_ino != os.fstat(handle.fileno()).st_ino or stat.st_size < handle.tell()
+        except FileNotFoundError:
+            rotated = True
+
+        if rotated:
+            handle.close()
+            handle = None
+            pending = b""
+            from_start = True
+            continue
+
+        time.sleep(interval)
+
+
+__LEVEL_COLORS = {
+    "DEBUG": color.n_cyan,
+    "INFO": color.n_green,
+    "WARNING": color.b_yellow,
+    "ERROR": color.b_red,
+    "CRITICAL": color.b_magenta,
+}
+
+
+def format_record(record: dict) -> str:
+    """
+    Formats a record for humans, ie. '2024-01-31 18:00:05,123 INFO     mmpm.entrypoint: message'.
+
+    Parameters:
+        record (dict): the parsed log record
+
+    Returns:
+        text (str): the formatted record
+    """
+
+    level = record.get("level", "")
+    colorize = __LEVEL_COLORS.get(level, str)
+
+    return f"{record.get('timestamp', '')} {colorize(f'{level:<8}')} {record.get('logger_name', '')}: {record.get('message', '')}"
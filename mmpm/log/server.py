@@ -1,33 +1,184 @@
 #!/usr/bin/env python3
 """
 An incredibly simplistic SocketIO server used for repeating logs from the MMPM CLI to the UI.
+
+Records arrive either as datagrams on the Unix socket at MMPM_LOG_SERVER_SOCKET_FILE (see
+mmpm.log.factory.UnixDatagramHandler), or as 'logs' events from SocketIO clients, and are
+repeated to every connected UI client.
+
+Every record is numbered and kept in a bounded history (see mmpm.log.history.LogHistory). UI
+clients receive records as {"seq": <int>, "data": <str>}, in 'logs' batches which the client must
+acknowledge before it's sent the next (see mmpm.log.fanout.LogFanout). When a client connects, it's sent a
+'history' event with the records it hasn't seen yet: all of them, unless the client passes the
+sequence number of its last record (and the epoch it belongs to) as auth, ie. {"since": 42,
+"epoch": "..."}. Clients may also request the same at any time with a 'history' event, which is
+answered through its acknowledgement.
 """
 from gevent import monkey
 
 monkey.patch_all()
 
+import atexit
+import os
+import socket
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
 import socketio
 
-from mmpm.log.factory import MMPMLogFactory
+from mmpm.constants import paths
+from mmpm.env import MMPMEnv
+from mmpm.log.factory import MMPMLogFactory, UnixDatagramHandler
+from mmpm.log.fanout import LogFanout, sampling
+from mmpm.log.history import LogHistory
 
 logger = MMPMLogFactory.get_logger(__name__)
 
 
-# Function to create the SocketIO server
-def create():
-    server = socketio.Server(cors_allowed_origins="*", async_mode="gevent")
+def bind(path: Path) -> socket.socket:
+    """
+    Creates the Unix datagram socket the MMPM CLI sends log records to, replacing any stale socket
+    file left behind by a previous log server. The socket file is removed when the process exits.
+
+    Parameters:
+        path (Path): the path of the socket file
+
+    Returns:
+        skt (socket.socket): the bound socket
+    """
+
+    if path.exists():
+        path.unlink()
+
+    skt = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    skt.bind(str(path))
+    os.chmod(path, 0o600)  # only the user running MMPM may write log records
+
+    atexit.register(lambda: path.unlink() if path.exists() else None)
+    return skt
+
+
+def relay(publish: Callable[[str], None], skt: socket.socket) -> None:
+    """
+    Receives log records from the Unix datagram socket and publishes them to all SocketIO clients.
+    Nothing in here may log, otherwise each record would be fed straight back into the socket.
+
+    Parameters:
+        publish (Callable[[str], None]): adds a record to the history, and emits it to the clients
+        skt (socket.socket): the socket returned by `bind`
+
+    Returns:
+        None
+    """
+
+    while True:
+        data = skt.recv(UnixDatagramHandler.MAX_DATAGRAM_SIZE)
+        publish(data.decode("utf-8", errors="replace"))
+
+
+def __since__(options: Any) -> Tuple[int, str]:
+    """
+    Extracts the sequence number and epoch of the last record a client received from its auth or request.
+    """
+
+    if not isinstance(options, dict):
+        return 0, ""
+
+    try:
+        return int(options.get("since", 0)), str(options.get("epoch", ""))
+    except (TypeError, ValueError):
+        return 0, ""
+
+
+def flush(server: socketio.Server, fanout: LogFanout, interval: float) -> None:
+    """
+    Sends the records collected over the last `interval` seconds to the clients, forever.
 
-    @server.event
-    def connect(sid, environ):  # pylint: disable=unused-argument
+    Parameters:
+        server (socketio.Server): the SocketIO server, used to sleep cooperatively
+        fanout (LogFanout): the per-client outboxes
+        interval (float): the number of seconds between batches
+
+    Returns:
+        None
+    """
+
+    while True:
+        server.sleep(interval)
+        fanout.flush()
+
+
+def attach(server: socketio.Server, namespace: str = "/", interval: float = 0.05, sample: Optional[Dict[str, float]] = None) -> None:
+    """
+    Serves the logs from a namespace of a SocketIO server, and starts relaying the records sent to the Unix socket.
+
+    Parameters:
+        server (socketio.Server): the SocketIO server
+        namespace (str): the namespace the UI clients connect to, ie. '/logs' when served alongside the API (see mmpm.server)
+        interval (float): the number of seconds records are collected for, before being sent to clients in a batch
+        sample (Optional[Dict[str, float]]): the fraction of records of each level sent to clients, ie. {"DEBUG": 0.1},
+            read from MMPM_LOG_SAMPLING if not given
+
+    Returns:
+        None
+    """
+
+    if sample is None:
+        try:
+            sample = sampling(MMPMEnv().MMPM_LOG_SAMPLING.get())
+        except ValueError as error:
+            logger.error(f"Ignoring MMPM_LOG_SAMPLING, every record is sent: {error}")
+            sample = {}
+
+    history = LogHistory()
+    fanout = LogFanout(lambda sid, batch, callback: server.emit("logs", batch, to=sid, namespace=namespace, callback=callback), sample=sample)
+
+    def publish(data: str, skip_sid: Optional[str] = None) -> None:
+        fanout.publish(history.append(data), skip_sid=skip_sid)
+
+    @server.on("connect", namespace=namespace)
+    def connect(sid, environ, auth=None):  # pylint: disable=unused-argument
         logger.debug(f"Client connected to SocketIO-Log-Server: {sid}")
+        fanout.add_client(sid)  # before replaying, so no record falls between the history and the first batch
+        server.emit("history", history.replay(*__since__(auth)), to=sid, namespace=namespace)
 
-    @server.event
+    @server.on("logs", namespace=namespace)
     def logs(sid, data):
-        server.emit("logs", data, skip_sid=sid)
+        publish(data, skip_sid=sid)
 
-    @server.event
+    @server.on("history", namespace=namespace)
+    def replay(sid, options=None):  # pylint: disable=unused-argument
+        return history.replay(*__since__(options))
+
+    @server.on("disconnect", namespace=namespace)
     def disconnect(sid):
+        fanout.remove_client(sid)
         logger.debug("Client disconnected:", sid)
 
+    server.start_background_task(flush, server, fanout, interval)
+
+    try:
+        server.start_background_task(relay, publish, bind(paths.MMPM_LOG_SERVER_SOCKET_FILE))
+    except OSError as error:
+        logger.error(f"Unable to listen for log records on {paths.MMPM_LOG_SERVER_SOCKET_FILE}: {error}")
+
+
+# Function to create the SocketIO server
+def create(interval: float = 0.05, sample: Optional[Dict[str, float]] = None):
+    """
+    Creates the log server.
+
+    Parameters:
+        interval (float): the number of seconds records are collected for, before being sent to clients in a batch
+        sample (Optional[Dict[str, float]]): the fraction of records of each level sent to clients, ie. {"DEBUG": 0.1},
+            read from MMPM_LOG_SAMPLING if not given
+
+    Returns:
+        app (socketio.WSGIApp): the WSGI application
+    """
+
+    server = socketio.Server(cors_allowed_origins="*", async_mode="gevent")
+    attach(server, interval=interval, sample=sample)
+
     app = socketio.WSGIApp(server)
     return app
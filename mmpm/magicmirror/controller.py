@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
-import os
+import atexit
 import shutil
+import threading
+from collections import defaultdict, deque
 from pathlib import Path
-from time import sleep
-from typing import List
+from time import monotonic, sleep
+from typing import Any, Callable, Deque, Dict, List, Optional
 
+import requests
 import socketio
 
+from mmpm import metrics
 from mmpm.constants import color
 from mmpm.env import MMPMEnv
 from mmpm.log.factory import MMPMLogFactory
@@ -16,76 +20,203 @@ from mmpm.utils import kill_pids_of_process, run_cmd
 logger = MMPMLogFactory.get_logger(__name__)
 
 
-class MagicMirrorClientFactory:
+NAMESPACE = "/MMM-mmpm"
+TIMEOUT = 5.0  # seconds to wait for MagicMirror to connect, or to answer a request
+READY_TIMEOUT = 120.0  # seconds MagicMirror has to start serving once it is started (ie. Electron on a Pi is slow)
+MODULE_TIMEOUT = 15.0  # seconds MMM-mmpm has to accept connections once MagicMirror is serving
+STOP_TIMEOUT = 15.0  # seconds MagicMirror has to stop serving once it is stopped
+PROBE_DELAY = (0.1, 2.0)  # the first and longest wait between checks of whether MagicMirror is ready, or stopped
+
+
+def __wait__(condition: Callable[[], bool], timeout: float) -> Optional[float]:
+    """
+    Checks a condition until it holds, waiting twice as long after each check that fails (up to PROBE_DELAY[1]),
+    so a quick MagicMirror is noticed quickly, and a slow one isn't checked needlessly often.
+
+    Parameters:
+        condition (Callable[[], bool]): the condition
+        timeout (float): seconds to keep checking the condition
+
+    Returns:
+        elapsed (Optional[float]): seconds until the condition held, or None if it didn't within the timeout
+    """
+
+    start = monotonic()
+    delay = PROBE_DELAY[0]
+
+    while not condition():
+        remaining = timeout - (monotonic() - start)
+
+        if remaining <= 0:
+            return None
+
+        sleep(min(delay, remaining))
+        delay = min(delay * 2, PROBE_DELAY[1])
+
+    return monotonic() - start
+
+
+class Reply:
     """
-    A factory class for creating SocketIO clients to interact with MagicMirror modules. It
-    facilitates communication between MMPM and MagicMirror via websockets.
+    A response of MMM-mmpm a caller is waiting for.
+
+    Attributes:
+        event (str): the name of the event MMM-mmpm responds with, ie. 'ACTIVE_MODULES'
+        data (Any): the data of the response, None until it is received, or if the connection was lost
     """
 
-    @staticmethod
-    def create_client(event: str, data: dict, namespace: str = "/MMM-mmpm"):
+    def __init__(self, event: str):
+        self.event = event
+        self.data: Any = None
+        self.__received = threading.Event()
+
+    def resolve(self, data: Any) -> None:
+        self.data = data
+        self.__received.set()
+
+    def wait(self, timeout: float) -> bool:
+        return self.__received.wait(timeout)
+
+
+class MagicMirrorClient:
+    """
+    A long-lived SocketIO connection to the MMM-mmpm module of MagicMirror, shared by every request made
+    by a process, rather than a connection (and handshake) per request. The connection is opened by the
+    first request, and reopened by the first request after it is lost, or after MMPM_MAGICMIRROR_URI changes.
+
+    MMM-mmpm answers each request with an event of its own (ie. ACTIVE_MODULES for
+    FROM_MMPM_APP_get_active_modules), in the order it receives them, so a response is matched to the oldest
+    request still waiting for that event. Any number of requests may be waiting at once.
+    """
+
+    def __init__(self):
+        self.env = MMPMEnv()
+        self.__uri: Optional[str] = None
+        self.__connecting = threading.Lock()
+        self.__waiting = threading.Lock()
+        self.__replies: Dict[str, Deque[Reply]] = defaultdict(deque)
+
+        self.__client = socketio.Client(reconnection=False, request_timeout=TIMEOUT)
+        self.__client.on("ACTIVE_MODULES", self.__active_modules__, namespace=NAMESPACE)
+        self.__client.on("MODULES_TOGGLED", self.__modules_toggled__, namespace=NAMESPACE)
+        self.__client.on("disconnect", self.__disconnected__, namespace=NAMESPACE)
+
+        atexit.register(self.close)
+
+    @property
+    def connected(self) -> bool:
+        return bool(self.__client.connected and NAMESPACE in self.__client.namespaces)
+
+    def connect(self, timeout: float = TIMEOUT, quiet: bool = False) -> bool:
         """
-        Creates and configures a SocketIO client for communicating with MagicMirror modules.
+        Connects to MagicMirror, unless already connected to the current MMPM_MAGICMIRROR_URI.
 
         Parameters:
-            event (str): The event name to emit to the MagicMirror module.
-            data (dict): The data payload to send with the event.
-            namespace (str): The namespace for the SocketIO connection.
+            timeout (float): seconds to wait for the connection
+            quiet (bool): if True, failing to connect is only logged for debugging (ie. while MagicMirror starts)
 
         Returns:
-            socketio.Client: Configured SocketIO client, or None on failure.
+            connected (bool): True if connected, False otherwise
+        """
+
+        uri = self.env.MMPM_MAGICMIRROR_URI.get()
+
+        with self.__connecting:
+            if self.connected and uri == self.__uri:
+                return True
+
+            if self.__client.connected:
+                logger.debug(f"MMPM_MAGICMIRROR_URI changed from {self.__uri} to {uri}, reconnecting")
+                self.__client.disconnect()
+
+            try:
+                self.__client.connect(uri, namespaces=[NAMESPACE], wait_timeout=timeout)
+            except socketio.exceptions.ConnectionError as error:
+                if not quiet:
+                    logger.error("Failed to connect to MagicMirror. Is MagicMirror running, and is the MMPM_MAGICMIRROR_URI environment variable set properly?")
+
+                logger.debug(f"Error when connecting to MagicMirror websocket: {error}")
+                return False
+
+            logger.debug(f"Connected to MagicMirror websocket in {NAMESPACE}")
+            self.__uri = uri
+            return True
+
+    def request(self, event: str, data: dict, reply: str, timeout: float = TIMEOUT) -> Any:
         """
+        Emits an event to MMM-mmpm, and waits for the event it responds with.
 
-        client = None
+        Parameters:
+            event (str): the name of the event to emit, ie. 'FROM_MMPM_APP_get_active_modules'
+            data (dict): the data of the event
+            reply (str): the name of the event MMM-mmpm responds with, ie. 'ACTIVE_MODULES'
+            timeout (float): seconds to wait for the connection and the response, altogether
 
-        if not event:
-            logger.error("No event name provided")
-            return client
+        Returns:
+            data (Any): the data of the response, or None if there was no response
+        """
+
+        deadline = monotonic() + timeout
+
+        if not self.connect(timeout):
+            return None
+
+        waiting = Reply(reply)
+
+        with self.__waiting:
+            self.__replies[reply].append(waiting)
 
         try:
-            client = socketio.Client(reconnection=True, request_timeout=300)
+            self.__client.emit(event, data=data, namespace=NAMESPACE)
+            logger.debug(f"Emitted {event} with {data}")
         except socketio.exceptions.SocketIOError as error:
-            logger.fatal(f"Failed to create SocketIO client: {error}")
+            logger.error(f"Failed to send {event} to MagicMirror: {error}")
+            self.__forget__(waiting)
+            return None
 
-        @client.on("connect", namespace=namespace)
-        def connect():
-            logger.debug(f"Connected to MagicMirror websocket in {namespace}")
-            client.emit(event, namespace=namespace, data=data)
-            logger.debug(f"Emitting {data}")
+        if not waiting.wait(max(deadline - monotonic(), 0)):
+            logger.error(f"MagicMirror did not respond to {event} within {timeout} seconds")
+            self.__forget__(waiting)
+            return None
 
-        @client.event
-        def connect_error(error):
-            logger.error("Failed to connect to MagicMirror websocket. Is the MMPM_MAGICMIRROR_URI environment variable set properly?")
-            logger.debug(f"Error when connecting to MagicMirror websocket: {error}")
+        return waiting.data
 
-        @client.on("disconnect", namespace=namespace)
-        def disconnect():
-            logger.debug("Disconnected from MagicMirror websocket")
+    def close(self) -> None:
+        if self.__client.connected:
+            self.__client.disconnect()
 
-        @client.on("ACTIVE_MODULES", namespace=namespace)
-        def active_modules(data):
-            logger.debug("Received active modules from MMPM MagicMirror module")
+    def __forget__(self, waiting: Reply) -> None:
+        with self.__waiting:
+            if waiting in self.__replies[waiting.event]:
+                self.__replies[waiting.event].remove(waiting)
 
-            if not data:
-                logger.error("No data was received. Is the MMPM_MAGICMIRROR_URI environment variable set properly?")
+    def __resolve__(self, event: str, data: Any) -> None:
+        with self.__waiting:
+            waiting = self.__replies[event].popleft() if self.__replies[event] else None
 
-            for module in [json_data for index, json_data in enumerate(data) if json_data not in data[index + 1 :]]:
-                print(f"{color.n_green(module['name'])}\n  hidden: {'true' if module['hidden'] else 'false'}\n  key: {module['key'] + 1}\n")
+        if waiting is None:
+            logger.debug(f"Received {event}, which nothing was waiting for")
+        else:
+            waiting.resolve(data)
 
-            logger.debug("Disconnecting from client")
-            client.disconnect()
+    def __active_modules__(self, data: Any) -> None:
+        logger.debug("Received active modules from MMPM MagicMirror module")
+        self.__resolve__("ACTIVE_MODULES", data)
 
-        @client.on("MODULES_TOGGLED", namespace=namespace)
-        def modules_toggled(data):
-            logger.debug("Received toggled modules from MMPM MagicMirror module")
+    def __modules_toggled__(self, data: Any) -> None:
+        logger.debug("Received toggled modules from MMPM MagicMirror module")
+        self.__resolve__("MODULES_TOGGLED", data)
 
-            if not data:
-                logger.error("Unable to find provided module(s)")
+    def __disconnected__(self, *_) -> None:
+        logger.debug("Disconnected from MagicMirror websocket")
 
-            logger.debug("Disconnecting from client")
-            client.disconnect()
+        # nothing will respond to the requests which are waiting, so they fail now rather than when they time out
+        with self.__waiting:
+            waiting = [reply for replies in self.__replies.values() for reply in replies]
+            self.__replies.clear()
 
-        return client
+        for reply in waiting:
+            reply.resolve(None)
 
 
 class MagicMirrorController(Singleton):
@@ -97,28 +228,42 @@ class MagicMirrorController(Singleton):
 
     def __init__(self):
         self.env = MMPMEnv()
-        self.factory = MagicMirrorClientFactory()
+        self.client = MagicMirrorClient()
 
-    def status(self):
+    def status(self) -> bool:
         """
-        Checks the status of MagicMirror by attempting to connect to it using a SocketIO client.
+        Displays the modules of MagicMirror, and whether each is hidden, as reported by MMM-mmpm.
 
         Returns:
-            True if the connection is successful, False otherwise.
+            True if MagicMirror responded, False otherwise.
         """
 
-        try:
-            client = self.factory.create_client("FROM_MMPM_APP_get_active_modules", {})
-            client.connect(self.env.MMPM_MAGICMIRROR_URI.get())
-            return True
-        except (OSError, BrokenPipeError, Exception) as error:
-            logger.error(f"Failed to connect to MagicMirror, closing socket. Is MagicMirror running? : {error}")
+        modules = self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES")
+
+        if modules is None:
+            logger.error("Failed to get the modules of MagicMirror. Is MagicMirror running?")
+            return False
+
+        if not modules:
+            logger.error("No data was received. Is the MMPM_MAGICMIRROR_URI environment variable set properly?")
+
+        for module in [json_data for index, json_data in enumerate(modules) if json_data not in modules[index + 1 :]]:
+            print(f"{color.n_green(module['name'])}\n  hidden: {'true' if module['hidden'] else 'false'}\n  key: {module['key'] + 1}\n")
+
+        return True
+
+    def __toggle__(self, directive: str, modules: List[str]) -> bool:
+        toggled = self.client.request("FROM_MMPM_APP_toggle_modules", {"directive": directive, "modules": modules}, "MODULES_TOGGLED")
 
-        return False
+        if not toggled:
+            logger.error("Unable to find provided module(s)" if toggled is not None else "Failed to toggle modules. Is MagicMirror running?")
+            return False
+
+        return True
 
-    def hide(self, modules: List[str]):
+    def hide(self, modules: List[str]) -> bool:
         """
-        Hides specified modules in MagicMirror using a SocketIO client.
+        Hides specified modules in MagicMirror.
 
         Parameters:
             modules (List[str]): List of module names or identifiers to hide.
@@ -127,56 +272,88 @@ class MagicMirrorController(Singleton):
             True if the operation is successful, False otherwise.
         """
 
-        try:
-            client = self.factory.create_client(
-                "FROM_MMPM_APP_toggle_modules",
-                {"directive": "hide", "modules": modules},
-            )
-
-            client.connect(self.env.MMPM_MAGICMIRROR_URI.get())
-            logger.info(f"Hid modules with keys: {', '.join(modules)}")
-            return True
-        except (OSError, BrokenPipeError, Exception) as error:
-            logger.error(f"Failed to connect to MagicMirror, closing socket. Is MagicMirror running? : {error}")
+        if not self.__toggle__("hide", modules):
+            return False
 
-        return False
+        logger.info(f"Hid modules with keys: {', '.join(modules)}")
+        return True
 
-    def show(self, modules: List[str]):
+    def show(self, modules: List[str]) -> bool:
         """
-        Hides specified modules in MagicMirror using a SocketIO client.
+        Shows specified modules in MagicMirror.
 
         Parameters:
-            modules (List[str]): List of module names or identifiers to hide.
+            modules (List[str]): List of module names or identifiers to show.
 
         Returns:
             True if the operation is successful, False otherwise.
         """
 
+        if not self.__toggle__("show", modules):
+            return False
+
+        logger.info(f"Made modules visible with keys: {', '.join(modules)}")
+        return True
+
+    def serving(self) -> bool:
+        """
+        Checks whether MagicMirror answers requests at MMPM_MAGICMIRROR_URI.
+
+        Parameters:
+            None
+
+        Returns:
+            True if MagicMirror answers, False otherwise.
+        """
+
         try:
-            client = self.factory.create_client(
-                "FROM_MMPM_APP_toggle_modules",
-                data={"directive": "show", "modules": modules},
-            )
+            with requests.get(self.env.MMPM_MAGICMIRROR_URI.get(), timeout=2) as response:
+                return response.status_code < 500
+        except requests.exceptions.RequestException:
+            return False
 
-            client.connect(self.env.MMPM_MAGICMIRROR_URI.get())
-            logger.info(f"Made modules visible with keys: {', '.join(modules)}")
-            return True
-        except (OSError, BrokenPipeError, Exception) as error:
-            logger.error(f"Failed to connect to MagicMirror, closing socket. Is MagicMirror running? : {error}")
+    def wait_until_ready(self, timeout: float = READY_TIMEOUT) -> Optional[float]:
+        """
+        Waits until MagicMirror answers requests, and then until the MMM-mmpm module accepts connections. If
+        MMM-mmpm doesn't within MODULE_TIMEOUT (ie. it isn't installed), MagicMirror is ready once it answers.
+
+        Parameters:
+            timeout (float): seconds MagicMirror has to answer requests
+
+        Returns:
+            elapsed (Optional[float]): seconds until MagicMirror was ready, or None if it didn't answer within the timeout
+        """
+
+        serving = __wait__(self.serving, timeout)
+
+        if serving is None:
+            return None
 
-        return False
+        connected = __wait__(lambda: self.client.connect(timeout=2, quiet=True), MODULE_TIMEOUT)
 
-    def start(self) -> bool:
+        if connected is None:
+            logger.warning(f"MagicMirror is running, but MMM-mmpm did not accept connections within {MODULE_TIMEOUT:g} seconds. Is it installed?")
+            return serving
+
+        return serving + connected
+
+    def start(self, timeout: float = READY_TIMEOUT) -> bool:
         """
         Launches MagicMirror using pm2, if found, otherwise a 'npm start' is run as
-        a background process
+        a background process, and waits until it is ready (see wait_until_ready)
 
         Parameters:
-            None
+            timeout (float): seconds MagicMirror has to answer requests once launched
 
         Returns:
             True if the operation is successful, False otherwise.
         """
+
+        if self.serving():
+            logger.info("MagicMirror is already running")
+            return True
+
+        start = monotonic()
         command = ["npm", "run", "start"]
 
         pm2_process: str = self.env.MMPM_MAGICMIRROR_PM2_PROCESS_NAME.get()
@@ -200,26 +377,44 @@ class MagicMirrorController(Singleton):
             logger.error("MagicMirror dependencies have not been installed. Please run `mmpm mm-ctl --install` first.")
             return False
 
-        os.chdir(root)
-
         logger.debug(f"Attempting to start MagicMirror using {' '.join(command)} ")
         error_code, _, stderr = run_cmd(
             command,
             message="Starting MagicMirror",
             background=bool(command[0] == "npm"),
+            cwd=root,
         )
 
         if error_code:
             logger.error(stderr)
             return False
 
-        logger.info("Started MagicMirror")
+        logger.debug("Waiting for MagicMirror to be ready")
+
+        if self.wait_until_ready(max(timeout - (monotonic() - start), 0)) is None:
+            logger.error(f"MagicMirror was launched, but did not answer requests within {timeout:g} seconds")
+            return False
+
+        elapsed = monotonic() - start
+        metrics.MAGICMIRROR_READY_DURATION.observe(elapsed)
+        logger.info(f"Started MagicMirror, which was ready in {elapsed:.1f} seconds")
+        return True
+
+    def __stopped__(self) -> bool:
+        # the connection to MMM-mmpm belongs to the MagicMirror which stopped, not to the next one
+        self.client.close()
+
+        if __wait__(lambda: not self.serving(), STOP_TIMEOUT) is None:
+            logger.error(f"MagicMirror was stopped, but still answered requests after {STOP_TIMEOUT:g} seconds")
+            return False
+
+        logger.info("Stopped MagicMirror")
         return True
 
     def stop(self) -> bool:
         """
         Stops MagicMirror using pm2, if found, otherwise the associated
-        processes are killed
+        processes are killed, and waits until it no longer answers requests
 
         Parameters:
             None
@@ -250,31 +445,33 @@ class MagicMirrorController(Singleton):
                 return False
 
             logger.debug(f"Stopped MagicMirror using '{command[0]}'")
-            logger.info("Stopped MagicMirror")
-            return True
+            return self.__stopped__()
 
         logger.debug("Stopping electron processes associated with MagicMirror")
         kill_pids_of_process("electron")
-        logger.info("Stopped MagicMirror")
-        return True
+        return self.__stopped__()
 
-    def restart(self) -> bool:
+    def restart(self, timeout: float = READY_TIMEOUT) -> bool:
         """
         Restarts MagicMirror using pm2, if found, otherwise the associated
-        processes are killed and 'npm start' is re-run a background process
+        processes are killed and 'npm start' is re-run a background process.
+        MagicMirror is started once it has stopped, and the restart is done
+        once it is ready again. If it wasn't running, it is only started.
 
         Parameters:
-            None
+            timeout (float): seconds MagicMirror has to answer requests once launched
 
         Returns:
             success (bool): True if successful, False if failure
         """
+
+        running = self.serving()
+
         if not self.stop():
             return False
 
-        sleep(2)
-
-        if not self.start():
+        if not self.start(timeout):
             return False
 
+        logger.info("Restarted MagicMirror" if running else "MagicMirror was not running, so it was started rather than restarted")
         return True
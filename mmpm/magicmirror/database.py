@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 import datetime
 import json
-import os
+import time
 from pathlib import Path, PosixPath
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import requests
 from bs4 import BeautifulSoup
 
+from mmpm import metrics
 from mmpm.constants import color, paths, urls
 from mmpm.env import MMPMEnv
 from mmpm.log.factory import MMPMLogFactory
@@ -30,6 +31,8 @@ class MagicMirrorDatabase(Singleton):
         self.last_update: datetime.datetime = None
         self.expiration_date: datetime.datetime = None
         self.categories: List[str] = None
+        # the remote origin URL of each installed package, along with when its .git/config was last modified
+        self.__discovered: Dict[PosixPath, Tuple[int, str]] = {}
 
     def __download_packages__(self) -> List[MagicMirrorPackage]:
         """
@@ -46,7 +49,9 @@ class MagicMirrorDatabase(Singleton):
 
         try:
             response = requests.get(urls.MAGICMIRROR_MODULES_URL, timeout=10)
+            metrics.remote_request(urls.MAGICMIRROR_MODULES_URL, response.status_code, response.headers)
         except requests.exceptions.RequestException:
+            metrics.remote_request(urls.MAGICMIRROR_MODULES_URL)
             logger.fatal("Unable to retrieve MagicMirror modules.")
 
         soup = BeautifulSoup(response.text, "html.parser")
@@ -87,7 +92,8 @@ class MagicMirrorDatabase(Singleton):
 
     def __discover_installed_packages__(self) -> List[MagicMirrorPackage]:
         """
-        Discovers installed MagicMirror packages by scanning the modules directory.
+        Discovers installed MagicMirror packages by scanning the modules directory. The remote origin of
+        each package is cached until its .git/config changes, so only new or changed packages run git.
 
         Parameters:
             None
@@ -111,10 +117,22 @@ class MagicMirrorDatabase(Singleton):
             return []
 
         packages_found: List[MagicMirrorPackage] = []
+        discovered: Dict[PosixPath, Tuple[int, str]] = {}
 
         for package_dir in package_directories:
-            os.chdir(package_dir)
-            error_code, remote_origin_url, _ = run_cmd(["git", "config", "--get", "remote.origin.url"], progress=False)
+            git_config = package_dir / ".git" / "config"
+            mtime = (git_config if git_config.exists() else package_dir / ".git").stat().st_mtime_ns
+            cached = self.__discovered.get(package_dir, (-1, ""))
+            hit = cached[0] == mtime
+
+            metrics.cache_lookup("discovery", hit)
+
+            if hit:
+                discovered[package_dir] = cached
+                packages_found.append(MagicMirrorPackage(repository=cached[1], directory=package_dir.name))
+                continue
+
+            error_code, remote_origin_url, _ = run_cmd(["git", "config", "--get", "remote.origin.url"], progress=False, cwd=package_dir)
 
             if error_code:
                 logger.error(f"Unable to communicate with git server to retrieve information about {package_dir}")
@@ -126,8 +144,10 @@ class MagicMirrorDatabase(Singleton):
                 logger.error(f"Unable to determine repository origin for {project_name}")
                 continue
 
+            discovered[package_dir] = (mtime, remote_origin_url.strip())
             packages_found.append(MagicMirrorPackage(repository=remote_origin_url.strip(), directory=package_dir.name))
 
+        self.__discovered = discovered  # replaced rather than updated, dropping packages removed since
         return packages_found
 
     def update(self, can_upgrade_mmpm: bool = False, can_upgrade_magicmirror: bool = False) -> int:
@@ -232,6 +252,7 @@ class MagicMirrorDatabase(Singleton):
         Returns:
             bool: True if successful, False otherwise.
         """
+        start = time.perf_counter()
         self.packages = []  # this is really related to the API, needing to clear the list out
 
         db_file = paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_FILE
@@ -268,7 +289,8 @@ class MagicMirrorDatabase(Singleton):
                 packages = json.load(db)
                 self.packages = [MagicMirrorPackage(**package) for package in packages]
 
-        self.packages.extend(self.custom_packages())
+        custom_packages = self.custom_packages()
+        self.packages.extend(custom_packages)
 
         self.categories = list({package.category for package in self.packages})
         discovered_packages: List[MagicMirrorPackage] = self.__discover_installed_packages__()
@@ -278,6 +300,11 @@ class MagicMirrorDatabase(Singleton):
                 if package in discovered_packages:  # (mypy thinks 'package' is a Dict[str, str])
                     package.is_installed = True  # type: ignore
 
+        metrics.DATABASE_LOAD_DURATION.observe(time.perf_counter() - start, update=str(should_update).lower())
+        metrics.DATABASE_PACKAGES.set(len(self.packages), state="available")
+        metrics.DATABASE_PACKAGES.set(sum(1 for package in self.packages if package.is_installed), state="installed")
+        metrics.DATABASE_PACKAGES.set(len(custom_packages), state="custom")
+
         return bool(len(self.packages))
 
     def custom_packages(self) -> List[MagicMirrorPackage]:
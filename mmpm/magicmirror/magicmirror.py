@@ -2,7 +2,6 @@
 import os
 import shutil
 import sys
-from os import chdir
 from pathlib import Path, PosixPath
 
 from mmpm.constants import color
@@ -41,7 +40,6 @@ class MagicMirror(Singleton):
 
         logger.debug("Checking to see if MagicMirror is up to date")
 
-        chdir(magicmirror_root)
         print(f"Retrieving: https://github.com/MagicMirrorOrg/MagicMirror [{color.n_cyan('MagicMirror')}]")
 
         try:
@@ -73,23 +71,21 @@ class MagicMirror(Singleton):
             logger.error(message)
             return False
 
-        os.chdir(root_dir)
-
-        error_code, _, stderr = run_cmd(["git", "checkout", "."], progress=False)
+        error_code, _, stderr = run_cmd(["git", "checkout", "."], progress=False, cwd=root_dir)
 
         if error_code:
             message = "Failed to checkout MagicMirror repo for clean upgrade"
             logger.error(f"{message}. See `mmpm log` for details")
             return stderr
 
-        error_code, _, stderr = run_cmd(["git", "pull"], progress=False)
+        error_code, _, stderr = run_cmd(["git", "pull"], progress=False, cwd=root_dir)
 
         if error_code:
             message = "Failed to upgrade MagicMirror"
             logger.error(f"{message}. See `mmpm log` for details")
             return stderr
 
-        error_code, _, stderr = run_cmd(["npm", "install"], progress=True)
+        error_code, _, stderr = run_cmd(["npm", "install"], progress=True, cwd=root_dir)
 
         if error_code:
             logger.error(stderr)
@@ -124,10 +120,9 @@ class MagicMirror(Singleton):
 
         if not root_path.exists():
             root_path.mkdir(exist_ok=True)
-            os.chdir(root_path.parent)
 
             error_code, _, stderr = run_cmd(
-                ["git", "clone", "https://github.com/MagicMirrorOrg/MagicMirror"],
+                ["git", "clone", "https://github.com/MagicMirrorOrg/MagicMirror", str(root_path)],
                 progress=True,
                 message="Downloading MagicMirror",
             )
@@ -136,12 +131,11 @@ class MagicMirror(Singleton):
                 logger.error(f"Failed to download MagicMirror: {stderr}")
                 return False
 
-        os.chdir(root_path)
-
         error_code, _, stderr = run_cmd(
             ["npm", "run", "install-mm"],
             progress=True,
             message="Installing MagicMirror",
+            cwd=root_path,
         )
 
         if error_code:
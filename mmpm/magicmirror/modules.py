@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+import threading
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from mmpm.log.factory import MMPMLogFactory
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+class ModuleStates:
+    """
+    The last known state of the modules of MagicMirror, as reported by the MMM-mmpm module, keyed by module key
+    and kept in the order MagicMirror lists them. Replaced by the complete lists of ACTIVE_MODULES events, and
+    updated from the modules of MODULES_TOGGLED events.
+
+    Attributes:
+        known (bool): whether MMM-mmpm has reported the modules yet
+        updated (float): the time.monotonic() of the last report, or 0.0 if there hasn't been one
+    """
+
+    def __init__(self):
+        self.known: bool = False
+        self.updated: float = 0.0
+        self.__modules: Dict[int, dict] = {}
+        self.__lock = threading.Lock()
+
+    def __keyed__(self, modules: Any) -> Dict[int, dict]:
+        if not isinstance(modules, list):
+            logger.debug(f"Ignoring modules which aren't a list: {modules}")
+            return {}
+
+        return {module["key"]: module for module in modules if isinstance(module, dict) and "key" in module}
+
+    def replace(self, modules: Any) -> bool:
+        """
+        Replaces the state of every module.
+
+        Parameters:
+            modules (Any): the modules reported by MMM-mmpm
+
+        Returns:
+            changed (bool): True if the state of any module changed, or if the modules weren't known yet
+        """
+
+        keyed = self.__keyed__(modules)
+
+        with self.__lock:
+            changed = not self.known or keyed != self.__modules
+            self.__modules = keyed
+            self.known = True
+            self.updated = monotonic()
+
+        return changed
+
+    def merge(self, modules: Any) -> bool:
+        """
+        Updates the state of the given modules, leaving the others as they are.
+
+        Parameters:
+            modules (Any): the modules reported by MMM-mmpm
+
+        Returns:
+            changed (bool): True if the state of any module changed
+        """
+
+        keyed = self.__keyed__(modules)
+
+        with self.__lock:
+            changed = any(self.__modules.get(key) != module for key, module in keyed.items())
+            self.__modules.update(keyed)
+            self.updated = monotonic()
+
+        return changed
+
+    def snapshot(self) -> List[dict]:
+        """
+        The modules, in the order MagicMirror lists them.
+
+        Parameters:
+            None
+
+        Returns:
+            modules (List[dict]): a copy of the state of each module
+        """
+
+        with self.__lock:
+            return [dict(module) for module in self.__modules.values()]
+
+    def delta(self, before: List[dict]) -> Optional[List[dict]]:
+        """
+        The changes since an earlier snapshot, as the key and the changed fields of each module which changed,
+        ie. [{"key": 3, "hidden": True}] when only the module with key 3 was hidden.
+
+        Parameters:
+            before (List[dict]): an earlier snapshot
+
+        Returns:
+            changes (Optional[List[dict]]): the changes, or None if modules (or their fields) were added, removed,
+                or reordered since, which the changes can't describe
+        """
+
+        current = self.snapshot()
+
+        if [module["key"] for module in before] != [module["key"] for module in current]:
+            return None
+
+        changes = []
+
+        for old, new in zip(before, current):
+            if set(old) - set(new):
+                return None
+
+            fields = {field: value for field, value in new.items() if field not in old or old[field] != value}
+
+            if fields:
+                changes.append({"key": new["key"], **fields})
+
+        return changes
+
+    def age(self) -> float:
+        """
+        Seconds since MMM-mmpm last reported the modules, or infinity if it never has.
+        """
+
+        return monotonic() - self.updated if self.known else float("inf")
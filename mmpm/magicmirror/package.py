@@ -12,6 +12,7 @@ from typing import Any, Callable, Dict, List, Tuple
 import requests
 from bs4 import NavigableString, Tag
 
+from mmpm import metrics
 from mmpm.constants import color
 from mmpm.env import MMPMEnv
 from mmpm.log.factory import MMPMLogFactory
@@ -238,8 +239,6 @@ class MagicMirrorPackage:
             self.is_upgradable = False
             return
 
-        os.chdir(modules_dir / self.directory)
-
         try:
             self.is_upgradable = repo_up_to_date(modules_dir / self.directory)
         except KeyboardInterrupt:
@@ -258,9 +257,7 @@ class MagicMirrorPackage:
         """
         modules_dir: PosixPath = self.env.MMPM_MAGICMIRROR_ROOT.get() / "modules"
 
-        os.chdir(modules_dir / self.directory)
-
-        error_code, stdout, stderr = run_cmd(["git", "pull"], message="Retrieving changes")
+        error_code, stdout, stderr = run_cmd(["git", "pull"], message="Retrieving changes", cwd=modules_dir / self.directory)
 
         if error_code or stderr:
             logger.error(f"Failed to upgrade {self.title}: {stderr}")
@@ -351,9 +348,9 @@ class InstallationHandler:
         """
         Utility method that detects package.json, Gemfiles, Makefiles, and
         CMakeLists.txt files, and handles the build process for each of the
-        previously mentioned files. If the install is successful, an empty string
-        is returned. The installation process relies on the location of the current
-        directory the os library detects.
+        previously mentioned files. Every build command is run with the package
+        directory as its working directory, so the current directory of the process
+        is never modified.
 
         Parameters:
             directory (str): the root directory of the package
@@ -369,8 +366,6 @@ class InstallationHandler:
             logger.fatal(f"{root.name}='{modules_dir}' does not exist. Is {root.name} set properly?")
             return False
 
-        os.chdir(modules_dir)
-
         if not (self.package.directory / ".git").exists():
             logger.debug(f"{self.package.directory / '.git'} not found. Cloning repo.")
             error_code, _, stderr = self.package.clone()
@@ -379,8 +374,6 @@ class InstallationHandler:
                 logger.error(f"Failed to clone {self.package.title}: {stderr}")
                 return False
 
-        os.chdir(self.package.directory)
-
         if self.exists("package.json"):
             return self.exec(self.npm_install)
         elif self.exists("Gemfile"):
@@ -415,9 +408,8 @@ class InstallationHandler:
         build_dir.mkdir(exist_ok=True)
 
         os.system(f"rm -rf {build_dir}/*")
-        os.chdir(build_dir)
 
-        return run_cmd(["cmake", ".."], message="Building with CMake")
+        return run_cmd(["cmake", ".."], message="Building with CMake", cwd=build_dir)
 
     def make(self) -> Tuple[int, str, str]:
         """
@@ -430,7 +422,7 @@ class InstallationHandler:
             Tuple[int, str, str]: A tuple containing the exit code, stdout, and stderr from the 'pip install' command.
         """
         logger.debug(f"Found Makefile. Running `make -j {cpu_count()} in {self.package.directory}`")
-        return run_cmd(["make", "-j", f"{cpu_count()}"], message="Building with 'make'")
+        return run_cmd(["make", "-j", f"{cpu_count()}"], message="Building with 'make'", cwd=self.package.directory)
 
     def npm_install(self) -> Tuple[int, str, str]:
         """
@@ -443,7 +435,7 @@ class InstallationHandler:
             Tuple[int, str, str]: A tuple containing the exit code, stdout, and stderr from the 'pip install' command.
         """
         logger.debug(f"Found package.json. Running `npm install` in {self.package.directory}")
-        return run_cmd(["npm", "install"], message="Installing Node dependencies")
+        return run_cmd(["npm", "install"], message="Installing Node dependencies", cwd=self.package.directory)
 
     def bundle_install(self) -> Tuple[int, str, str]:
         """
@@ -456,7 +448,7 @@ class InstallationHandler:
             Tuple[int, str, str]: A tuple containing the exit code, stdout, and stderr from the 'pip install' command.
         """
         logger.debug(f"Found Gemfile. Running `bundle install` in {self.package.directory}")
-        return run_cmd(["bundle", "install"], message="Installing Ruby dependencies")
+        return run_cmd(["bundle", "install"], message="Installing Ruby dependencies", cwd=self.package.directory)
 
     def pip_install(self) -> Tuple[int, str, str]:
         """
@@ -472,6 +464,7 @@ class InstallationHandler:
         return run_cmd(
             ["pip", "install", "-r", "requirements.txt"],
             message="Installing Python dependencies",
+            cwd=self.package.directory,
         )
 
     def maven_install(self) -> Tuple[int, str, str]:
@@ -485,7 +478,7 @@ class InstallationHandler:
             Tuple[int, str, str]: A tuple containing the exit code, stdout, and stderr from the 'pip install' command.
         """
         logger.debug(f"Running 'mvn install' in {self.package.directory}")
-        return run_cmd(["mvn", "install"], message="Building with Maven")
+        return run_cmd(["mvn", "install"], message="Building with Maven", cwd=self.package.directory)
 
     def go_build(self) -> Tuple[int, str, str]:
         """
@@ -498,7 +491,7 @@ class InstallationHandler:
             Tuple[int, str, str]: A tuple containing the exit code, stdout, and stderr from the 'pip install' command.
         """
         logger.debug(f"Running 'go build' in {self.package.directory}")
-        return run_cmd(["go", "build"], message="Building Go project")
+        return run_cmd(["go", "build"], message="Building Go project", cwd=self.package.directory)
 
     def exists(self, file_name: str) -> bool:
         """
@@ -558,6 +551,7 @@ class RemotePackage:
         try:
             # GitLab doesn't have rate limits that will cause any issues with checking for repos
             gitlab_api = requests.head("https://gitlab.com", allow_redirects=True, timeout=10)
+            metrics.remote_request("https://gitlab.com", gitlab_api.status_code, gitlab_api.headers)
 
             if gitlab_api.status_code != 200:
                 health["gitlab"]["error"] = "GitLab server returned invalid response"
@@ -567,6 +561,7 @@ class RemotePackage:
         try:
             # Bitbucket rate limits are similar to GitLab
             bitbucket_api = requests.head("https://bitbucket.org", allow_redirects=True, timeout=10)
+            metrics.remote_request("https://bitbucket.org", bitbucket_api.status_code, bitbucket_api.headers)
 
             if bitbucket_api.status_code != 200:
                 health["bitbucket"]["error"] = "Bitbucket server returned invalid response"
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+In-process metrics, exposed by the API at /api/metrics in the Prometheus text format, so where the time
+goes on a device can be seen without installing anything else.
+
+Metrics are plain counters, gauges, and histograms, optionally with labels, kept in memory by the process
+that records them. The metrics below are shared across MMPM: the API server records them, along with
+anything it runs (ie. commands started by `run_cmd`, or requests sent by `safe_get_request`). Values which
+are cheaper to read than to keep up to date (ie. the depth of the log queue) are read by collectors,
+registered with REGISTRY.collector, just before the metrics are rendered.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = Tuple[str, ...]
+
+
+def __escape__(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def __number__(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric(ABC):
+    """
+    The base of every metric: a named family of values, one per combination of label values.
+
+    Attributes:
+        name (str): the name of the metric, ie. 'mmpm_subprocess_duration_seconds'
+        documentation (str): what the metric measures
+        labelnames (Tuple[str, ...]): the names of the labels of the metric
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["MetricsRegistry"] = None):
+        """
+        Parameters:
+            name (str): the name of the metric, ie. 'mmpm_subprocess_duration_seconds'
+            documentation (str): what the metric measures
+            labelnames (Sequence[str]): the names of the labels of the metric
+            registry (Optional[MetricsRegistry]): where the metric is registered, defaults to REGISTRY
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Labels = tuple(labelnames)
+        self._lock = threading.Lock()
+
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects the labels {self.labelnames}, got {tuple(labels)}")
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Labels, extra: str = "") -> str:
+        pairs = [f'{name}="{__escape__(value)}"' for name, value in zip(self.labelnames, key)]
+
+        if extra:
+            pairs.append(extra)
+
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """
+        Formats each value of the metric as a line of the Prometheus text format.
+
+        Parameters:
+            None
+
+        Returns:
+            lines (List[str]): a line per sample, ie. 'mmpm_log_queue_depth 0'
+        """
+
+    def render(self) -> str:
+        """
+        Formats the metric in the Prometheus text format.
+
+        Parameters:
+            None
+
+        Returns:
+            text (str): the HELP and TYPE lines, followed by a line per sample
+        """
+
+        return "\n".join([f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()])
+
+
+class Counter(Metric):
+    """
+    A value which only ever increases, ie. the number of requests sent.
+    """
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+
+        with self._lock:
+            self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self.__values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self.__values.items())
+
+        return [f"{self.name}{self._labels(key)} {__number__(value)}" for key, value in values]
+
+
+class Gauge(Metric):
+    """
+    A value which can go up and down, ie. the number of packages installed.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__values: Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self.__values[self._key(labels)] = value
+
+    def value(self, **labels: str) -> float:
+        return self.__values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self.__values.items())
+
+        return [f"{self.name}{self._labels(key)} {__number__(value)}" for key, value in values]
+
+
+class Histogram(Metric):
+    """
+    The distribution of observed values, ie. how long commands take, counted in cumulative buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets)) + (float("inf"),)
+        self.__counts: Dict[Labels, List[int]] = {}
+        self.__sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+
+        with self._lock:
+            counts = self.__counts.setdefault(key, [0] * len(self.buckets))
+
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+
+            self.__sums[key] = self.__sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observes how long the block takes to run, even if it raises.
+        """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self.__counts.get(self._key(labels), []))
+
+    def samples(self) -> List[str]:
+        lines: List[str] = []
+
+        with self._lock:
+            series = sorted((key, list(counts), self.__sums[key]) for key, counts in self.__counts.items())
+
+        for key, counts, total in series:
+            cumulative = 0
+
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = 'le="' + __number__(bound) + '"'
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {cumulative}")
+
+            lines.append(f"{self.name}_sum{self._labels(key)} {__number__(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Keeps track of every metric, and renders them all at once.
+    """
+
+    def __init__(self):
+        self.__metrics: Dict[str, Metric] = {}
+        self.__collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self.__metrics:
+            raise ValueError(f"A metric named {metric.name} is already registered")
+
+        self.__metrics[metric.name] = metric
+
+    def collector(self, collect: Callable[[], None]) -> Callable[[], None]:
+        """
+        Registers a function which updates metrics just before they are rendered. Usable as a decorator.
+
+        Parameters:
+            collect (Callable[[], None]): the function
+
+        Returns:
+            collect (Callable[[], None]): the same function
+        """
+
+        self.__collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        """
+        Formats every metric in the Prometheus text format (version 0.0.4).
+
+        Parameters:
+            None
+
+        Returns:
+            text (str): the metrics, ending with a newline
+        """
+
+        for collect in self.__collectors:
+            collect()
+
+        return "\n".join(metric.render() for metric in self.__metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+API_REQUEST_DURATION = Histogram(
+    "mmpm_api_request_duration_seconds",
+    "Time taken to handle requests to the MMPM API.",
+    ("blueprint", "route", "method", "status"),
+)
+
+DATABASE_LOAD_DURATION = Histogram(
+    "mmpm_database_load_duration_seconds",
+    "Time taken to load the package database, including downloading it if update is 'true'.",
+    ("update",),
+)
+
+DATABASE_PACKAGES = Gauge(
+    "mmpm_database_packages",
+    "The number of packages in the database as of the last load, by state (available, installed, custom).",
+    ("state",),
+)
+
+MAGICMIRROR_READY_DURATION = Histogram(
+    "mmpm_magicmirror_ready_duration_seconds",
+    "Time taken by MagicMirror to be ready (answering requests, and accepting connections to MMM-mmpm) once started by MMPM.",
+)
+
+SUBPROCESS_DURATION = Histogram(
+    "mmpm_subprocess_duration_seconds",
+    "Time taken by commands run by MMPM, by executable (ie. git, npm, make).",
+    ("command",),
+)
+
+SUBPROCESS_FAILURES = Counter(
+    "mmpm_subprocess_failures_total",
+    "The number of commands run by MMPM which exited with a non-zero status, by executable.",
+    ("command",),
+)
+
+CACHE_REQUESTS = Counter(
+    "mmpm_cache_requests_total",
+    "The number of lookups of cached values, by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+CACHE_HIT_RATIO = Gauge(
+    "mmpm_cache_hit_ratio",
+    "The fraction of lookups of each cache which were hits.",
+    ("cache",),
+)
+
+REMOTE_REQUESTS = Counter(
+    "mmpm_remote_requests_total",
+    "The number of requests sent to remote APIs, by host and response status ('error' if no response was received).",
+    ("host", "status"),
+)
+
+REMOTE_RATE_LIMIT_REMAINING = Gauge(
+    "mmpm_remote_rate_limit_remaining",
+    "The number of requests remaining before the rate limit of a remote API is reached, as of the last response.",
+    ("host",),
+)
+
+LOG_QUEUE_DEPTH = Gauge("mmpm_log_queue_depth", "The number of log records waiting to be written.")
+LOG_QUEUE_CAPACITY = Gauge("mmpm_log_queue_capacity", "The maximum number of log records waiting to be written.")
+LOG_RECORDS_DROPPED = Counter("mmpm_log_records_dropped_total", "The number of log records dropped because the log queue was full.")
+
+__cache_lookups: Dict[str, List[int]] = {}
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """
+    Records a lookup of a cached value, updating the hit ratio of the cache.
+
+    Parameters:
+        cache (str): the name of the cache, ie. 'env'
+        hit (bool): True if the cached value was used
+
+    Returns:
+        None
+    """
+
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+    lookups = __cache_lookups.setdefault(cache, [0, 0])
+    lookups[0] += int(hit)
+    lookups[1] += 1
+
+    CACHE_HIT_RATIO.set(lookups[0] / lookups[1], cache=cache)
+
+
+def remote_request(url: str, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None) -> None:
+    """
+    Records a request sent to a remote API, along with the number of requests remaining before its rate
+    limit is reached, if the response says (ie. the X-RateLimit-Remaining header of GitHub).
+
+    Parameters:
+        url (str): the URL requested
+        status (Optional[int]): the status of the response, None if there was no response
+        headers (Optional[Mapping[str, str]]): the headers of the response
+
+    Returns:
+        None
+    """
+
+    host = urlparse(url).hostname or "unknown"
+    REMOTE_REQUESTS.inc(host=host, status=str(status) if status else "error")
+
+    remaining = (headers or {}).get("X-RateLimit-Remaining")
+
+    if remaining is not None and str(remaining).isdigit():
+        REMOTE_RATE_LIMIT_REMAINING.set(int(remaining), host=host)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Serves everything the UI needs from a single gevent process on a single port (`mmpm serve`), rather than
+the four processes MMPMui starts with pm2, which matters on devices with little memory (ie. a 1GB Pi):
+
+    /api/...             the API (see mmpm.api.entrypoint), along with its SocketIO server for background jobs
+    /logs                the log server, as a SocketIO namespace (see mmpm.log.server)
+    /repeater            the repeater, as a SocketIO namespace (see mmpm.api.repeater)
+    everything else      the UI
+
+The UI is served from the port of the API (7891 by default), which is how it knows to connect to the
+namespaces, rather than to the ports of the separate log server and repeater.
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import signal
+from argparse import ArgumentParser
+from pathlib import Path
+
+import gevent
+from flask import Flask
+from gevent.pywsgi import WSGIServer
+from geventwebsocket.handler import WebSocketHandler
+
+from mmpm.api import repeater
+from mmpm.api.entrypoint import app, sio
+from mmpm.api.warmup import warmup
+from mmpm.constants import urls
+from mmpm.log import server as log_server
+from mmpm.log.factory import MMPMLogFactory
+from mmpm.static import UI_DIR, StaticFiles
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+def create(ui_dir: Path = UI_DIR) -> Flask:
+    """
+    Adds the log server, the repeater, and the UI to the API.
+
+    Parameters:
+        ui_dir (Path): the directory of the built UI
+
+    Returns:
+        app (Flask): the API, serving everything
+    """
+
+    log_server.attach(sio, namespace="/logs")
+    repeater.attach(sio, namespace="/repeater")
+
+    ui = StaticFiles(ui_dir)
+    api = app.wsgi_app
+
+    def dispatch(environ: dict, start_response):
+        if environ.get("PATH_INFO", "/").split("/")[1] in ("api", "socket.io"):
+            return api(environ, start_response)
+
+        return ui(environ, start_response)
+
+    app.wsgi_app = dispatch  # type: ignore
+    return app
+
+
+def serve(host: str = "0.0.0.0", port: int = urls.MMPM_API_SERVER_PORT) -> None:
+    """
+    Serves the API, the log server, the repeater, and the UI until the process is interrupted or terminated.
+
+    Parameters:
+        host (str): the address to listen on
+        port (int): the port to listen on
+
+    Returns:
+        None
+    """
+
+    server = WSGIServer((host, port), create(), handler_class=WebSocketHandler)
+
+    # stopping the server, rather than exiting right away, lets the atexit handlers clean up (ie. the log socket)
+    gevent.signal_handler(signal.SIGTERM, server.stop)
+
+    warmup()
+    logger.info(f"Serving the MMPM UI, API, log server, and repeater on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+def main() -> None:
+    parser = ArgumentParser(prog="mmpm.server", description="Serve the MMPM UI, API, log server, and repeater from a single process")
+    parser.add_argument("--host", default="0.0.0.0", help="the address to listen on")
+    parser.add_argument("--port", type=int, default=urls.MMPM_API_SERVER_PORT, help="the port to listen on")
+    args = parser.parse_args()
+
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
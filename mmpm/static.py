@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Serves the built UI: a small WSGI app for static files, which the browser can cache.
+
+    - Responses are compressed by serving the '.br' or '.gz' sibling of a file (ie. 'main.js.br'), if the
+      browser accepts it. Siblings are created by `precompress` when the UI is packaged, or otherwise on the
+      first request for the file (Brotli requires the optional 'brotli' package, gzip is always available).
+    - Files with a content hash in their name (ie. 'main.1a2b3c4d5e6f7a8b.js') are cached as immutable.
+      Everything else (ie. 'index.html') is revalidated on every load, using its ETag or Last-Modified.
+    - Conditional (If-None-Match, If-Modified-Since) and single range requests are supported.
+    - Files are sent with the server's `wsgi.file_wrapper` where possible, which gunicorn sends with
+      sendfile, copying nothing through Python.
+
+Usage:
+    gunicorn -k gevent 'mmpm.static:create()'        serve the UI (see MMPMui)
+    python -m mmpm.static <directory>                precompress a built UI
+"""
+import gzip
+import mimetypes
+import os
+import re
+import sys
+import tempfile
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if sys.version_info < (3, 9):
+    import importlib_resources as pkg_resources
+else:
+    import importlib.resources as pkg_resources
+
+from werkzeug.security import safe_join
+
+from mmpm.log.factory import MMPMLogFactory
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+UI_DIR: Path = pkg_resources.files("mmpm").resolve() / "ui"  # type: ignore[attr-defined]
+
+HASHED = re.compile(r"\.[0-9a-f]{16,}\.[A-Za-z0-9]+$")  # ie. main.1a2b3c4d5e6f7a8b.js, as named by the Angular build ("outputHashing": "all")
+COMPRESSIBLE = (".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt", ".xml", ".ico", ".webmanifest")
+MIN_COMPRESSED_SIZE = 1024  # smaller files barely shrink, and fit in a packet or two regardless
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))  # in order of preference
+CHUNK_SIZE = 64 * 1024
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+mimetypes.add_type("text/javascript", ".js")
+mimetypes.add_type("text/javascript", ".mjs")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+Headers = List[Tuple[str, str]]
+
+
+def compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """
+    Finds the available compressors, by the name of their content encoding.
+
+    Parameters:
+        None
+
+    Returns:
+        compressors (Dict[str, Callable[[bytes], bytes]]): ie. {"gzip": ..., "br": ...}
+    """
+
+    available: Dict[str, Callable[[bytes], bytes]] = {"gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+
+    try:
+        import brotli  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        pass
+    else:
+        available["br"] = lambda data: brotli.compress(data, quality=11)
+
+    return available
+
+
+def compress(path: Path, encoding: str, compressor: Callable[[bytes], bytes]) -> Path:
+    """
+    Writes the compressed sibling of a file (ie. 'main.js.gz'), replacing it atomically, so a concurrent
+    request never reads half of it. The sibling gets the modification time of the file, which is how a
+    stale sibling (ie. left over from a previous build) is recognized.
+
+    Parameters:
+        path (Path): the file
+        encoding (str): the content encoding, ie. 'gzip'
+        compressor (Callable[[bytes], bytes]): compresses the contents of the file
+
+    Returns:
+        sibling (Path): the compressed file
+    """
+
+    sibling = path.with_name(path.name + dict(ENCODINGS)[encoding])
+    stat = path.stat()
+
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as temporary:
+        try:
+            temporary.write(compressor(path.read_bytes()))
+            temporary.close()
+            os.utime(temporary.name, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(temporary.name, sibling)
+        except BaseException:
+            os.unlink(temporary.name)
+            raise
+
+    return sibling
+
+
+def compressible(path: Path) -> bool:
+    return path.suffix in COMPRESSIBLE and path.stat().st_size >= MIN_COMPRESSED_SIZE
+
+
+def precompress(directory: Path) -> int:
+    """
+    Writes the compressed siblings of every compressible file within a directory, ie. when packaging the UI.
+
+    Parameters:
+        directory (Path): the directory of the built UI
+
+    Returns:
+        count (int): the number of compressed files written
+    """
+
+    count = 0
+    available = compressors()
+
+    for path in sorted(directory.rglob("*")):
+        if path.is_file() and compressible(path):
+            for encoding in available:
+                compress(path, encoding, available[encoding])
+                count += 1
+
+    return count
+
+
+def __accepted__(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+
+    for item in header.split(","):
+        name, _, parameters = item.strip().partition(";")
+        quality = 1.0
+
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.strip().partition("=")
+
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if name:
+            accepted[name.lower()] = quality
+
+    return accepted
+
+
+def __byte_range__(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a Range header with a single range. Returns None if there is no range to honor (ie. multiple
+    ranges, which are answered with the entire file), or (-1, -1) if the range is unsatisfiable.
+    """
+
+    unit, _, ranges = header.partition("=")
+
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    first, _, last = ranges.strip().partition("-")
+
+    try:
+        if not first:  # the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+
+    if start > end or start >= size:
+        return -1, -1
+
+    return start, end
+
+
+class StaticFiles:
+    """
+    A WSGI app serving the files within a directory.
+
+    Attributes:
+        directory (Path): the directory served
+        index (str): the file served for a directory, ie. for '/'
+        compress_missing (bool): whether missing compressed siblings are created on the first request for a file
+    """
+
+    def __init__(self, directory: Path, index: str = "index.html", compress_missing: bool = True):
+        self.directory = Path(directory)
+        self.index = index
+        self.compress_missing = compress_missing
+        self.__compressors = compressors()
+        self.__uncompressible: set = set()  # files whose siblings couldn't be written, ie. a read-only installation
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        method = environ.get("REQUEST_METHOD", "GET")
+
+        if method not in ("GET", "HEAD"):
+            return self.__error__(start_response, "405 Method Not Allowed", [("Allow", "GET, HEAD")])
+
+        path = self.__resolve__(environ.get("PATH_INFO", "/"))
+
+        if path is None:
+            return self.__error__(start_response, "404 Not Found")
+
+        encoding, variant = self.__negotiate__(path, environ.get("HTTP_ACCEPT_ENCODING", ""))
+        stat = variant.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+        mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+        if mimetype.startswith("text/") or mimetype in ("application/json", "application/manifest+json", "image/svg+xml"):
+            mimetype += "; charset=utf-8"
+
+        headers: Headers = [
+            ("ETag", etag),
+            ("Last-Modified", formatdate(stat.st_mtime, usegmt=True)),
+            ("Cache-Control", IMMUTABLE if HASHED.search(path.name) else REVALIDATE),
+        ]
+
+        if path.suffix in COMPRESSIBLE:
+            headers.append(("Vary", "Accept-Encoding"))
+
+        if self.__not_modified__(environ, etag, stat.st_mtime):
+            start_response("304 Not Modified", headers)
+            return []
+
+        headers += [("Content-Type", mimetype), ("Accept-Ranges", "bytes")]
+
+        if encoding:
+            headers.append(("Content-Encoding", encoding))
+
+        status, start, end = "200 OK", 0, stat.st_size - 1
+        requested = environ.get("HTTP_RANGE")
+
+        if requested and environ.get("HTTP_IF_RANGE", etag) == etag:
+            byte_range = __byte_range__(requested, stat.st_size)
+
+            if byte_range == (-1, -1):
+                return self.__error__(start_response, "416 Range Not Satisfiable", [("Content-Range", f"bytes */{stat.st_size}")])
+
+            if byte_range is not None:
+                status, (start, end) = "206 Partial Content", byte_range
+                headers.append(("Content-Range", f"bytes {start}-{end}/{stat.st_size}"))
+
+        length = end - start + 1
+        headers.append(("Content-Length", str(length)))
+        start_response(status, headers)
+
+        if method == "HEAD" or length <= 0:
+            return []
+
+        file = open(variant, "rb")  # pylint: disable=consider-using-with
+        file.seek(start)
+        wrapper = environ.get("wsgi.file_wrapper")
+
+        # only gunicorn is known to stop at the Content-Length, other file wrappers send the rest of the file
+        if wrapper is not None and (end == stat.st_size - 1 or "gunicorn" in environ.get("SERVER_SOFTWARE", "")):
+            return wrapper(file, CHUNK_SIZE)
+
+        return self.__read__(file, length)
+
+    @staticmethod
+    def __read__(file, length: int) -> Iterator[bytes]:
+        with file:
+            while length > 0:
+                chunk = file.read(min(CHUNK_SIZE, length))
+
+                if not chunk:
+                    break
+
+                length -= len(chunk)
+                yield chunk
+
+    @staticmethod
+    def __error__(start_response: Callable, status: str, headers: Optional[Headers] = None) -> List[bytes]:
+        body = status.encode("utf-8")
+        start_response(status, [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", str(len(body))), *(headers or [])])
+        return [body]
+
+    def __resolve__(self, path_info: str) -> Optional[Path]:
+        # WSGI decodes the path as latin-1, whatever it really was
+        relative = path_info.encode("latin-1", errors="replace").decode("utf-8", errors="replace").lstrip("/")
+        joined = safe_join(str(self.directory), relative) if relative else str(self.directory)
+
+        if joined is None:
+            return None
+
+        path = Path(joined)
+
+        if path.is_dir():
+            path = path / self.index
+
+        return path if path.is_file() else None
+
+    def __negotiate__(self, path: Path, accept_encoding: str) -> Tuple[str, Path]:
+        """
+        Picks the encoding of the response, returning it ('' for none) with the file to send.
+        """
+
+        accepted = __accepted__(accept_encoding)
+
+        for encoding, suffix in ENCODINGS:
+            if accepted.get(encoding, 0.0) <= 0:
+                continue
+
+            sibling = path.with_name(path.name + suffix)
+
+            try:
+                if sibling.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                    return encoding, sibling
+            except FileNotFoundError:
+                pass
+
+            if self.compress_missing and encoding in self.__compressors and path not in self.__uncompressible and compressible(path):
+                try:
+                    return encoding, compress(path, encoding, self.__compressors[encoding])
+                except OSError as error:
+                    logger.warning(f"Unable to write the compressed copy of {path}, serving it uncompressed: {error}")
+                    self.__uncompressible.add(path)
+
+        return "", path
+
+    @staticmethod
+    def __not_modified__(environ: dict, etag: str, mtime: float) -> bool:
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH")
+
+        if if_none_match is not None:  # takes precedence over If-Modified-Since
+            tags = {re.sub(r"^W/", "", tag.strip()) for tag in if_none_match.split(",")}
+            return "*" in tags or etag in tags
+
+        if_modified_since = environ.get("HTTP_IF_MODIFIED_SINCE")
+
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
+
+def create(directory: Optional[str] = None) -> StaticFiles:
+    """
+    Creates the WSGI app serving the UI, ie. `gunicorn 'mmpm.static:create()'`.
+
+    Parameters:
+        directory (Optional[str]): the directory served, defaults to the UI packaged with MMPM
+
+    Returns:
+        app (StaticFiles): the WSGI app
+    """
+
+    return StaticFiles(Path(directory) if directory else UI_DIR)
+
+
+if __name__ == "__main__":
+    for target in sys.argv[1:] or [str(UI_DIR)]:
+        print(f"Compressed {precompress(Path(target))} files within {target}")
@@ -20,8 +20,6 @@ class Completion(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "completion"
-        self.help = f"Generate commands to enable autocompletion for {self.app_name}"
-        self.usage = f"{self.app_name} {self.name} --shell=[type]"
 
         self.shells: Dict[str, str] = {
             "bash": f'eval "$(register-python-argcomplete {self.app_name})"',
@@ -30,17 +28,6 @@ class Completion(SubCmd):
             "fish": f"register-python-argcomplete --shell fish {self.app_name}",
         }
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-s",
-            "--shell",
-            choices=self.shells.keys(),
-            help="The shell type to generate completion commands for",
-            dest="shell",
-        )
-
     def exec(self, args, extra):
         """
         Adds autocompletion configuration to a user's shell configuration file.
@@ -25,31 +25,8 @@ class Db(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "db"
-        self.help = "Display database metadata, or display raw database contents"
-        self.usage = f"{self.app_name} {self.name} [--<option>]"
         self.database = MagicMirrorDatabase()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        group = self.parser.add_mutually_exclusive_group()
-
-        group.add_argument(
-            "-i",
-            "--info",
-            action="store_true",
-            help="display database metadata",
-            dest="info",
-        )
-
-        group.add_argument(
-            "-d",
-            "--dump",
-            action="store_true",
-            help="dump the database contents to stdout as JSON",
-            dest="dump",
-        )
-
     def exec(self, args, extra):
         if not self.database.is_initialized():
             self.database.load()
@@ -18,13 +18,8 @@ class Env(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "env"
-        self.help = f"Display the {self.name} environment variables and their value(s)"
-        self.usage = f"{self.app_name} {self.name}"
         self.env = MMPMEnv()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
     def exec(self, args, extra):
         if extra:
             logger.error(f"Extra arguments are not accepted. See '{self.app_name} {self.name} --help'")
@@ -21,62 +21,8 @@ class List(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "list"
-        self.help = "List items such as installed packages, packages available, available upgrades, etc"
-        self.usage = f"{self.app_name} {self.name} [--<option(s)>]"
         self.database = MagicMirrorDatabase()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-t",
-            "--title-only",
-            action="store_true",
-            help="display the title only of packages (used with -c, -a, -e, or -i)",
-            dest="title_only",
-        )
-
-        group = self.parser.add_mutually_exclusive_group()
-
-        group.add_argument(
-            "-a",
-            "--all",
-            action="store_true",
-            help="list all available packages in the marketplace",
-            dest="all",
-        )
-
-        group.add_argument(
-            "-i",
-            "--installed",
-            action="store_true",
-            help="list all locally installed packages",
-            dest="installed",
-        )
-
-        group.add_argument(
-            "-e",
-            "--exclude-installed",
-            action="store_true",
-            help="list all available packages in the marketplace, excluding locally installed packages",
-            dest="exclude_installed",
-        )
-
-        group.add_argument(
-            "-c",
-            "--categories",
-            action="store_true",
-            help="list all available package categories",
-            dest="categories",
-        )
-
-        group.add_argument(
-            "--upgradable",
-            action="store_true",
-            help="list packages that have available upgrades",
-            dest="upgradable",
-        )
-
     def exec(self, args, extra):
         if not self.database.is_initialized():
             self.database.load()
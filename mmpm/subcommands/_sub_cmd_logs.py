@@ -2,6 +2,7 @@
 """ Command line options for 'log' subcommand """
 
 from mmpm.log.factory import MMPMLogFactory
+from mmpm.log.reader import LogFilter, parse_time
 from mmpm.subcommands.sub_cmd import SubCmd
 
 logger = MMPMLogFactory.get_logger(__name__)
@@ -18,32 +19,23 @@ class Logs(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "logs"
-        self.help = f"Display, tail, or zip the {self.app_name} log files"
-        self.usage = f"{self.app_name} {self.name} [--<option(s)>]"
-
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-t",
-            "--tail",
-            action="store_true",
-            help=f"Tail {self.app_name} log file(s)",
-            dest="tail",
-        )
-
-        self.parser.add_argument(
-            "-z",
-            "--zip",
-            action="store_true",
-            help=f"Zip {self.app_name} CLI and/or UI log file(s)",
-            dest="zip",
-        )
 
     def exec(self, args, extra):
         if extra:
             logger.error(f"Extra arguments are not accepted. See '{self.app_name} {self.name} --help'")
-        elif args.zip:
-            MMPMLogFactory.archive()
+        elif args.tail and args.until:
+            logger.error("--tail and --until cannot be used together")
         else:
-            MMPMLogFactory.display(tail=args.tail)
+            try:
+                since = parse_time(args.since) if args.since else None
+                until = parse_time(args.until) if args.until else None
+            except ValueError as error:
+                logger.error(str(error))
+                return
+
+            if args.zip:
+                MMPMLogFactory.archive(args.format, LogFilter(since=since, until=until))
+                return
+
+            log_filter = LogFilter(level=args.level, logger=args.logger, module=args.module, since=since, until=until, contains=args.contains)
+            MMPMLogFactory.display(tail=args.tail, log_filter=log_filter, raw=args.json)
@@ -25,92 +25,10 @@ class MmCtl(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "mm-ctl"
-        self.help = "Commands to interact with/control MagicMirror"
-        self.usage = f"{self.app_name} {self.name} [--<option>]"
         self.controller = MagicMirrorController()
         self.magicmirror = MagicMirror()
         self.env = MMPMEnv()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        subparsers = self.parser.add_subparsers(
-            dest="command",
-            description=f"use `{self.app_name} {self.name} <add/remove> --help` to see more details",
-            title=f"{self.app_name} {self.name} subcommands",
-            metavar="",
-        )
-
-        install_parser = subparsers.add_parser(
-            "install",
-            help="Install MagicMirror",
-            usage=f"{self.app_name} {self.name} install [--yes]",
-        )
-
-        install_parser.add_argument(
-            "-y",
-            "--yes",
-            action="store_true",
-            help="assume yes for user response and do not show prompt",
-            dest="assume_yes",
-        )
-
-        remove_parser = subparsers.add_parser(
-            "remove",
-            help="Remove MagicMirror",
-            usage=f"{self.app_name} {self.name} remove [--yes]",
-        )
-
-        remove_parser.add_argument(
-            "-y",
-            "--yes",
-            action="store_true",
-            help="assume yes for user response and do not show prompt",
-            dest="assume_yes",
-        )
-
-        self.parser.add_argument(
-            "--status",
-            action="store_true",
-            help="show the hidden/visible status and key(s) of module(s) on your MagicMirror",
-            dest="status",
-        )
-
-        self.parser.add_argument(
-            "--hide",
-            nargs="+",
-            help="hide module(s) on your MagicMirror via provided key(s)",
-            dest="hide",
-        )
-
-        self.parser.add_argument(
-            "--show",
-            nargs="+",
-            help="show module(s) on your MagicMirror via provided key(s)",
-            dest="show",
-        )
-
-        self.parser.add_argument(
-            "--start",
-            action="store_true",
-            help="start MagicMirror; works with pm2 and docker-compose",
-            dest="start",
-        )
-
-        self.parser.add_argument(
-            "--stop",
-            action="store_true",
-            help="stop MagicMirror; works with pm2 and docker-compose",
-            dest="stop",
-        )
-
-        self.parser.add_argument(
-            "--restart",
-            action="store_true",
-            help="restart MagicMirror; works with pm2 and docker-compose",
-            dest="restart",
-        )
-
     def exec(self, args, extra):
         if extra:
             logger.error(f"Extra arguments are not accepted. See '{self.app_name} {self.name} --help'")
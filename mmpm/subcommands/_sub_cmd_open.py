@@ -28,8 +28,6 @@ class Open(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "open"
-        self.help = "Open config files, documentation, wikis, and MagicMirror itself"
-        self.usage = f"{self.app_name} {self.name} [--<option>]"
         self.env = MMPMEnv()
         self.ui = MMPMui()
 
@@ -57,67 +55,6 @@ class Open(SubCmd):
         command = getenv("EDITOR", getenv("VISUAL", "edit"))
         system(f"{command} {file}")
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        group = self.parser.add_mutually_exclusive_group()
-
-        group.add_argument(
-            "--config",
-            action="store_true",
-            help="open MagicMirror config/config.js file in your $EDITOR",
-            dest="config",
-        )
-
-        group.add_argument(
-            "--css",
-            action="store_true",
-            help="open MagicMirror css/custom.css file (if it exists) in your $EDITOR",
-            dest="custom_css",
-        )
-
-        group.add_argument(
-            "--ui",
-            action="store_true",
-            help="open the MMPM UI in your default browser",
-            dest="ui",
-        )
-
-        group.add_argument(
-            "--magicmirror",
-            action="store_true",
-            help="open MagicMirror in your default browser (uses the MMPM_MAGICMIRROR_URI address)",
-            dest="magicmirror",
-        )
-
-        group.add_argument(
-            "--mm-wiki",
-            action="store_true",
-            help="open the MagicMirror GitHub wiki in your default browser",
-            dest="mm_wiki",
-        )
-
-        group.add_argument(
-            "--mm-docs",
-            action="store_true",
-            help="open the MagicMirror documentation in your default browser",
-            dest="mm_docs",
-        )
-
-        group.add_argument(
-            "--mmpm-wiki",
-            action="store_true",
-            help="open the MMPM GitHub wiki in your default browser",
-            dest="mmpm_wiki",
-        )
-
-        group.add_argument(
-            "--env",
-            action="store_true",
-            help="open the MMPM run-time environment variables JSON configuration file in your $EDITOR",
-            dest="mmpm_env",
-        )
-
     def exec(self, args, extra):
         if extra:
             logger.error(f"Extra arguments are not accepted. See '{self.app_name} {self.name} --help'")
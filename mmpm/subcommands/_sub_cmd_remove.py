@@ -22,22 +22,8 @@ class Remove(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "remove"
-        self.help = "Remove installed MagicMirror packages"
-        self.usage = f"{self.app_name} {self.name} <package(s)> [--yes]"
         self.database = MagicMirrorDatabase()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-y",
-            "--yes",
-            action="store_true",
-            default=False,
-            help="assume yes for user response and do not show prompt",
-            dest="assume_yes",
-        )
-
     def exec(self, args, extra):
         if not extra:
             logger.error(f"No arguments provided. See '{self.app_name} {self.name} --help'")
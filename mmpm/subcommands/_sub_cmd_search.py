@@ -18,37 +18,8 @@ class Search(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "search"
-        self.help = "Search for MagicMirror packages"
-        self.usage = f"{self.app_name} {self.name} <query> [--<option(s)>]"
         self.database = MagicMirrorDatabase()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-t",
-            "--title-only",
-            action="store_true",
-            help="only show the title of the packages matching the search results",
-            dest="title_only",
-        )
-
-        self.parser.add_argument(
-            "-c",
-            "--case-sensitive",
-            action="store_true",
-            help="search for packages using a case-sensitive query",
-            dest="case_sensitive",
-        )
-
-        self.parser.add_argument(
-            "-e",
-            "--exclude-installed",
-            action="store_true",
-            help="exclude installed packages from search results",
-            dest="exclude_installed",
-        )
-
     def exec(self, args, extra):
         if not extra:
             logger.error(f"No arguments provided. See '{self.app_name} {self.name} --help'")
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+""" Command line options for 'serve' subcommand """
+
+import os
+import sys
+
+from mmpm.log.factory import MMPMLogFactory
+from mmpm.subcommands.sub_cmd import SubCmd
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+class Serve(SubCmd):
+    """
+    The 'Serve' subcommand serves the MMPM UI, API, log server, and repeater from a single process
+    (see mmpm.server), as a lighter alternative to the processes started by `mmpm ui install`.
+
+    Custom Attributes:
+        None
+    """
+
+    def __init__(self, app_name):
+        self.app_name = app_name
+        self.name = "serve"
+
+    def exec(self, args, extra):
+        if extra:
+            logger.error(f"Extra arguments are not accepted. See '{self.app_name} {self.name} --help'")
+            return
+
+        # gevent has to patch the standard library before anything else imports it, which the CLI already has,
+        # so the server replaces this process with a fresh interpreter, rather than running within it
+        MMPMLogFactory.shutdown()
+        os.execv(sys.executable, [sys.executable, "-m", "mmpm.server", "--host", args.host, "--port", str(args.port)])
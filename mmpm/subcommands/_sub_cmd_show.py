@@ -20,21 +20,8 @@ class Show(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "show"
-        self.help = "Show details about one or more packages"
-        self.usage = f"{self.app_name} {self.name} [--remote]"
         self.database = MagicMirrorDatabase()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-r",
-            "--remote",
-            action="store_true",
-            help="display remote detail for package(s) from GitHub/GitLab/Bitbucket APIs",
-            dest="remote",
-        )
-
     def exec(self, args, extra):
         if not extra:
             logger.error(f"No arguments provided. See '{self.app_name} {self.name} --help'")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+""" Command line options for 'supervisor' subcommand """
+
+from mmpm import supervisor
+from mmpm.log.factory import MMPMLogFactory
+from mmpm.subcommands.sub_cmd import SubCmd
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+
+class Supervisor(SubCmd):
+    """
+    The 'Supervisor' subcommand starts, stops, and displays the status of the MMPM supervisor (see
+    mmpm.supervisor), which runs the MMPM UI services without pm2.
+
+    Custom Attributes:
+        None
+    """
+
+    def __init__(self, app_name):
+        self.app_name = app_name
+        self.name = "supervisor"
+
+    def exec(self, args, extra):
+        if extra:
+            logger.error(f"Extra arguments are not accepted. See '{self.app_name} {self.name} --help'")
+            return
+
+        if args.start:
+            if supervisor.start():
+                print(f"Run `{self.app_name} {self.name} --status` to display the status of the MMPM UI services.")
+
+        elif args.stop:
+            supervisor.stop()
+
+        elif args.restart:
+            if supervisor.stop():
+                supervisor.start()
+
+        elif args.status:
+            supervisor.status()
+
+        else:
+            logger.error(f"No arguments provided. See '{self.app_name} {self.name} --help'")
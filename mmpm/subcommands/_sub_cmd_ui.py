@@ -5,6 +5,7 @@
 from shutil import which
 from time import sleep
 
+from mmpm import supervisor
 from mmpm.constants import urls
 from mmpm.env import MMPMEnv
 from mmpm.log.factory import MMPMLogFactory
@@ -29,93 +30,38 @@ class Ui(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "ui"
-        self.help = f"Interact with the {self.app_name} UI "
-        self.usage = f"{self.app_name} {self.name} [--url] [--status] <install/remove>"
         self.database = MagicMirrorDatabase()
         self.ui = MMPMui()
         self.env = MMPMEnv()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-u",
-            "--url",
-            action="store_true",
-            help=f"display the url of the {self.app_name} {self.name}",
-            dest="url",
-        )
-
-        self.parser.add_argument(
-            "--status",
-            action="store_true",
-            help=f"display the status of the {self.app_name} {self.name}",
-            dest="status",
-        )
-
-        self.parser.add_argument(
-            "--start",
-            action="store_true",
-            help=f"Start the {self.app_name} {self.name}",
-            dest="start",
-        )
-
-        self.parser.add_argument(
-            "--restart",
-            action="store_true",
-            help=f"Restart the {self.app_name} {self.name}",
-            dest="restart",
-        )
-
-        self.parser.add_argument(
-            "--stop",
-            action="store_true",
-            help=f"Stop the {self.app_name} {self.name}",
-            dest="stop",
-        )
-
-        subparsers = self.parser.add_subparsers(
-            dest="command",
-            description=f"use `{self.app_name} {self.name} <subcommand> --help` to see more details",
-            title=f"{self.app_name} {self.name} subcommands",
-            metavar="",
-        )
-
-        install_parser = subparsers.add_parser("install", help=f"Install the {self.app_name} {self.name}")
-
-        install_parser.add_argument(
-            "-y",
-            "--yes",
-            action="store_true",
-            help="assume yes",
-            dest="assume_yes",
-        )
-
-        remove_parser = subparsers.add_parser("remove", help=f"Remove the {self.app_name} {self.name}")
-
-        remove_parser.add_argument(
-            "-y",
-            "--yes",
-            action="store_true",
-            help="assume yes",
-            dest="assume_yes",
-        )
-
-        reinstall_parser = subparsers.add_parser("reinstall", help=f"Reinstall the {self.app_name} {self.name}")
-
-        reinstall_parser.add_argument(
-            "-y",
-            "--yes",
-            action="store_true",
-            help="assume yes",
-            dest="assume_yes",
-        )
+    def supervise(self, args) -> None:
+        """
+        Starts, stops, restarts, or displays the status of the UI services with the MMPM supervisor, in place
+        of pm2.
 
-    def exec(self, args, extra):
-        if not which("pm2"):
-            logger.fatal("pm2 is not in your PATH. Please run `npm install -g pm2`, and run the UI installation again.")
-            return
+        Parameters:
+            args (argparse.Namespace): the parsed arguments
+
+        Returns:
+            None
+        """
+
+        logger.info(f"pm2 is not in your PATH, so the MMPM UI is run by the MMPM supervisor (see `{self.app_name} supervisor --help`)")
+
+        if args.status:
+            supervisor.status()
+
+        elif args.start:
+            supervisor.start()
 
+        elif args.stop:
+            supervisor.stop()
+
+        elif args.restart:
+            if supervisor.stop():
+                supervisor.start()
+
+    def exec(self, args, extra):
         if not self.database.is_initialized():
             self.database.load()
 
@@ -130,6 +76,13 @@ class Ui(SubCmd):
         if args.url:
             print(f"http://{urls.HOST}:{urls.MMPM_UI_PORT}")
 
+        elif not which("pm2"):
+            if args.status or args.start or args.stop or args.restart:
+                self.supervise(args)
+            else:
+                logger.fatal("pm2 is not in your PATH. Please run `npm install -g pm2`, and run the UI installation again.")
+                print(f"Alternatively, run the UI without pm2 with `{self.app_name} supervisor --start`.")
+
         elif args.status:
             self.ui.status()
 
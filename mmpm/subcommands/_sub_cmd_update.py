@@ -22,14 +22,9 @@ class Update(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "update"
-        self.help = "Check for updates for installed packages, MMPM, and MagicMirror"
-        self.usage = f"{self.app_name} {self.name}"
         self.magicmirror = MagicMirror()
         self.database = MagicMirrorDatabase()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
     def exec(self, args, extra):
         if extra:
             logger.error(f"Extra arguments are not accepted. See '{self.app_name} {self.name} --help'")
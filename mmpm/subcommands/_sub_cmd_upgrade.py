@@ -27,33 +27,10 @@ class Upgrade(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "upgrade"
-        self.help = "Upgrade packages, MMPM, and/or MagicMirror"
-        self.usage = f"{self.app_name} {self.name} <package(s)> [--yes]"
         self.database = MagicMirrorDatabase()
         self.magicmirror = MagicMirror()
         self.env = MMPMEnv()
 
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
-
-        self.parser.add_argument(
-            "-y",
-            "--yes",
-            action="store_true",
-            default=False,
-            help="assume yes for user response and do not show prompt",
-            dest="assume_yes",
-        )
-
-        self.parser.add_argument(
-            "-f",
-            "--force",
-            action="store_true",
-            default=False,
-            help="force an attempted upgrade regardless if the package isn't 'upgradable'",
-            dest="force",
-        )
-
     def exec(self, args, extra):
         if not self.database.is_initialized():
             self.database.load()
@@ -19,11 +19,6 @@ class Version(SubCmd):
     def __init__(self, app_name):
         self.app_name = app_name
         self.name = "version"
-        self.help = f"Display {self.app_name} application version"
-        self.usage = f"{self.app_name} {self.name}"
-
-    def register(self, subparser):
-        self.parser = subparser.add_parser(self.name, usage=self.usage, help=self.help)
 
     def exec(self, args, extra):
         if extra:
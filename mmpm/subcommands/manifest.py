@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Static manifest of every MMPM subcommand. The argument parser (including --help
+output and argcomplete) is built entirely from this data, so the module that
+implements a subcommand is only imported when that subcommand is executed.
+
+Each entry maps a subcommand name to:
+    module (str): the submodule of mmpm.subcommands implementing the subcommand
+    class (str): the SubCmd class within the module
+    help (str): the help text displayed by `mmpm --help`
+    usage (str): the usage text displayed by `mmpm <subcommand> --help`
+    arguments (List[Argument]): options added directly to the subcommand's parser
+    exclusive (List[Argument]): options added to a mutually exclusive group
+    subcommands (Dict[str, dict]): nested subcommands, each with help, usage, and arguments
+
+An Argument is a tuple of the flags and keyword arguments passed to ArgumentParser.add_argument.
+Any "{app_name}" or "{name}" placeholders within help, usage, and description text are formatted
+at registration time.
+"""
+from argparse import ArgumentParser, _SubParsersAction
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Tuple
+
+Argument = Tuple[Tuple[str, ...], Dict[str, Any]]
+
+ASSUME_YES: Argument = (
+    ("-y", "--yes"),
+    {"action": "store_true", "default": False, "help": "assume yes for user response and do not show prompt", "dest": "assume_yes"},
+)
+
+SUBCOMMANDS: Dict[str, Dict[str, Any]] = {
+    "completion": {
+        "module": "_sub_cmd_completion",
+        "class": "Completion",
+        "help": "Generate commands to enable autocompletion for {app_name}",
+        "usage": "{app_name} {name} --shell=[type]",
+        "arguments": [
+            (
+                ("-s", "--shell"),
+                {"choices": ["bash", "zsh", "tcsh", "fish"], "help": "The shell type to generate completion commands for", "dest": "shell"},
+            ),
+        ],
+    },
+    "db": {
+        "module": "_sub_cmd_db",
+        "class": "Db",
+        "help": "Display database metadata, or display raw database contents",
+        "usage": "{app_name} {name} [--<option>]",
+        "exclusive": [
+            (("-i", "--info"), {"action": "store_true", "help": "display database metadata", "dest": "info"}),
+            (("-d", "--dump"), {"action": "store_true", "help": "dump the database contents to stdout as JSON", "dest": "dump"}),
+        ],
+    },
+    "env": {
+        "module": "_sub_cmd_env",
+        "class": "Env",
+        "help": "Display the {name} environment variables and their value(s)",
+        "usage": "{app_name} {name}",
+    },
+    "guided-setup": {
+        "module": "_sub_cmd_guided_setup",
+        "class": "GuidedSetup",
+        "help": "Interactively setup {app_name} and its features",
+        "usage": "{app_name} {name}",
+    },
+    "install": {
+        "module": "_sub_cmd_install",
+        "class": "Install",
+        "help": "Install MagicMirror packages",
+        "usage": "{app_name} {name} <package(s)> [--yes]",
+        "arguments": [ASSUME_YES],
+    },
+    "list": {
+        "module": "_sub_cmd_list",
+        "class": "List",
+        "help": "List items such as installed packages, packages available, available upgrades, etc",
+        "usage": "{app_name} {name} [--<option(s)>]",
+        "arguments": [
+            (
+                ("-t", "--title-only"),
+                {"action": "store_true", "help": "display the title only of packages (used with -c, -a, -e, or -i)", "dest": "title_only"},
+            ),
+        ],
+        "exclusive": [
+            (("-a", "--all"), {"action": "store_true", "help": "list all available packages in the marketplace", "dest": "all"}),
+            (("-i", "--installed"), {"action": "store_true", "help": "list all locally installed packages", "dest": "installed"}),
+            (
+                ("-e", "--exclude-installed"),
+                {
+                    "action": "store_true",
+                    "help": "list all available packages in the marketplace, excluding locally installed packages",
+                    "dest": "exclude_installed",
+                },
+            ),
+            (("-c", "--categories"), {"action": "store_true", "help": "list all available package categories", "dest": "categories"}),
+            (("--upgradable",), {"action": "store_true", "help": "list packages that have available upgrades", "dest": "upgradable"}),
+        ],
+    },
+    "logs": {
+        "module": "_sub_cmd_logs",
+        "class": "Logs",
+        "help": "Display, tail, or zip the {app_name} log files",
+        "usage": "{app_name} {name} [--<option(s)>]",
+        "arguments": [
+            (("-t", "--tail"), {"action": "store_true", "help": "Tail {app_name} log file(s)", "dest": "tail"}),
+            (("-z", "--zip"), {"action": "store_true", "help": "Zip {app_name} CLI and/or UI log file(s)", "dest": "zip"}),
+            (
+                ("--format",),
+                {
+                    "choices": ["zip", "tar.gz", "tar.zst"],
+                    "default": "zip",
+                    "help": "the archive format used with --zip (tar.zst requires the zstandard package)",
+                    "dest": "format",
+                },
+            ),
+            (
+                ("-l", "--level"),
+                {
+                    "type": str.upper,
+                    "choices": ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+                    "help": "only display records at or above this level",
+                    "dest": "level",
+                },
+            ),
+            (("--logger",), {"help": "only display records from this logger, or its children (ie. mmpm.api)", "dest": "logger"}),
+            (("--module",), {"help": "only display records from this module (ie. database)", "dest": "module"}),
+            (
+                ("--since",),
+                {"help": "only display records since a date/time (ie. '2024-01-31 18:00'), or a duration ago (ie. 15m, 2h, 1d)", "dest": "since"},
+            ),
+            (
+                ("--until",),
+                {"help": "only display records before a date/time (ie. '2024-01-31 18:00'), or a duration ago (ie. 15m, 2h, 1d)", "dest": "until"},
+            ),
+            (("-g", "--grep"), {"help": "only display records with messages containing this text", "dest": "contains"}),
+            (("--json",), {"action": "store_true", "help": "display records as JSON", "dest": "json"}),
+        ],
+    },
+    "mm-ctl": {
+        "module": "_sub_cmd_mm_ctl",
+        "class": "MmCtl",
+        "help": "Commands to interact with/control MagicMirror",
+        "usage": "{app_name} {name} [--<option>]",
+        "subcommands_description": "use `{app_name} {name} <add/remove> --help` to see more details",
+        "subcommands": {
+            "install": {
+                "help": "Install MagicMirror",
+                "usage": "{app_name} {name} install [--yes]",
+                "arguments": [ASSUME_YES],
+            },
+            "remove": {
+                "help": "Remove MagicMirror",
+                "usage": "{app_name} {name} remove [--yes]",
+                "arguments": [ASSUME_YES],
+            },
+        },
+        "arguments": [
+            (
+                ("--status",),
+                {"action": "store_true", "help": "show the hidden/visible status and key(s) of module(s) on your MagicMirror", "dest": "status"},
+            ),
+            (("--hide",), {"nargs": "+", "help": "hide module(s) on your MagicMirror via provided key(s)", "dest": "hide"}),
+            (("--show",), {"nargs": "+", "help": "show module(s) on your MagicMirror via provided key(s)", "dest": "show"}),
+            (("--start",), {"action": "store_true", "help": "start MagicMirror; works with pm2 and docker-compose", "dest": "start"}),
+            (("--stop",), {"action": "store_true", "help": "stop MagicMirror; works with pm2 and docker-compose", "dest": "stop"}),
+            (("--restart",), {"action": "store_true", "help": "restart MagicMirror; works with pm2 and docker-compose", "dest": "restart"}),
+        ],
+    },
+    "mm-pkg": {
+        "module": "_sub_cmd_mm_pkg",
+        "class": "MmPkg",
+        "help": "Manually add/remove custom MagicMirror packages in your local database (similar to add-apt-repository)",
+        "usage": "{app_name} {name} <add/remove> [--<option>]",
+        "subcommands_description": "use `{app_name} {name} <add/remove> --help` to see more details",
+        "subcommands": {
+            "add": {
+                "help": "Add a custom MagicMirror package to the local database",
+                "usage": "{app_name} {name} add -t <title> -a <author> -r <repo> -d <description>",
+                "arguments": [
+                    (("-t", "--title"), {"type": str, "help": "title of MagicMirror package", "dest": "title"}),
+                    (("-a", "--author"), {"type": str, "help": "author of MagicMirror package", "dest": "author"}),
+                    (("-r", "--repo"), {"type": str, "help": "repo URL of MagicMirror package", "dest": "repo"}),
+                    (("-d", "--desc"), {"type": str, "help": "description of MagicMirror package", "dest": "desc"}),
+                ],
+            },
+            "remove": {
+                "help": "Remove a custom MagicMirror package from the local database",
+                "usage": "{app_name} {name} remove <package(s)> [--yes]",
+                "arguments": [
+                    (("pkg_name",), {"nargs": "+", "help": "name(s) of the MagicMirror package(s) to remove"}),
+                    ASSUME_YES,
+                ],
+            },
+        },
+    },
+    "open": {
+        "module": "_sub_cmd_open",
+        "class": "Open",
+        "help": "Open config files, documentation, wikis, and MagicMirror itself",
+        "usage": "{app_name} {name} [--<option>]",
+        "exclusive": [
+            (("--config",), {"action": "store_true", "help": "open MagicMirror config/config.js file in your $EDITOR", "dest": "config"}),
+            (("--css",), {"action": "store_true", "help": "open MagicMirror css/custom.css file (if it exists) in your $EDITOR", "dest": "custom_css"}),
+            (("--ui",), {"action": "store_true", "help": "open the MMPM UI in your default browser", "dest": "ui"}),
+            (
+                ("--magicmirror",),
+                {"action": "store_true", "help": "open MagicMirror in your default browser (uses the MMPM_MAGICMIRROR_URI address)", "dest": "magicmirror"},
+            ),
+            (("--mm-wiki",), {"action": "store_true", "help": "open the MagicMirror GitHub wiki in your default browser", "dest": "mm_wiki"}),
+            (("--mm-docs",), {"action": "store_true", "help": "open the MagicMirror documentation in your default browser", "dest": "mm_docs"}),
+            (("--mmpm-wiki",), {"action": "store_true", "help": "open the MMPM GitHub wiki in your default browser", "dest": "mmpm_wiki"}),
+            (
+                ("--env",),
+                {"action": "store_true", "help": "open the MMPM run-time environment variables JSON configuration file in your $EDITOR", "dest": "mmpm_env"},
+            ),
+        ],
+    },
+    "remove": {
+        "module": "_sub_cmd_remove",
+        "class": "Remove",
+        "help": "Remove installed MagicMirror packages",
+        "usage": "{app_name} {name} <package(s)> [--yes]",
+        "arguments": [ASSUME_YES],
+    },
+    "search": {
+        "module": "_sub_cmd_search",
+        "class": "Search",
+        "help": "Search for MagicMirror packages",
+        "usage": "{app_name} {name} <query> [--<option(s)>]",
+        "arguments": [
+            (
+                ("-t", "--title-only"),
+                {"action": "store_true", "help": "only show the title of the packages matching the search results", "dest": "title_only"},
+            ),
+            (
+                ("-c", "--case-sensitive"),
+                {"action": "store_true", "help": "search for packages using a case-sensitive query", "dest": "case_sensitive"},
+            ),
+            (
+                ("-e", "--exclude-installed"),
+                {"action": "store_true", "help": "exclude installed packages from search results", "dest": "exclude_installed"},
+            ),
+        ],
+    },
+    "serve": {
+        "module": "_sub_cmd_serve",
+        "class": "Serve",
+        "help": "Serve the {app_name} UI, API, log server, and repeater from a single process",
+        "usage": "{app_name} {name} [--host <address>] [--port <port>]",
+        "arguments": [
+            (("--host",), {"default": "0.0.0.0", "help": "the address to listen on (default: 0.0.0.0)", "dest": "host"}),
+            (("--port",), {"type": int, "default": 7891, "help": "the port to listen on (default: 7891)", "dest": "port"}),
+        ],
+    },
+    "show": {
+        "module": "_sub_cmd_show",
+        "class": "Show",
+        "help": "Show details about one or more packages",
+        "usage": "{app_name} {name} [--remote]",
+        "arguments": [
+            (
+                ("-r", "--remote"),
+                {"action": "store_true", "help": "display remote detail for package(s) from GitHub/GitLab/Bitbucket APIs", "dest": "remote"},
+            ),
+        ],
+    },
+    "supervisor": {
+        "module": "_sub_cmd_supervisor",
+        "class": "Supervisor",
+        "help": "Run the {app_name} UI services without pm2, restarting them when they crash or stop responding",
+        "usage": "{app_name} {name} [--start] [--stop] [--restart] [--status]",
+        "exclusive": [
+            (("--start",), {"action": "store_true", "help": "start the {app_name} {name} and the UI services in the background", "dest": "start"}),
+            (("--stop",), {"action": "store_true", "help": "stop the {app_name} {name} and the UI services", "dest": "stop"}),
+            (("--restart",), {"action": "store_true", "help": "restart the {app_name} {name} and the UI services", "dest": "restart"}),
+            (("--status",), {"action": "store_true", "help": "display the status, memory, and CPU use of the UI services", "dest": "status"}),
+        ],
+    },
+    "ui": {
+        "module": "_sub_cmd_ui",
+        "class": "Ui",
+        "help": "Interact with the {app_name} UI ",
+        "usage": "{app_name} {name} [--url] [--status] <install/remove>",
+        "arguments": [
+            (("-u", "--url"), {"action": "store_true", "help": "display the url of the {app_name} {name}", "dest": "url"}),
+            (("--status",), {"action": "store_true", "help": "display the status of the {app_name} {name}", "dest": "status"}),
+            (("--start",), {"action": "store_true", "help": "Start the {app_name} {name}", "dest": "start"}),
+            (("--restart",), {"action": "store_true", "help": "Restart the {app_name} {name}", "dest": "restart"}),
+            (("--stop",), {"action": "store_true", "help": "Stop the {app_name} {name}", "dest": "stop"}),
+        ],
+        "subcommands_description": "use `{app_name} {name} <subcommand> --help` to see more details",
+        "subcommands": {
+            "install": {
+                "help": "Install the {app_name} {name}",
+                "arguments": [(("-y", "--yes"), {"action": "store_true", "help": "assume yes", "dest": "assume_yes"})],
+            },
+            "remove": {
+                "help": "Remove the {app_name} {name}",
+                "arguments": [(("-y", "--yes"), {"action": "store_true", "help": "assume yes", "dest": "assume_yes"})],
+            },
+            "reinstall": {
+                "help": "Reinstall the {app_name} {name}",
+                "arguments": [(("-y", "--yes"), {"action": "store_true", "help": "assume yes", "dest": "assume_yes"})],
+            },
+        },
+    },
+    "update": {
+        "module": "_sub_cmd_update",
+        "class": "Update",
+        "help": "Check for updates for installed packages, MMPM, and MagicMirror",
+        "usage": "{app_name} {name}",
+    },
+    "upgrade": {
+        "module": "_sub_cmd_upgrade",
+        "class": "Upgrade",
+        "help": "Upgrade packages, MMPM, and/or MagicMirror",
+        "usage": "{app_name} {name} <package(s)> [--yes]",
+        "arguments": [
+            ASSUME_YES,
+            (
+                ("-f", "--force"),
+                {
+                    "action": "store_true",
+                    "default": False,
+                    "help": "force an attempted upgrade regardless if the package isn't 'upgradable'",
+                    "dest": "force",
+                },
+            ),
+        ],
+    },
+    "version": {
+        "module": "_sub_cmd_version",
+        "class": "Version",
+        "help": "Display {app_name} application version",
+        "usage": "{app_name} {name}",
+    },
+}
+
+
+def __add_arguments__(parser, arguments: List[Argument], app_name: str, name: str) -> None:
+    for flags, options in arguments:
+        if "help" in options:
+            options = {**options, "help": options["help"].format(app_name=app_name, name=name)}
+
+        parser.add_argument(*flags, **options)
+
+
+def __add_parser__(subparser: _SubParsersAction, name: str, spec: Dict[str, Any], app_name: str, parent: str = "") -> ArgumentParser:
+    fmt = lambda text: text.format(app_name=app_name, name=parent or name)
+    options = {"help": fmt(spec["help"])}
+
+    if "usage" in spec:
+        options["usage"] = fmt(spec["usage"])
+
+    parser = subparser.add_parser(name, **options)
+    __add_arguments__(parser, spec.get("arguments", []), app_name, parent or name)
+
+    if spec.get("exclusive"):
+        __add_arguments__(parser.add_mutually_exclusive_group(), spec["exclusive"], app_name, parent or name)
+
+    if spec.get("subcommands"):
+        subparsers = parser.add_subparsers(
+            dest="command",
+            description=fmt(spec["subcommands_description"]),
+            title=fmt("{app_name} {name} subcommands"),
+            metavar="",
+        )
+
+        for subcommand, subspec in spec["subcommands"].items():
+            __add_parser__(subparsers, subcommand, subspec, app_name, parent=name)
+
+    return parser
+
+
+def register(subparser: _SubParsersAction, app_name: str) -> None:
+    """
+    Registers every subcommand in the manifest, and their options, with the main parser
+    without importing any of the modules implementing them.
+
+    Parameters:
+        subparser (_SubParsersAction): the subparser object created by the main parser
+        app_name (str): the name of the application
+
+    Returns:
+        None
+    """
+
+    for name, spec in SUBCOMMANDS.items():
+        __add_parser__(subparser, name, spec, app_name)
+
+
+def load(name: Optional[str], app_name: str):
+    """
+    Imports the module implementing the given subcommand, and creates an instance of it.
+
+    Parameters:
+        name (Optional[str]): the name of the subcommand
+        app_name (str): the name of the application
+
+    Returns:
+        subcommand (Optional[SubCmd]): an instance of the subcommand, or None if the name is not in the manifest
+    """
+
+    spec = SUBCOMMANDS.get(name or "")
+
+    if spec is None:
+        return None
+
+    module = import_module(f"mmpm.subcommands.{spec['module']}")
+    return getattr(module, spec["class"])(app_name)
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+A small process supervisor for the services of the MMPM UI (the API, log server, repeater, and UI), as an
+alternative to pm2 for hosts without Node's pm2, or with too little memory to spare for its daemon.
+
+The supervisor runs as a single Python process (`python -m mmpm.supervisor`, or `mmpm supervisor --start`
+to run it in the background), which starts each service in its own process group, and:
+
+    restarts a service when it exits, waiting twice as long after each consecutive crash (up to a minute)
+    restarts a service when its port stops accepting connections, after a grace period for it to start
+    samples the memory (RSS) and CPU use of each service, and its children, from /proc
+
+What it knows is written to a state file (STATE_FILE), along with its own pid, which is how `mmpm supervisor
+--status` and `--stop` find it. Unlike the pm2 ecosystem, the services are not restarted when files change.
+"""
+import json
+import os
+import re
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from mmpm.constants import paths
+from mmpm.log.factory import MMPMLogFactory
+from mmpm.ui import MMPMui
+from mmpm.utils import run_cmd
+
+logger = MMPMLogFactory.get_logger(__name__)
+
+STATE_FILE = paths.MMPM_SUPERVISOR_STATE_FILE
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def __tree__(pid: int) -> List[int]:
+    """
+    The pid, along with the pids of all its descendants (ie. a gunicorn master and its workers).
+    """
+
+    pids = [pid]
+
+    try:
+        children = Path(f"/proc/{pid}/task/{pid}/children").read_text(encoding="utf-8").split()
+    except OSError:
+        return pids
+
+    for child in children:
+        pids.extend(__tree__(int(child)))
+
+    return pids
+
+
+def usage(pid: int) -> Tuple[int, int]:
+    """
+    Reads the resident memory and CPU time of a process and its descendants from /proc. Shared pages are
+    counted once per process, as pm2 does.
+
+    Parameters:
+        pid (int): the process id
+
+    Returns:
+        usage (Tuple[int, int]): the resident memory in bytes, and the CPU time in clock ticks
+    """
+
+    rss, ticks = 0, 0
+
+    for member in __tree__(pid):
+        try:
+            rss += int(Path(f"/proc/{member}/statm").read_text(encoding="utf-8").split()[1]) * PAGE_SIZE
+            # the command may contain spaces, the fields after it don't; utime and stime are fields 14 and 15
+            fields = Path(f"/proc/{member}/stat").read_text(encoding="utf-8").rsplit(")", 1)[1].split()
+            ticks += int(fields[11]) + int(fields[12])
+        except (OSError, IndexError, ValueError):
+            continue  # exited between listing and reading
+
+    return rss, ticks
+
+
+class Service:
+    """
+    A process started and watched by the Supervisor, along with what the Supervisor knows about it.
+
+    Attributes:
+        name (str): the name of the service, ie. 'mmpm.api'
+        command (List[str]): the command which starts the service
+        port (Optional[int]): the port the service listens on, which is checked to decide if it is healthy
+        process (Optional[subprocess.Popen]): the running process, if any
+        restarts (int): how many times the service has been restarted
+        healthy (Optional[bool]): the result of the last health check, None until the first one
+        rss (int): the resident memory of the service, and its children, in bytes
+        cpu (float): the CPU use of the service, and its children, as a percentage of one core
+    """
+
+    def __init__(self, name: str, command: str, port: Optional[int] = None):
+        """
+        Parameters:
+            name (str): the name of the service, ie. 'mmpm.api'
+            command (str): the command which starts the service, split like a shell would
+            port (Optional[int]): the port the service listens on, if any
+        """
+
+        self.name = name
+        self.command = shlex.split(command)
+        self.port = port
+        self.process: Optional[subprocess.Popen] = None
+        self.started: float = 0.0
+        self.restarts: int = 0
+        self.crashes: int = 0  # consecutive crashes, which decide how long to wait before the next start
+        self.retry_at: float = 0.0
+        self.failed_checks: int = 0
+        self.healthy: Optional[bool] = None
+        self.rss: int = 0
+        self.cpu: float = 0.0
+        self.__sample = (0, 0.0)
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, log_file: Path) -> None:
+        """
+        Starts the service in a process group of its own, so stopping it stops its children too.
+
+        Parameters:
+            log_file (Path): where the output of the service is appended
+
+        Returns:
+            None
+        """
+
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(log_file, mode="ab") as output:
+            self.process = subprocess.Popen(self.command, stdin=subprocess.DEVNULL, stdout=output, stderr=output, start_new_session=True)
+
+        self.started = time.monotonic()
+        self.failed_checks = 0
+        self.healthy = None
+        self.__sample = (0, 0.0)
+        logger.info(f"Started {self.name} (pid {self.process.pid})")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Terminates the process group of the service, and kills it if it hasn't exited within the timeout.
+
+        Parameters:
+            timeout (float): how many seconds to wait for the service to exit
+
+        Returns:
+            None
+        """
+
+        if self.process is None:
+            return
+
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(self.process.pid, sig)
+            except ProcessLookupError:
+                break
+
+            try:
+                self.process.wait(timeout)
+                break
+            except subprocess.TimeoutExpired:
+                logger.warning(f"{self.name} did not exit within {timeout} seconds, killing it")
+
+        self.process.wait()
+        self.process = None
+        self.rss, self.cpu = 0, 0.0
+
+    def check(self, timeout: float = 2.0) -> bool:
+        """
+        Checks the health of the service, which is whether its port accepts connections. Services without a
+        port are healthy as long as they are running.
+
+        Parameters:
+            timeout (float): how many seconds to wait for the connection
+
+        Returns:
+            healthy (bool): True if the service is healthy
+        """
+
+        if self.port is None:
+            return self.running()
+
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+
+    def sample(self) -> None:
+        """
+        Updates the memory and CPU use of the service. The CPU use is averaged since the previous sample.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        if not self.running():
+            self.rss, self.cpu = 0, 0.0
+            return
+
+        now = time.monotonic()
+        self.rss, ticks = usage(self.process.pid)  # type: ignore
+        previous_ticks, previous = self.__sample
+
+        if previous:
+            # a child exiting takes its ticks along with it
+            self.cpu = max(ticks - previous_ticks, 0) / CLOCK_TICKS / (now - previous) * 100
+
+        self.__sample = (ticks, now)
+
+    def state(self) -> Dict:
+        return {
+            "pid": self.pid,
+            "status": "online" if self.running() else "waiting",
+            "healthy": self.healthy,
+            "restarts": self.restarts,
+            "uptime": round(time.monotonic() - self.started, 1) if self.running() else 0,
+            "rss": self.rss,
+            "cpu": round(self.cpu, 1),
+        }
+
+
+def services() -> List[Service]:
+    """
+    The services of the MMPM UI, as configured for pm2 in MMPMui, with the port of each taken from its
+    gunicorn bind address.
+
+    Parameters:
+        None
+
+    Returns:
+        services (List[Service]): the services to supervise
+    """
+
+    found = []
+
+    for app in MMPMui().pm2_ecosystem_config["apps"]:
+        bind = re.search(r"-b \S*:(\d+)", app["script"])
+        found.append(Service(app["name"], app["script"], int(bind.group(1)) if bind else None))
+
+    return found
+
+
+class Supervisor:
+    """
+    Starts, restarts, health checks, and stops a set of services, keeping the state of each in STATE_FILE.
+
+    Attributes:
+        services (List[Service]): the supervised services
+        state_file (Path): where the pid of the supervisor and the state of the services are written
+    """
+
+    def __init__(
+        self,
+        supervised: Optional[List[Service]] = None,
+        state_file: Path = STATE_FILE,
+        interval: float = 5.0,
+        grace: float = 15.0,
+        failures: int = 3,
+        backoff: Tuple[float, float] = (1.0, 60.0),
+        stable: float = 30.0,
+    ):
+        """
+        Parameters:
+            supervised (Optional[List[Service]]): the services to supervise, defaults to those of the MMPM UI
+            state_file (Path): where the pid of the supervisor and the state of the services are written
+            interval (float): seconds between health checks, samples, and writes of the state file
+            grace (float): seconds a service has to start before its health is checked
+            failures (int): consecutive failed health checks before a service is restarted
+            backoff (Tuple[float, float]): the first and longest wait before restarting a crashed service
+            stable (float): seconds a service has to run for its crashes to be forgotten
+        """
+
+        self.services = services() if supervised is None else supervised
+        self.state_file = state_file
+        self.interval = interval
+        self.grace = grace
+        self.failures = failures
+        self.backoff = backoff
+        self.stable = stable
+        self.__stopping = threading.Event()
+        self.__last_interval = 0.0
+
+    def __crashed__(self, service: Service, now: float, reason: str) -> None:
+        if now - service.started >= self.stable:
+            service.crashes = 0
+
+        delay = min(self.backoff[0] * 2**service.crashes, self.backoff[1])
+        service.crashes += 1
+        service.retry_at = now + delay
+        service.stop()
+
+        logger.warning(f"{service.name} {reason}, restarting it in {delay:g} seconds")
+
+    def check(self, now: Optional[float] = None) -> None:
+        """
+        A single pass over the services: starts those which are due to be (re)started, and notices those which
+        have exited. Once every interval, health checks the services, samples their use, and writes the state.
+
+        Parameters:
+            now (Optional[float]): the current time of time.monotonic()
+
+        Returns:
+            None
+        """
+
+        now = time.monotonic() if now is None else now
+        periodic = now - self.__last_interval >= self.interval
+
+        for service in self.services:
+            if service.process is None:
+                if now >= service.retry_at:
+                    if service.started:
+                        service.restarts += 1
+
+                    service.start(paths.MMPM_LOG_DIR / f"{service.name}.log")
+
+                continue
+
+            code = service.process.poll()
+
+            if code is not None:
+                self.__crashed__(service, now, f"exited with code {code}")
+                continue
+
+            if periodic and now - service.started >= self.grace:
+                service.healthy = service.check()
+                service.failed_checks = 0 if service.healthy else service.failed_checks + 1
+
+                if service.failed_checks >= self.failures:
+                    self.__crashed__(service, now, f"failed {service.failed_checks} health checks")
+                    continue
+
+            if periodic:
+                service.sample()
+
+        if periodic:
+            self.__last_interval = now
+            self.write_state()
+
+    def write_state(self) -> None:
+        """
+        Writes the pid of the supervisor and the state of the services, replacing the state file atomically so
+        readers never see part of it.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        state = {"pid": os.getpid(), "services": {service.name: service.state() for service in self.services}}
+
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.state_file.with_suffix(".tmp")
+        temporary.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(temporary, self.state_file)
+
+    def stop(self, *_) -> None:
+        """
+        Asks the supervisor to stop its services and exit. Doubles as the handler of SIGTERM and SIGINT.
+        """
+
+        self.__stopping.set()
+
+    def run(self) -> None:
+        """
+        Supervises the services until the supervisor is stopped, then stops the services and removes the state
+        file.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        logger.info(f"Supervising {', '.join(service.name for service in self.services)}")
+
+        try:
+            while not self.__stopping.is_set():
+                self.check()
+                self.__stopping.wait(min(self.interval, 1.0))
+        finally:
+            for service in self.services:
+                service.stop()
+
+            self.state_file.unlink(missing_ok=True)
+            logger.info("Stopped supervising")
+
+
+def __is_supervisor__(pid: int) -> bool:
+    """
+    Whether the process is a supervisor, rather than another process which reused its pid (ie. after a reboot).
+    """
+
+    try:
+        return "mmpm.supervisor" in Path(f"/proc/{pid}/cmdline").read_bytes().decode("utf-8", errors="replace").split("\0")
+    except (OSError, TypeError):
+        return False
+
+
+def read_state(state_file: Path = STATE_FILE) -> Optional[Dict]:
+    """
+    Reads the state written by a running supervisor. A state file left behind by a supervisor which is no
+    longer running (ie. after a reboot) is ignored.
+
+    Parameters:
+        state_file (Path): where the supervisor writes its state
+
+    Returns:
+        state (Optional[Dict]): the state, or None if no supervisor is running
+    """
+
+    try:
+        state = json.loads(state_file.read_text(encoding="utf-8"))
+        pid = state["pid"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return state if __is_supervisor__(pid) else None
+
+
+def start(state_file: Path = STATE_FILE, timeout: float = 10.0) -> bool:
+    """
+    Starts the supervisor in the background, unless it is already running.
+
+    Parameters:
+        state_file (Path): where the supervisor writes its state
+        timeout (float): how many seconds to wait for the supervisor to write its state
+
+    Returns:
+        success (bool): True if the supervisor is running
+    """
+
+    if read_state(state_file):
+        logger.info("The MMPM supervisor is already running")
+        return True
+
+    run_cmd([sys.executable, "-m", "mmpm.supervisor"], background=True)
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if read_state(state_file):
+            return True
+        time.sleep(0.1)
+
+    logger.error(f"The MMPM supervisor did not start within {timeout} seconds")
+    return False
+
+
+def stop(state_file: Path = STATE_FILE, timeout: float = 30.0) -> bool:
+    """
+    Stops the supervisor, which stops its services first.
+
+    Parameters:
+        state_file (Path): where the supervisor writes its state
+        timeout (float): how many seconds to wait for the supervisor to exit
+
+    Returns:
+        success (bool): True if the supervisor is no longer running
+    """
+
+    state = read_state(state_file)
+
+    # checked again right before signalling, in case the supervisor exited and its pid was reused since
+    if state is None or not __is_supervisor__(state["pid"]):
+        logger.info("The MMPM supervisor is not running")
+        return True
+
+    try:
+        os.kill(state["pid"], signal.SIGTERM)
+    except ProcessLookupError:  # it exited since its state was read
+        return True
+    except OSError as error:  # ie. the supervisor of another user
+        logger.error(f"Unable to stop the MMPM supervisor (pid {state['pid']}): {error}")
+        return False
+
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if not __is_supervisor__(state["pid"]):
+            return True
+        time.sleep(0.1)
+
+    logger.error(f"The MMPM supervisor did not stop within {timeout} seconds")
+    return False
+
+
+def status(state_file: Path = STATE_FILE) -> None:
+    """
+    Displays the state of the supervised services.
+
+    Parameters:
+        state_file (Path): where the supervisor writes its state
+
+    Returns:
+        None
+    """
+
+    state = read_state(state_file)
+
+    if state is None:
+        print("The MMPM supervisor is not running")
+        return
+
+    print(f"{'name':<18} {'pid':>8} {'status':<8} {'health':<9} {'restarts':>8} {'uptime':>9} {'memory':>9} {'cpu':>6}")
+
+    for name, service in state["services"].items():
+        health = {True: "healthy", False: "unhealthy", None: "-"}[service["healthy"]]
+        print(
+            f"{name:<18} {service['pid'] or '-':>8} {service['status']:<8} {health:<9} {service['restarts']:>8} "
+            f"{service['uptime']:>8.0f}s {service['rss'] / 1024 ** 2:>6.1f} MB {service['cpu']:>5.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    if read_state():
+        logger.error("The MMPM supervisor is already running")
+        sys.exit(1)
+
+    Supervisor().run()
@@ -1,11 +1,4 @@
 #!/usr/bin/env python3
-import sys
-
-if sys.version_info < (3, 9):
-    import importlib_resources as pkg_resources
-else:
-    import importlib.resources as pkg_resources
-
 import json
 import os
 from pathlib import Path
@@ -39,7 +32,7 @@ class MMPMui(Singleton):
                 {
                     "namespace": namespace,
                     "name": f"{namespace}.api",
-                    "script": f"{gunicorn} -k gevent -b 0.0.0.0:{urls.MMPM_API_SERVER_PORT} mmpm.wsgi:app",
+                    "script": f"{gunicorn} -k geventwebsocket.gunicorn.workers.GeventWebSocketWorker -w 1 -c python:mmpm.api.gunicorn_config -b 0.0.0.0:{urls.MMPM_API_SERVER_PORT} mmpm.wsgi:app",
                     "version": version,
                     "watch": True,
                 },
@@ -60,7 +53,7 @@ class MMPMui(Singleton):
                 {
                     "namespace": namespace,
                     "name": f"{namespace}.ui",
-                    "script": f"{python} -m http.server -d {pkg_resources.files('mmpm').resolve() / 'ui'} -b 0.0.0.0 {urls.MMPM_UI_PORT}",
+                    "script": f"{gunicorn} -k gevent -w 1 'mmpm.static:create()' -b 0.0.0.0:{urls.MMPM_UI_PORT}",
                     "version": version,
                     "watch": True,
                 },
@@ -5,8 +5,9 @@ import socket
 import subprocess
 import time
 import urllib.request
+from contextvars import ContextVar
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import git
 import requests
@@ -16,12 +17,16 @@ from prompt_toolkit.shortcuts import confirm as ptk_confirm
 from yaspin import yaspin
 from yaspin.spinners import Spinners
 
+from mmpm import metrics
 from mmpm.__version__ import version as current_version
 from mmpm.constants import color
 from mmpm.log.factory import MMPMLogFactory
 
 logger = MMPMLogFactory.get_logger(__name__)
 
+# the background job (see mmpm.api.jobs) being run by the current thread/greenlet, if any
+CURRENT_JOB: ContextVar = ContextVar("CURRENT_JOB", default=None)
+
 
 def repo_up_to_date(path: Path):
     """
@@ -61,7 +66,8 @@ def repo_up_to_date(path: Path):
 
 def get_host_ip() -> str:
     """
-    Retrieves the local IP address of the host machine.
+    Retrieves the local IP address of the host machine. Prefer `mmpm.constants.urls.HOST`,
+    which calls this once per process, and only when it is first accessed.
 
     Returns:
         str: The local IP address.
@@ -76,7 +82,7 @@ def get_host_ip() -> str:
         skt.connect(("8.8.8.8", 80))
         address = skt.getsockname()[0]
         logger.debug(f"Determined Host IP={address}")
-    except socket.gaierror as error:
+    except OSError as error:  # socket.gaierror, or the network being unreachable when offline
         logger.error(f"Failed to determine host IP address: {error}")
         address = "localhost"  # just to be extra safe and make sure it's set to something usable
     finally:
@@ -85,40 +91,67 @@ def get_host_ip() -> str:
     return address
 
 
-def run_cmd(command: List[str], progress=True, background=False, message: str = "") -> Tuple[int, str, str]:
+def run_cmd(command: List[str], progress=True, background=False, message: str = "", cwd: Optional[Path] = None) -> Tuple[int, str, str]:
     """
-    Executes a shell command and captures its output and errors.
+    Executes a shell command and captures its output and errors. Within a background job (see
+    mmpm.api.jobs), the message is reported as the job's progress, and the command is killed if the
+    job is cancelled.
 
     Parameters:
         command (List[str]): The command and its arguments to be executed.
         progress (bool): If True, displays a spinner during command execution.
         background (bool): If True, runs the command in the background.
         message (str): The message to display alongside the spinner.
+        cwd (Optional[Path]): The working directory of the command. Defaults to the current directory of the process.
 
     Returns:
         Tuple[int, str, str]: A tuple containing the command's return code, standard output, and standard error.
+
+    Raises:
+        JobCancelled: If the job running the command has been cancelled.
     """
     if background:
-        logger.debug(f"Executing command `{' '.join(command)}` in background")
+        logger.debug(f"Executing command `{' '.join(command)}` in background{f' in {cwd}' if cwd else ''}")
 
         # fully detach the terminal from the process so nothing hangs
         with open(os.devnull, "wb") as devnull:
-            # pylint: disable=subprocess-popen-preexec-fn
-            subprocess.Popen(command, stdout=devnull, stderr=devnull, stdin=devnull, close_fds=True, preexec_fn=os.setsid)
+            # rather than preexec_fn=os.setsid, which runs the at-fork hooks (ie. of the logger) in the child before exec
+            subprocess.Popen(command, stdout=devnull, stderr=devnull, stdin=devnull, close_fds=True, start_new_session=True, cwd=cwd)
 
         return 0, "", ""
 
-    logger.debug(f'Executing command `{" ".join(command)}`')
+    logger.debug(f'Executing command `{" ".join(command)}`{f" in {cwd}" if cwd else ""}')
+
+    job = CURRENT_JOB.get()
+
+    if job is not None and message:
+        job.progress(message)
+
+    executable = Path(command[0]).name if command else ""
+    start = time.perf_counter()
+
+    # within a job, the command gets a process group of its own, so cancelling the job can kill all of it
+    with subprocess.Popen(command, stderr=subprocess.PIPE, stdout=subprocess.PIPE, cwd=cwd, start_new_session=job is not None) as process:
+        if job is not None:
+            job.attach(process)
 
-    with subprocess.Popen(command, stderr=subprocess.PIPE, stdout=subprocess.PIPE) as process:
-        if progress:
-            with yaspin(text=message, color="green") as spinner:
-                spinner.spinner = Spinners.bouncingBar
+        try:
+            if progress:
+                with yaspin(text=message, color="green") as spinner:
+                    spinner.spinner = Spinners.bouncingBar
 
-                while process.poll() is None:
-                    time.sleep(0.1)
+                    while process.poll() is None:
+                        time.sleep(0.1)
 
-        stdout, stderr = process.communicate()
+            stdout, stderr = process.communicate()
+        finally:
+            if job is not None:
+                job.detach(process)
+
+            metrics.SUBPROCESS_DURATION.observe(time.perf_counter() - start, command=executable)
+
+        if process.returncode:
+            metrics.SUBPROCESS_FAILURES.inc(command=executable)
 
         return process.returncode, stdout.decode("utf-8"), stderr.decode("utf-8")
 
@@ -171,7 +204,10 @@ def safe_get_request(url: str) -> requests.Response:
         data = requests.get(url, timeout=10)
     except requests.exceptions.RequestException as error:
         logger.error(str(error))
+        metrics.remote_request(url)
         return requests.Response()
+
+    metrics.remote_request(url, data.status_code, data.headers)
     return data
 
 
@@ -210,10 +246,16 @@ def update_available() -> bool:
     print(f"Retrieving: {url} [{color.n_cyan('mmpm')}]")
 
     try:
-        contents = urllib.request.urlopen(url).read()
+        response = urllib.request.urlopen(url)
+        contents = response.read()
+        metrics.remote_request(url, response.status, response.headers)
+
         remote_version = json.loads(contents)["info"]["version"]
         logger.debug(f"Found remote={remote_version} & installed={current_version}")
     except (json.JSONDecodeError, urllib.error.URLError, Exception) as error:
+        if isinstance(error, urllib.error.URLError):
+            metrics.remote_request(url, getattr(error, "code", None))
+
         logger.error(f"Failed to get remote version of MMPM: {error}")
 
     return version.parse(remote_version) > version.parse(current_version)
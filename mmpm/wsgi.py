@@ -26,12 +26,14 @@ from gevent import monkey
 monkey.patch_all()  # do not move these
 
 from mmpm.api.entrypoint import app
+from mmpm.api.warmup import warmup
 from mmpm.constants import paths
 from mmpm.log.factory import MMPMLogFactory
 
 logger = MMPMLogFactory.get_logger(__name__)
 
 if __name__ == "__main__":
+    warmup()
     app.run(
         threaded=False,
         keepalive=True,
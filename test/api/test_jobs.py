@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from mmpm.api.jobs import CANCELLED, FAILED, PENDING, SUCCEEDED, JobConflict, JobManager, JobQueueFull
+from mmpm.utils import CURRENT_JOB, run_cmd
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+
+    return False
+
+
+def alive(pid: int) -> bool:
+    try:
+        # a killed process whose parent has exited may linger as a zombie until it's reaped
+        return Path(f"/proc/{pid}/stat").read_text().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        JobManager._instances.pop(JobManager, None)
+        self.manager = JobManager(max_workers=1, max_pending=2, retain=2)
+        self.updates = []
+        self.manager.subscribe(self.updates.append)
+
+    def tearDown(self):
+        JobManager._instances.pop(JobManager, None)
+
+    def test_submit_returns_before_task_finishes(self):
+        proceed = threading.Event()
+
+        def task(job):
+            proceed.wait(5)
+            return {"installed": 1}
+
+        job = self.manager.submit("packages/install", task)
+        self.assertFalse(job.done)
+        self.assertIs(self.manager.get(job.id), job)
+
+        proceed.set()
+        self.assertTrue(wait_for(lambda: job.done))
+        self.assertEqual(job.status, SUCCEEDED)
+        self.assertEqual(job.result, {"installed": 1})
+        self.assertEqual(self.updates[-1]["status"], SUCCEEDED)
+
+    def test_progress_is_published(self):
+        def task(job):
+            for step in range(1, 4):
+                job.progress(f"Step {step}", step=step, total=3)
+
+        job = self.manager.submit("db/update", task)
+        self.assertTrue(wait_for(lambda: job.done))
+
+        messages = [update["progress"]["message"] for update in self.updates if update["progress"]["message"]]
+        self.assertEqual(messages[:3], ["Step 1", "Step 2", "Step 3"])
+        self.assertEqual(job.serialize()["progress"], {"step": 3, "total": 3, "message": "Step 3"})
+
+    def test_failed_task(self):
+        def task(job):
+            raise RuntimeError("Failed to install MagicMirror")
+
+        job = self.manager.submit("mm-ctl/install", task)
+        self.assertTrue(wait_for(lambda: job.done))
+        self.assertEqual(job.status, FAILED)
+        self.assertEqual(job.error, "Failed to install MagicMirror")
+
+    def test_executor_is_bounded(self):
+        proceed = threading.Event()
+        running = []
+
+        def task(job):
+            running.append(job.id)
+            proceed.wait(5)
+
+        first = self.manager.submit("one", task)
+        second = self.manager.submit("two", task)
+        third = self.manager.submit("three", task)
+
+        self.assertTrue(wait_for(lambda: running == [first.id]))
+        self.assertEqual((second.status, third.status), (PENDING, PENDING))
+
+        with self.assertRaises(JobQueueFull):
+            self.manager.submit("four", task)
+
+        proceed.set()
+        self.assertTrue(wait_for(lambda: third.done))
+        self.assertEqual(running, [first.id, second.id, third.id])
+
+    def test_finished_jobs_are_pruned(self):
+        jobs = []
+
+        for index in range(4):
+            jobs.append(self.manager.submit(str(index), lambda job: None))
+            self.assertTrue(wait_for(lambda: jobs[-1].done))
+
+        self.manager.submit("last", lambda job: None)
+        self.assertNotIn(jobs[0], self.manager.jobs())
+        self.assertIn(jobs[-1], self.manager.jobs())
+
+    def test_cancel_pending_job(self):
+        proceed = threading.Event()
+        self.manager.submit("blocking", lambda job: proceed.wait(5))
+        ran = []
+
+        job = self.manager.submit("pending", lambda job: ran.append(True))
+        self.assertIs(self.manager.cancel(job.id), job)
+        self.assertEqual(job.status, CANCELLED)
+
+        proceed.set()
+        time.sleep(0.1)
+        self.assertEqual(ran, [])
+        self.assertIsNone(self.manager.cancel("unknown"))
+
+    def test_cancel_stops_at_next_step(self):
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def task(job):
+            job.progress("first", step=1, total=2)
+            started.set()
+            proceed.wait(5)
+            job.progress("second", step=2)
+            return "unreachable"
+
+        job = self.manager.submit("steps", task)
+        self.assertTrue(started.wait(5))
+
+        self.assertTrue(job.cancel())
+        proceed.set()
+
+        self.assertTrue(wait_for(lambda: job.done))
+        self.assertEqual(job.status, CANCELLED)
+        self.assertIsNone(job.result)
+        self.assertFalse(job.cancel())
+
+    def test_cancel_kills_process_group(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pid_file = Path(directory) / "pid"
+
+            def task(job):
+                # the shell starts a child of its own, which must be killed along with it
+                return run_cmd(["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"], progress=False)
+
+            job = self.manager.submit("sleep", task)
+            self.assertTrue(wait_for(lambda: pid_file.exists() and pid_file.read_text().strip()))
+            child = int(pid_file.read_text())
+
+            job.cancel()
+
+            self.assertTrue(wait_for(lambda: job.done, timeout=5))
+            self.assertEqual(job.status, CANCELLED)
+            self.assertTrue(wait_for(lambda: not alive(child), timeout=5))
+
+    def test_run_cmd_reports_progress_and_raises_once_cancelled(self):
+        def task(job):
+            run_cmd(["true"], progress=False, message="Downloading")
+            job.cancel()
+            run_cmd(["true"], progress=False, message="Installing")
+
+        job = self.manager.submit("install", task)
+        self.assertTrue(wait_for(lambda: job.done))
+        self.assertEqual(job.status, CANCELLED)
+        self.assertIn("Downloading", [update["progress"]["message"] for update in self.updates])
+        self.assertNotIn("Installing", [update["progress"]["message"] for update in self.updates])
+
+    def test_current_job_is_reset(self):
+        job = self.manager.submit("context", lambda job: CURRENT_JOB.get() is job)
+        self.assertTrue(wait_for(lambda: job.done))
+        self.assertTrue(job.result)
+        self.assertIsNone(CURRENT_JOB.get())
+
+    def test_concurrent_callers_share_in_flight_job(self):
+        proceed = threading.Event()
+        runs = []
+
+        def task(job):
+            runs.append(job.id)
+            proceed.wait(5)
+            return {"packages": []}
+
+        first = self.manager.submit("db/update", task, coalesce=True)
+        second = self.manager.submit("db/update", task, coalesce=True)
+        self.assertIs(first, second)
+
+        proceed.set()
+        self.assertTrue(wait_for(lambda: first.done))
+        self.assertEqual(len(runs), 1)
+
+        # without a fresh_for, a finished job is never reused
+        third = self.manager.submit("db/update", task, coalesce=True)
+        self.assertIsNot(third, first)
+
+    def test_fresh_result_is_reused(self):
+        first = self.manager.submit("db/update", lambda job: 1, coalesce=True, fresh_for=60)
+        self.assertTrue(wait_for(lambda: first.done))
+
+        self.assertIs(self.manager.submit("db/update", lambda job: 2, coalesce=True, fresh_for=60), first)
+
+        with patch("mmpm.api.jobs.time.time", return_value=first.finished + 61):
+            stale = self.manager.submit("db/update", lambda job: 3, coalesce=True, fresh_for=60)
+
+        self.assertIsNot(stale, first)
+
+    def test_failed_result_is_not_reused(self):
+        def task(job):
+            raise RuntimeError("Failed to update database")
+
+        first = self.manager.submit("db/update", task, coalesce=True, fresh_for=60)
+        self.assertTrue(wait_for(lambda: first.done))
+
+        self.assertIsNot(self.manager.submit("db/update", lambda job: 1, coalesce=True, fresh_for=60), first)
+
+    def test_invalidated_result_is_not_reused(self):
+        first = self.manager.submit("db/update", lambda job: 1, coalesce=True, fresh_for=60)
+        self.assertTrue(wait_for(lambda: first.done))
+
+        install = self.manager.submit("packages/install", lambda job: None, invalidates=("db/update",))
+        self.assertTrue(wait_for(lambda: install.done))
+
+        self.assertIsNot(self.manager.submit("db/update", lambda job: 2, coalesce=True, fresh_for=60), first)
+
+    def test_expire(self):
+        proceed = threading.Event()
+        first = self.manager.submit("db/update", lambda job: proceed.wait(5), coalesce=True)
+        time.sleep(0.01)
+
+        self.manager.expire("db/update")
+        time.sleep(0.01)
+
+        self.assertIsNot(self.manager.submit("db/update", lambda job: None, coalesce=True), first)
+        proceed.set()
+
+    def test_excluded_jobs_do_not_overlap(self):
+        proceed = threading.Event()
+        power = ("mm-ctl/start", "mm-ctl/stop")
+        start = self.manager.submit("mm-ctl/start", lambda job: proceed.wait(5), coalesce=True, excludes=power)
+
+        # the same job is attached to, a different one is refused until the first finishes
+        self.assertIs(self.manager.submit("mm-ctl/start", lambda job: None, coalesce=True, excludes=power), start)
+
+        with self.assertRaises(JobConflict):
+            self.manager.submit("mm-ctl/stop", lambda job: None, coalesce=True, excludes=power)
+
+        proceed.set()
+        self.assertTrue(wait_for(lambda: start.done))
+
+        stop = self.manager.submit("mm-ctl/stop", lambda job: None, coalesce=True, excludes=power)
+        self.assertTrue(wait_for(lambda: stop.done))
+        self.assertEqual(stop.status, SUCCEEDED)
+
+
+if __name__ == "__main__":
+    unittest.main()
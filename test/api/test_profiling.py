@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import cProfile
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from mmpm.api.profiling import HEADER, RequestProfiler, collapse
+
+
+def leaf():
+    time.sleep(0.02)
+
+
+def branch():
+    leaf()
+
+
+def root():
+    branch()
+    leaf()
+
+
+class TestCollapse(unittest.TestCase):
+    def test_stacks_follow_the_callers(self):
+        profile = cProfile.Profile()
+        profile.runcall(root)
+
+        stacks = collapse(pstats.Stats(profile))
+        sleeping = {stack: value for stack, value in stacks.items() if stack.endswith("<built-in method time.sleep>")}
+
+        self.assertEqual(len(sleeping), 2)
+
+        via_branch = next(value for stack, value in sleeping.items() if "branch" in stack)
+        direct = next(value for stack, value in sleeping.items() if "branch" not in stack)
+
+        self.assertTrue(all(stack.split(";")[0].startswith("root (test_profiling.py") for stack in sleeping))
+        self.assertGreater(via_branch, 15000)
+        self.assertGreater(direct, 15000)
+
+
+class TestRequestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.profiler = RequestProfiler(directory=self.directory, retain=2)
+        self.profiler.env = MagicMock()
+        self.mode = self.profiler.env.MMPM_API_PROFILING.get
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_wanted(self):
+        self.mode.return_value = "off"
+        self.assertFalse(self.profiler.wanted({HEADER: "1"}))
+
+        self.mode.return_value = "header"
+        self.assertTrue(self.profiler.wanted({HEADER: "1"}))
+        self.assertFalse(self.profiler.wanted({}))
+
+        self.mode.return_value = "1"
+        self.assertTrue(self.profiler.wanted({}))
+
+        self.mode.return_value = "0.0"
+        self.assertFalse(self.profiler.wanted({}))
+
+        self.mode.return_value = "sometimes"
+        self.assertFalse(self.profiler.wanted({}))
+
+    def test_profile_is_saved_and_listed(self):
+        self.assertTrue(self.profiler.start())
+        root()
+        profile_id = self.profiler.stop("GET", "/api/packages/", "/api/packages", 200)
+
+        self.assertIsNotNone(profile_id)
+        self.assertIsNotNone(self.profiler.path(profile_id, "pstats"))
+        self.assertIn("leaf", self.profiler.path(profile_id, "collapsed").read_text())
+
+        profiles = self.profiler.profiles()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]["id"], profile_id)
+        self.assertEqual(profiles[0]["route"], "/api/packages/")
+        self.assertGreater(profiles[0]["duration"], 0.04)
+
+    def test_one_request_at_a_time(self):
+        self.assertTrue(self.profiler.start())
+        self.assertFalse(self.profiler.start())
+
+        self.profiler.stop("GET", "/", "/", 200)
+        self.assertTrue(self.profiler.start())
+        self.profiler.stop("GET", "/", "/", 200)
+
+    def test_old_profiles_are_pruned(self):
+        ids = []
+
+        for _ in range(3):
+            self.profiler.start()
+            ids.append(self.profiler.stop("GET", "/", "/", 200))
+
+        self.assertEqual([profile["id"] for profile in self.profiler.profiles()], ids[:0:-1])
+        self.assertEqual(len(list(self.directory.iterdir())), 6)
+
+    def test_path_is_validated(self):
+        self.assertIsNone(self.profiler.path("../../etc/passwd", "pstats"))
+        self.assertIsNone(self.profiler.path("20240131T180000123456-0a1b", "pstats"))
+        self.assertIsNone(self.profiler.path("20240131T180000123456-0a1b", "json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+
+import socketio
+
+# the repeater patches the standard library for gevent when imported, which the rest of the tests don't expect
+with patch("gevent.monkey.patch_all"):
+    from mmpm.api import repeater
+
+MODULES = [{"name": "clock", "hidden": False, "key": 0}, {"name": "calendar", "hidden": True, "key": 1}]
+
+
+class FakeServer:
+    """
+    Stands in for socketio.Server. Background tasks are only run when a test runs them, and sleep() returns at
+    once, after calling `sleeping` (ie. to disconnect a client while the refresher waits).
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+        self.tasks = []
+        self.slept = []
+        self.sleeping = lambda seconds: None
+
+    def on(self, event, namespace=None):
+        def register(handler):
+            self.handlers[event] = handler
+            return handler
+
+        return register
+
+    def emit(self, event, data=None, to=None, namespace=None):
+        self.emitted.append((event, data, to))
+
+    def enter_room(self, sid, room, namespace=None):
+        pass
+
+    def start_background_task(self, target, *args):
+        self.tasks.append((target, args))
+        return target
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.sleeping(seconds)
+
+    def run(self, name):
+        """
+        Runs the background tasks started with the function of the name, ie. 'send_snapshot'.
+        """
+
+        pending = [task for task in self.tasks if task[0].__name__ == name]
+        self.tasks = [task for task in self.tasks if task[0].__name__ != name]
+
+        for target, args in pending:
+            target(*args)
+
+    def sent(self, event):
+        return [(data, to) for name, data, to in self.emitted if name == event]
+
+
+class FakeMagicMirror:
+    """
+    Stands in for the socketio.Client of the repeater, connected to a MagicMirror whose MMM-mmpm module responds
+    to each request at once. The first `refuse` attempts to connect fail.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.connected = False
+        self.namespaces = {}
+        self.emitted = []
+        self.modules = MODULES
+        self.refuse = 0
+
+    def on(self, event, handler=None, namespace=None):
+        def register(handler):
+            self.handlers[event] = handler
+            return handler
+
+        return register if handler is None else register(handler)
+
+    def connect(self, url, wait_timeout=None, wait=None):
+        if self.refuse:
+            self.refuse -= 1
+            raise socketio.exceptions.ConnectionError("refused")
+
+        self.connected = True
+        self.namespaces = {"/MMM-mmpm": "sid"}
+        self.handlers["connect"]()
+
+    def disconnect(self):
+        if self.connected:
+            self.connected = False
+            self.namespaces = {}
+            self.handlers["disconnect"]()
+
+    def emit(self, event, data=None, namespace=None):
+        self.emitted.append(event)
+
+        if event == "FROM_MMPM_APP_get_active_modules":
+            self.handlers["ACTIVE_MODULES"]([dict(module) for module in self.modules])
+
+
+class TestRepeater(unittest.TestCase):
+    def setUp(self):
+        self.magicmirror = FakeMagicMirror()
+        patcher = patch("mmpm.api.repeater.socketio.Client", return_value=self.magicmirror)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # without the jitter, so the delays between attempts to connect are predictable
+        patcher = patch("mmpm.api.repeater.random.uniform", return_value=1.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.server = FakeServer()
+        repeater.attach(self.server)
+
+    def connect(self, sid):
+        self.server.handlers["connect"](sid, {})
+
+    def test_one_snapshot_per_connect(self):
+        self.connect("a")
+        self.server.run("send_snapshot")
+
+        # MagicMirror isn't connected yet, so the client is told so rather than sent the modules
+        self.assertEqual(self.server.sent("modules"), [])
+        self.assertEqual(self.server.sent("magicmirror"), [])
+        self.server.run("publish_connection")
+        self.assertEqual(self.server.sent("magicmirror"), [({"connected": False, "retry_in": None}, "a")])
+
+        self.server.run("connect_to_magicmirror")
+        self.assertEqual(self.server.sent("modules"), [(MODULES, repeater.ROOM)])
+
+        self.connect("b")
+        self.server.run("send_snapshot")
+        self.assertEqual(self.server.sent("modules"), [(MODULES, repeater.ROOM), (MODULES, "b")])
+
+        # the state of the modules is recent, so MagicMirror isn't asked again for the second client
+        self.assertEqual(self.magicmirror.emitted, ["FROM_MMPM_APP_get_active_modules"])
+
+        self.magicmirror.disconnect()
+        self.connect("c")
+        self.server.run("send_snapshot")
+        self.assertEqual([to for _, to in self.server.sent("modules")], [repeater.ROOM, "b"])
+
+    def test_reconnect_delay_is_capped(self):
+        self.magicmirror.refuse = 8
+        self.connect("a")
+        self.server.run("connect_to_magicmirror")
+
+        self.assertTrue(self.magicmirror.connected)
+        self.assertEqual(self.server.slept, [0.0, 1.0, 2.0, 4.0, 8.0, 16.0, repeater.RECONNECT_DELAY[1], repeater.RECONNECT_DELAY[1], repeater.RECONNECT_DELAY[1]])
+
+        retries = [data["retry_in"] for data, to in self.server.sent("magicmirror") if to is None and not data["connected"]]
+        self.assertEqual(retries, [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0, 30.0])
+        self.assertEqual(self.server.sent("magicmirror")[-1], ({"connected": True, "retry_in": None}, None))
+
+    def test_refresher_stops_when_the_last_client_leaves(self):
+        self.connect("a")
+        self.server.run("connect_to_magicmirror")
+        requests = len(self.magicmirror.emitted)
+        refreshes = []
+
+        def sleeping(seconds):
+            self.assertEqual(seconds, repeater.REFRESH_INTERVAL)
+            refreshes.append(seconds)
+
+            if len(refreshes) == 2:
+                self.server.handlers["disconnect"]("a")
+            elif len(refreshes) > 2:
+                self.fail("the refresher kept running without clients")
+
+        self.server.sleeping = sleeping
+        self.server.run("refresh_states")
+
+        # refreshed once while the client was connected, and disconnected from MagicMirror once it left
+        self.assertEqual(len(self.magicmirror.emitted), requests + 1)
+        self.assertFalse(self.magicmirror.connected)
+
+        # the next client to connect starts it again
+        self.connect("b")
+        self.assertIn("refresh_states", [target.__name__ for target, _ in self.server.tasks])
+
+    def test_full_modules_after_reconnect(self):
+        self.connect("a")
+        self.server.run("connect_to_magicmirror")
+        self.assertEqual(len(self.server.sent("modules")), 1)
+
+        # while connected, the clients are only sent what changed
+        self.magicmirror.modules = [{"name": "clock", "hidden": True, "key": 0}, MODULES[1]]
+        self.magicmirror.emit("FROM_MMPM_APP_get_active_modules")
+        self.assertEqual(self.server.sent("modules_changed"), [([{"key": 0, "hidden": True}], repeater.ROOM)])
+
+        self.magicmirror.disconnect()
+        self.assertEqual(self.server.sent("magicmirror")[-1], ({"connected": False, "retry_in": None}, None))
+
+        # the clients were told MagicMirror was disconnected, so they're sent every module, even if none changed
+        self.server.run("connect_to_magicmirror")
+        self.assertEqual(self.server.slept[-1], repeater.RECONNECT_DELAY[0])
+        self.assertEqual(len(self.server.sent("modules_changed")), 1)
+        self.assertEqual(self.server.sent("modules")[-1], (self.magicmirror.modules, repeater.ROOM))
+        self.assertEqual(len(self.server.sent("modules")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
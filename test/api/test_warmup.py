@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from mmpm.api import gunicorn_config
+from mmpm.api.warmup import warmup
+
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+        self.paths = MagicMock()
+        self.paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_FILE = self.directory / "db.json"
+        self.paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_LAST_UPDATE_FILE = self.directory / "db-last-update.json"
+
+    def download(self):
+        self.paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_FILE.write_text("[]")
+        self.paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_LAST_UPDATE_FILE.write_text('{"last_update": "2024-01-31 18:00:05"}')
+
+    @patch("mmpm.api.warmup.MagicMirrorDatabase")
+    def test_loads_database(self, mock_database):
+        self.download()
+
+        with patch("mmpm.api.warmup.paths", self.paths):
+            self.assertTrue(warmup())
+
+        mock_database.return_value.load.assert_called_once_with()
+        mock_database.return_value.upgradable.assert_called_once_with()
+
+    @patch("mmpm.api.warmup.MagicMirrorDatabase")
+    def test_never_downloads_database(self, mock_database):
+        self.paths.MAGICMIRROR_3RD_PARTY_PACKAGES_DB_FILE.touch()  # left empty by a failed download
+
+        with patch("mmpm.api.warmup.paths", self.paths):
+            self.assertFalse(warmup())
+
+        mock_database.return_value.load.assert_not_called()
+
+    @patch("mmpm.api.warmup.MagicMirrorDatabase")
+    def test_failure_is_not_raised(self, mock_database):
+        self.download()
+        mock_database.return_value.load.side_effect = OSError("No space left on device")
+
+        with patch("mmpm.api.warmup.paths", self.paths):
+            self.assertFalse(warmup())
+
+
+class TestGunicornConfig(unittest.TestCase):
+    @patch("mmpm.api.warmup.warmup")
+    @patch("mmpm.api.gunicorn_config.gc.freeze")
+    def test_preloaded_app_warms_up_in_master(self, mock_freeze, mock_warmup):
+        preloaded = SimpleNamespace(cfg=SimpleNamespace(preload_app=True))
+
+        gunicorn_config.when_ready(preloaded)
+        gunicorn_config.post_worker_init(preloaded)
+
+        mock_warmup.assert_called_once_with()
+        mock_freeze.assert_called_once_with()
+
+    @patch("mmpm.api.warmup.warmup")
+    @patch("mmpm.api.gunicorn_config.gc.freeze")
+    def test_each_worker_warms_up(self, mock_freeze, mock_warmup):
+        lazy = SimpleNamespace(cfg=SimpleNamespace(preload_app=False))
+
+        gunicorn_config.when_ready(lazy)
+        gunicorn_config.post_worker_init(lazy)
+
+        mock_warmup.assert_called_once_with()
+        mock_freeze.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
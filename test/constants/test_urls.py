@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+import importlib
+import unittest
+from unittest.mock import patch
+
+from mmpm.constants import urls
+
+
+class TestUrls(unittest.TestCase):
+    def setUp(self):
+        vars(urls).pop("HOST", None)  # drop any HOST cached by a previous test
+
+    @patch("mmpm.utils.get_host_ip", return_value="10.0.0.2")
+    def test_host_is_resolved_lazily(self, mock_get_host_ip):
+        importlib.reload(urls)
+        mock_get_host_ip.assert_not_called()
+
+        self.assertEqual(urls.HOST, "10.0.0.2")
+        mock_get_host_ip.assert_called_once()
+
+    @patch("mmpm.utils.get_host_ip", return_value="10.0.0.2")
+    def test_host_is_cached(self, mock_get_host_ip):
+        for _ in range(5):
+            self.assertEqual(urls.HOST, "10.0.0.2")
+
+        mock_get_host_ip.assert_called_once()
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            getattr(urls, "NOT_A_REAL_URL")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,6 +30,9 @@ class MockedMMPMEnv(MMPMEnv):
         self.MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE = MutableMagicMock()
         self.MMPM_IS_DOCKER_IMAGE = MutableMagicMock()
         self.mmpm_log_level = MutableMagicMock()
+        self.mmpm_log_mode = MutableMagicMock()
+        self.mmpm_db_update_interval = MutableMagicMock()
+        self.mmpm_api_profiling = MutableMagicMock()
 
         self.MMPM_MAGICMIRROR_ROOT.get.return_value = Path("/tmp/MagicMirror")
         self.MMPM_MAGICMIRROR_URI.get.return_value = "http://localhost:8080"
@@ -37,3 +40,6 @@ class MockedMMPMEnv(MMPMEnv):
         self.MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE.get.return_value = ""
         self.MMPM_IS_DOCKER_IMAGE.get.return_value = False
         self.mmpm_log_level.get.return_value = "INFO"
+        self.mmpm_log_mode.get.return_value = "immediate"
+        self.mmpm_db_update_interval.get.return_value = 60
+        self.mmpm_api_profiling.get.return_value = "off"
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from mmpm.log import archive
+from mmpm.log.reader import LogFilter
+
+
+def make_record(index: int) -> dict:
+    return {"timestamp": f"2024-01-01 00:00:{index:02},000", "level": "INFO", "message": f"record {index}", "logger_name": "mmpm.test"}
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+
+        with open(self.directory / "mmpm-cli.log", "w", encoding="utf-8") as log_file:
+            log_file.writelines(json.dumps(make_record(index)) + "\n" for index in range(20, 40))
+
+        with gzip.open(self.directory / "mmpm-cli.log.1.gz", "wt", encoding="utf-8") as log_file:
+            log_file.writelines(json.dumps(make_record(index)) + "\n" for index in range(0, 20))
+
+        (self.directory / "notes.txt").write_text("not a JSON log file")
+
+        old = datetime(2023, 12, 31).timestamp()  # before any of the records
+        os.utime(self.directory / "notes.txt", (old, old))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def build(self, archive_format: str, log_filter=None) -> bytes:
+        chunks = list(archive.stream(archive_format, log_filter, directory=self.directory))
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+        return b"".join(chunks)
+
+    def test_zip(self):
+        with zipfile.ZipFile(io.BytesIO(self.build("zip"))) as result:
+            self.assertIsNone(result.testzip())
+            self.assertEqual(sorted(result.namelist()), ["mmpm-cli.log", "mmpm-cli.log.1.gz", "notes.txt"])
+            self.assertEqual(result.read("mmpm-cli.log"), (self.directory / "mmpm-cli.log").read_bytes())
+
+    def test_tar_gz(self):
+        with tarfile.open(fileobj=io.BytesIO(self.build("tar.gz")), mode="r:gz") as result:
+            self.assertEqual(sorted(result.getnames()), ["mmpm-cli.log", "mmpm-cli.log.1.gz", "notes.txt"])
+            self.assertEqual(result.extractfile("notes.txt").read(), b"not a JSON log file")
+
+    def test_time_range(self):
+        log_filter = LogFilter(since=make_record(15)["timestamp"], until=make_record(25)["timestamp"])
+
+        for archive_format in ["zip", "tar.gz"]:
+            data = self.build(archive_format, log_filter)
+
+            if archive_format == "zip":
+                with zipfile.ZipFile(io.BytesIO(data)) as result:
+                    names, contents = result.namelist(), result.read("mmpm-cli.log")
+            else:
+                with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as result:
+                    names, contents = result.getnames(), result.extractfile("mmpm-cli.log").read()
+
+            # the records from both the current and rotated file within the range, and notes.txt was last modified before it
+            self.assertEqual(names, ["mmpm-cli.log"])
+            self.assertEqual([json.loads(line)["message"] for line in contents.splitlines()], [f"record {index}" for index in range(15, 25)])
+
+    def test_large_files_are_streamed_in_chunks(self):
+        with open(self.directory / "mmpm-cli.log", "ab") as log_file:
+            log_file.write(os.urandom(4 * archive.CHUNK_SIZE))
+
+        chunks = list(archive.stream("zip", directory=self.directory))
+        self.assertGreater(len(chunks), 2)
+
+    def test_unsupported_format(self):
+        with patch("mmpm.log.archive.find_spec", return_value=None):
+            self.assertNotIn("tar.zst", archive.available_formats())
+
+            with self.assertRaises(ValueError):
+                list(archive.stream("tar.zst", directory=self.directory))
+
+        with self.assertRaises(ValueError):
+            list(archive.stream("rar", directory=self.directory))
+
+    def test_nothing_written_to_disk(self):
+        before = set(self.directory.iterdir())
+        os.chdir(self.directory)
+        self.build("zip")
+        self.build("tar.gz")
+        self.assertEqual(set(self.directory.iterdir()), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
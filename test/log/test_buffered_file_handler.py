@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import gzip
+import logging
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from mmpm.log.factory import BoundedQueueHandler, BufferedRotatingFileHandler, NativeQueueListener
+
+
+def make_record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+class TestBufferedRotatingFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.path = self.directory / "mmpm-cli.log"
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def create(self, **kwargs) -> BufferedRotatingFileHandler:
+        handler = BufferedRotatingFileHandler(self.path, encoding="utf-8", **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_records_are_held_until_capacity(self):
+        handler = self.create(capacity=100)
+
+        handler.emit(make_record("a" * 40))
+        handler.emit(make_record("b" * 40))
+        self.assertEqual(self.path.read_text(), "")
+
+        handler.emit(make_record("c" * 40))
+        self.assertEqual(self.path.read_text().splitlines(), ["a" * 40, "b" * 40, "c" * 40])
+
+    def test_warning_flushes_batch(self):
+        handler = self.create()
+
+        handler.emit(make_record("debugging"))
+        handler.emit(make_record("something went wrong", logging.WARNING))
+
+        self.assertEqual(self.path.read_text().splitlines(), ["debugging", "something went wrong"])
+
+    def test_interval_flushes_batch(self):
+        handler = self.create(interval=0.05)
+
+        handler.emit(make_record("first"))
+        time.sleep(0.1)
+        handler.emit(make_record("second"))
+
+        self.assertEqual(self.path.read_text().splitlines(), ["first", "second"])
+
+    def test_close_flushes_batch(self):
+        handler = self.create()
+        handler.emit(make_record("kept on close"))
+        handler.close()
+
+        self.assertEqual(self.path.read_text().splitlines(), ["kept on close"])
+
+    def test_rotated_files_are_compressed(self):
+        handler = self.create(capacity=0, maxBytes=100, backupCount=2)
+
+        for index in range(10):
+            handler.emit(make_record(f"record {index:02} " + "x" * 30))
+
+        handler.close()
+
+        self.assertFalse((self.directory / "mmpm-cli.log.1").exists())
+        self.assertTrue((self.directory / "mmpm-cli.log.2.gz").exists())
+
+        with gzip.open(self.directory / "mmpm-cli.log.1.gz", "rt", encoding="utf-8") as rotated:
+            self.assertTrue(rotated.read().startswith("record "))
+
+    def test_listener_flushes_when_idle(self):
+        handler = self.create(interval=60)
+        queue_handler = BoundedQueueHandler()
+        listener = NativeQueueListener(queue_handler.queue, handler, interval=0.05)
+        listener.start()
+
+        queue_handler.emit(make_record("written while idle"))
+
+        for _ in range(50):
+            if self.path.read_text():
+                break
+            time.sleep(0.02)
+
+        listener.stop()
+        self.assertEqual(self.path.read_text().splitlines(), ["written while idle"])
+
+
+if __name__ == "__main__":
+    unittest.main()
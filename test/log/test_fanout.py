@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+import json
+import unittest
+
+from mmpm.log.fanout import LogFanout, sampling
+from mmpm.log.history import LogHistory
+
+
+def make_data(index: int, level: str = "INFO") -> str:
+    return json.dumps({"level": level, "message": f"record {index}"})
+
+
+class TestLogFanout(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.history = LogHistory()
+
+    def emit(self, sid, batch, callback):
+        self.sent.append((sid, batch, callback))
+
+    def publish(self, fanout: LogFanout, count: int, level: str = "INFO", skip_sid=None) -> None:
+        for index in range(count):
+            fanout.publish(self.history.append(make_data(index, level)), skip_sid=skip_sid)
+
+    def test_records_are_batched(self):
+        fanout = LogFanout(self.emit)
+        fanout.add_client("a")
+        fanout.add_client("b")
+
+        self.publish(fanout, 5)
+        self.assertEqual(self.sent, [])
+
+        fanout.flush()
+        self.assertEqual([sid for sid, _, _ in self.sent], ["a", "b"])
+
+        for _, batch, _ in self.sent:
+            self.assertEqual([entry["seq"] for entry in batch["records"]], [1, 2, 3, 4, 5])
+            self.assertEqual(batch["dropped"], 0)
+
+        # nothing new, nothing sent
+        fanout.flush()
+        self.assertEqual(len(self.sent), 2)
+
+    def test_skip_sid(self):
+        fanout = LogFanout(self.emit)
+        fanout.add_client("a")
+        fanout.add_client("b")
+
+        self.publish(fanout, 1, skip_sid="a")
+        fanout.flush()
+        self.assertEqual([sid for sid, _, _ in self.sent], ["b"])
+
+    def test_unacknowledged_client_is_not_sent_more(self):
+        fanout = LogFanout(self.emit, capacity=3)
+        fanout.add_client("slow")
+        fanout.add_client("fast")
+
+        self.publish(fanout, 1)
+        fanout.flush()
+
+        _, _, acknowledge_fast = self.sent[1]
+        acknowledge_fast()
+        self.sent.clear()
+
+        self.publish(fanout, 5)
+        fanout.flush()
+
+        # the slow client hasn't acknowledged its first batch, so only the fast client gets another one
+        self.assertEqual([sid for sid, _, _ in self.sent], ["fast"])
+        self.assertEqual(self.sent[0][1]["dropped"], 2)  # its outbox holds 3 records at most
+
+    def test_dropped_records_are_reported_once_acknowledged(self):
+        fanout = LogFanout(self.emit, capacity=3)
+        fanout.add_client("slow")
+
+        self.publish(fanout, 1)
+        fanout.flush()
+        _, _, acknowledge = self.sent.pop()
+
+        self.publish(fanout, 10)
+        fanout.flush()
+        self.assertEqual(self.sent, [])
+
+        acknowledge()
+        fanout.flush()
+
+        _, batch, _ = self.sent.pop()
+        self.assertEqual([entry["seq"] for entry in batch["records"]], [9, 10, 11])
+        self.assertEqual(batch["dropped"], 7)
+
+    def test_ack_timeout(self):
+        fanout = LogFanout(self.emit, ack_timeout=0)
+        fanout.add_client("a")
+
+        self.publish(fanout, 1)
+        fanout.flush()
+        self.publish(fanout, 1)
+        fanout.flush()
+
+        self.assertEqual(len(self.sent), 2)
+
+    def test_max_batch(self):
+        fanout = LogFanout(self.emit, max_batch=4)
+        fanout.add_client("a")
+
+        self.publish(fanout, 10)
+        fanout.flush()
+        self.assertEqual(len(self.sent[0][1]["records"]), 4)
+
+        # the records still waiting haven't been sent yet
+        self.assertEqual(self.sent[0][1]["last"], 4)
+
+    def test_sampling(self):
+        fanout = LogFanout(self.emit, sample={"debug": 0.25})
+        fanout.add_client("a")
+
+        self.publish(fanout, 8, level="DEBUG")
+        self.publish(fanout, 2, level="INFO")
+        fanout.flush()
+
+        _, batch, _ = self.sent[0]
+        levels = [json.loads(entry["data"])["level"] for entry in batch["records"]]
+
+        self.assertEqual(levels, ["DEBUG", "DEBUG", "INFO", "INFO"])
+        self.assertEqual(batch["sampled"], 6)
+
+    def test_only_sampled_out_records(self):
+        fanout = LogFanout(self.emit, sample={"debug": 0.0})
+        fanout.add_client("a")
+
+        self.publish(fanout, 3, level="DEBUG")
+        fanout.flush()
+
+        # the client is still told records were left out, and that it won't receive them
+        _, batch, _ = self.sent[0]
+        self.assertEqual(batch["records"], [])
+        self.assertEqual(batch["sampled"], 3)
+        self.assertEqual(batch["last"], 3)
+
+    def test_removed_client(self):
+        fanout = LogFanout(self.emit)
+        fanout.add_client("a")
+        self.publish(fanout, 1)
+        fanout.remove_client("a")
+        fanout.flush()
+        fanout.acknowledge("a")
+
+        self.assertEqual(self.sent, [])
+
+    def test_sampling_rates(self):
+        self.assertEqual(sampling(""), {})
+        self.assertEqual(sampling("debug=0.1, INFO=0.5,"), {"DEBUG": 0.1, "INFO": 0.5})
+
+        for invalid in ("DEBUG", "=0.1", "DEBUG=often", "DEBUG=2"):
+            with self.assertRaises(ValueError):
+                sampling(invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()
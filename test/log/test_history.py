@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import unittest
+
+from mmpm.log.history import LogHistory
+
+
+class TestLogHistory(unittest.TestCase):
+    def test_sequence_numbers(self):
+        history = LogHistory()
+        self.assertEqual(history.append("first"), {"seq": 1, "data": "first"})
+        self.assertEqual(history.append("second"), {"seq": 2, "data": "second"})
+        self.assertEqual(history.sequence, 2)
+
+    def test_since(self):
+        history = LogHistory()
+
+        for index in range(1, 6):
+            history.append(f"record {index}")
+
+        self.assertEqual([entry["seq"] for entry in history.since()], [1, 2, 3, 4, 5])
+        self.assertEqual([entry["seq"] for entry in history.since(3)], [4, 5])
+        self.assertEqual(history.since(5), [])
+        self.assertEqual(LogHistory().since(), [])
+
+    def test_max_records(self):
+        history = LogHistory(max_records=3)
+
+        for index in range(1, 11):
+            history.append(f"record {index}")
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual([entry["data"] for entry in history.since()], ["record 8", "record 9", "record 10"])
+
+        # the records after 2 were partially discarded, so everything still available is returned
+        self.assertEqual([entry["seq"] for entry in history.since(2)], [8, 9, 10])
+        self.assertEqual([entry["seq"] for entry in history.since(8)], [9, 10])
+
+    def test_max_bytes(self):
+        history = LogHistory(max_bytes=10)
+        history.append("aaaa")
+        history.append("bbbb")
+        history.append("cccc")
+        self.assertEqual([entry["data"] for entry in history.since()], ["bbbb", "cccc"])
+
+        # a single record larger than the limit is still kept until the next one arrives
+        history.append("x" * 20)
+        self.assertEqual([entry["data"] for entry in history.since()], ["x" * 20])
+
+    def test_replay(self):
+        history = LogHistory()
+
+        for index in range(1, 6):
+            history.append(f"record {index}")
+
+        replay = history.replay(3, history.epoch)
+        self.assertEqual(replay["epoch"], history.epoch)
+        self.assertEqual([entry["seq"] for entry in replay["records"]], [4, 5])
+
+        # sequence numbers from a previous run of the log server, or from the future, get the entire history
+        self.assertEqual(len(history.replay(3, "previous-epoch")["records"]), 5)
+        self.assertEqual(len(history.replay(50, history.epoch)["records"]), 5)
+        self.assertEqual(len(history.replay()["records"]), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import json
+import logging
+import unittest
+
+from mmpm.__version__ import version
+from mmpm.log.factory import JsonFormatter
+
+
+def make_record(message, *args, name: str = "mmpm.test", level: int = logging.INFO, func: str = "run") -> logging.LogRecord:
+    return logging.LogRecord(name, level, "/mmpm/test_module.py", 42, message, args, None, func=func)
+
+
+def reference(record: logging.LogRecord) -> str:
+    return json.dumps(
+        {
+            "timestamp": logging.Formatter().formatTime(record),
+            "level": record.levelname,
+            "version": version,
+            "message": record.getMessage(),
+            "logger_name": record.name,
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        },
+        ensure_ascii=False,
+    )
+
+
+class TestJsonFormatter(unittest.TestCase):
+    def test_matches_json_dumps(self):
+        formatter = JsonFormatter()
+        records = [
+            make_record("plain message"),
+            make_record("created without a function", func=None),
+            make_record('quotes " and \\ backslashes'),
+            make_record("unicode ✓ ünïcödé and\nnewlines\t"),
+            make_record("installing %s", "MMM-Foo", name='strange "logger"', level=logging.WARNING),
+        ]
+
+        for record in records:
+            self.assertEqual(formatter.format(record), reference(record))
+
+    def test_timestamp_changes_each_second(self):
+        formatter = JsonFormatter()
+        first, second, third = make_record("first"), make_record("second"), make_record("third")
+        first.created, first.msecs = 1700000000.250, 250.0
+        second.created, second.msecs = 1700000000.999, 999.0
+        third.created, third.msecs = 1700000001.001, 1.0
+
+        for record in (first, second, third):
+            self.assertEqual(json.loads(formatter.format(record))["timestamp"], logging.Formatter().formatTime(record))
+
+    def test_invalid_arguments(self):
+        record = make_record("%s and %s", "only one")
+        message = json.loads(JsonFormatter().format(record))["message"]
+        self.assertEqual(message, {"raw_message": "%s and %s", "args": ["only one"]})
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            JsonFormatter(backend="pickle")
+
+    def test_orjson_backend(self):
+        formatter = JsonFormatter(backend="orjson")
+
+        if formatter.backend != "orjson":
+            self.skipTest("orjson is not installed")
+
+        record = make_record("installing %s", "MMM-Foo")
+        self.assertEqual(json.loads(formatter.format(record)), json.loads(reference(record)))
+
+
+if __name__ == "__main__":
+    unittest.main()
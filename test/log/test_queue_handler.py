@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+import logging
+import os
+import threading
+import time
+import unittest
+
+from mmpm.log.factory import BoundedQueueHandler, MMPMLogFactory, NativeQueueListener
+
+
+def make_record(message: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, args, None)
+
+
+class SlowHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.proceed = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.proceed.wait(5)
+        self.messages.append(record.getMessage())
+
+
+class TestBoundedQueueHandler(unittest.TestCase):
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(overflow="block")
+
+    def test_drop_oldest(self):
+        handler = BoundedQueueHandler(capacity=3, overflow="drop_oldest")
+
+        for index in range(5):
+            handler.emit(make_record(f"record {index}"))
+
+        self.assertEqual(handler.depth, 3)
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual([handler.queue.get_nowait().msg for _ in range(3)], ["record 2", "record 3", "record 4"])
+
+    def test_drop_newest(self):
+        handler = BoundedQueueHandler(capacity=3, overflow="drop_newest")
+
+        for index in range(5):
+            handler.emit(make_record(f"record {index}"))
+
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual([handler.queue.get_nowait().msg for _ in range(3)], ["record 0", "record 1", "record 2"])
+
+    def test_arguments_are_merged_when_enqueued(self):
+        handler = BoundedQueueHandler()
+        packages = ["MMM-Foo"]
+
+        handler.emit(make_record("installing %s", packages))
+        packages.append("MMM-Bar")
+
+        record = handler.queue.get_nowait()
+        self.assertEqual(record.getMessage(), "installing ['MMM-Foo']")
+        self.assertIsNone(record.args)
+
+
+class TestNativeQueueListener(unittest.TestCase):
+    def test_caller_does_not_wait_and_stop_drains_queue(self):
+        handler = BoundedQueueHandler()
+        slow = SlowHandler()
+        listener = NativeQueueListener(handler.queue, slow)
+        listener.start()
+
+        for index in range(100):
+            handler.emit(make_record(f"record {index}"))
+
+        # the slow handler hasn't been allowed to write anything yet, but emitting returned regardless
+        self.assertEqual(slow.messages, [])
+
+        slow.proceed.set()
+        listener.stop()
+
+        self.assertEqual(slow.messages, [f"record {index}" for index in range(100)])
+        self.assertEqual(handler.depth, 0)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_stop_gives_up_after_timeout(self):
+        handler = BoundedQueueHandler()
+        slow = SlowHandler()
+        listener = NativeQueueListener(handler.queue, slow)
+        listener.start()
+
+        handler.emit(make_record("never written in time"))
+        listener.stop(timeout=0.1)
+        self.assertEqual(slow.messages, [])
+
+        slow.proceed.set()
+
+    def test_stop_without_start(self):
+        handler = BoundedQueueHandler()
+        listener = NativeQueueListener(handler.queue, SlowHandler())
+
+        listener.stop()
+        self.assertEqual(handler.depth, 0)  # no sentinel is left for a thread that never ran
+
+
+class TestMMPMLogFactory(unittest.TestCase):
+    def test_forked_process_has_a_listener(self):
+        logger = MMPMLogFactory.get_logger(__name__)
+        pid = os.fork()
+
+        if pid == 0:  # the listener thread of the parent doesn't exist here, so nothing would be written
+            status = 1
+
+            try:
+                for index in range(10):
+                    logger.debug(f"record {index} from a forked process")
+
+                deadline = time.monotonic() + 5
+
+                while time.monotonic() < deadline and status:
+                    status = int(MMPMLogFactory.metrics()["queue_depth"] > 0)
+                    time.sleep(0.01)
+            finally:
+                os._exit(status)  # pylint: disable=protected-access
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
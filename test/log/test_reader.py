@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from mmpm.log.reader import LogFilter, log_files, parse_time, read, seek
+
+
+def make_record(index: int, level: str = "INFO", logger_name: str = "mmpm.test", module: str = "test") -> dict:
+    return {
+        "timestamp": f"2024-01-01 00:{index // 60:02}:{index % 60:02},000",
+        "level": level,
+        "version": "4.1.2",
+        "message": f"record {index}",
+        "logger_name": logger_name,
+        "module": module,
+        "function": "run",
+        "line": 1,
+    }
+
+
+def write(path: Path, records, mode: str = "w") -> None:
+    opener = gzip.open if path.suffix == ".gz" else open
+
+    with opener(path, mode + "t", encoding="utf-8") as log_file:
+        for record in records:
+            log_file.write(json.dumps(record) + "\n")
+
+
+class TestParseTime(unittest.TestCase):
+    def test_absolute(self):
+        self.assertEqual(parse_time("2024-01-31"), "2024-01-31 00:00:00,000")
+        self.assertEqual(parse_time("2024-01-31 18:05"), "2024-01-31 18:05:00,000")
+        self.assertEqual(parse_time("2024-01-31T18:05:09"), "2024-01-31 18:05:09,000")
+
+    def test_relative(self):
+        now = datetime(2024, 1, 31, 18, 0, 0)
+        self.assertEqual(parse_time("30s", now), "2024-01-31 17:59:30,000")
+        self.assertEqual(parse_time("15m", now), "2024-01-31 17:45:00,000")
+        self.assertEqual(parse_time("2h", now), "2024-01-31 16:00:00,000")
+        self.assertEqual(parse_time("1d", now), "2024-01-30 18:00:00,000")
+
+    def test_invalid(self):
+        for value in ["yesterday", "15x", "2024-13-01"]:
+            with self.assertRaises(ValueError):
+                parse_time(value)
+
+
+class TestLogFilter(unittest.TestCase):
+    def test_level(self):
+        log_filter = LogFilter(level="warning")
+        self.assertFalse(log_filter.matches(make_record(0, level="INFO")))
+        self.assertTrue(log_filter.matches(make_record(0, level="WARNING")))
+        self.assertTrue(log_filter.matches(make_record(0, level="ERROR")))
+
+    def test_logger_includes_children(self):
+        log_filter = LogFilter(logger="mmpm.api")
+        self.assertTrue(log_filter.matches(make_record(0, logger_name="mmpm.api")))
+        self.assertTrue(log_filter.matches(make_record(0, logger_name="mmpm.api.endpoints")))
+        self.assertFalse(log_filter.matches(make_record(0, logger_name="mmpm.apis")))
+
+    def test_module_time_and_message(self):
+        self.assertFalse(LogFilter(module="database").matches(make_record(0)))
+        self.assertTrue(LogFilter(contains="record 1").matches(make_record(12)))
+        self.assertFalse(LogFilter(contains="record 2").matches(make_record(12)))
+
+        log_filter = LogFilter(since=make_record(10)["timestamp"], until=make_record(20)["timestamp"])
+        self.assertEqual([index for index in range(30) if log_filter.matches(make_record(index))], list(range(10, 20)))
+
+
+class TestReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.path = self.directory / "mmpm-cli.log"
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def messages(self, **kwargs):
+        return [record["message"] for record in read(self.path, **kwargs)]
+
+    def test_rotated_files_are_read_in_order(self):
+        write(self.directory / "mmpm-cli.log.2", [make_record(index) for index in range(0, 10)])
+        write(self.directory / "mmpm-cli.log.1.gz", [make_record(index) for index in range(10, 20)])
+        write(self.path, [make_record(index) for index in range(20, 30)])
+        (self.directory / "mmpm-cli.log.archive").touch()
+
+        self.assertEqual([path.name for path in log_files(self.path)], ["mmpm-cli.log.2", "mmpm-cli.log.1.gz", "mmpm-cli.log"])
+        self.assertEqual(self.messages(), [f"record {index}" for index in range(30)])
+
+    def test_invalid_lines_are_skipped(self):
+        write(self.path, [make_record(0)])
+
+        with open(self.path, "a", encoding="utf-8") as log_file:
+            log_file.write("not json\n")
+            log_file.write('{"timestamp": "2024-01-01 00:00:01,000", "message": "trunc')
+
+        self.assertEqual(self.messages(), ["record 0"])
+
+    def test_since_and_until(self):
+        write(self.directory / "mmpm-cli.log.1.gz", [make_record(index) for index in range(0, 50)])
+        write(self.path, [make_record(index) for index in range(50, 100)])
+
+        log_filter = LogFilter(since=make_record(45)["timestamp"], until=make_record(55)["timestamp"])
+        self.assertEqual(self.messages(log_filter=log_filter), [f"record {index}" for index in range(45, 55)])
+
+    def test_seek(self):
+        records = [make_record(index // 3) for index in range(3000)]  # three records per timestamp
+        write(self.path, records)
+
+        offsets = {}
+        position = 0
+
+        with open(self.path, "rb") as handle:
+            for line in handle:
+                offsets.setdefault(json.loads(line)["timestamp"], position)
+                position += len(line)
+
+            for target in [0, 1, 499, 500, 999]:
+                timestamp = make_record(target)["timestamp"]
+                seek(handle, timestamp)
+                self.assertEqual(handle.tell(), offsets[timestamp])  # the first of the records with the timestamp
+
+            seek(handle, "2025-01-01 00:00:00,000")
+            self.assertEqual(handle.readline(), b"")
+
+    def test_follow(self):
+        write(self.path, [make_record(0)])
+        received = []
+
+        def writer():
+            time.sleep(0.05)
+            write(self.path, [make_record(1)], mode="a")
+
+            with open(self.path, "a", encoding="utf-8") as log_file:  # a partially written record is held back
+                line = json.dumps(make_record(2))
+                log_file.write(line[:10])
+                log_file.flush()
+                time.sleep(0.05)
+                log_file.write(line[10:] + "\n")
+
+            time.sleep(0.05)
+            os.rename(self.path, self.directory / "mmpm-cli.log.1")
+            write(self.path, [make_record(3, level="DEBUG"), make_record(4)])
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+
+        log_filter = LogFilter(level="INFO")
+        deadline = time.monotonic() + 5
+
+        for record in read(self.path, log_filter, follow=True, interval=0.01, stop=lambda: len(received) == 3 or time.monotonic() > deadline):
+            received.append(record["message"])
+
+        thread.join()
+        self.assertEqual(received, ["record 1", "record 2", "record 4"])
+
+    def test_follow_since(self):
+        write(self.path, [make_record(index) for index in range(10)])
+        stop = threading.Event()
+        received = []
+
+        for record in read(self.path, LogFilter(since=make_record(8)["timestamp"]), follow=True, interval=0.01, stop=stop.is_set):
+            received.append(record["message"])
+
+            if len(received) == 2:
+                stop.set()
+
+        self.assertEqual(received, ["record 8", "record 9"])
+
+
+if __name__ == "__main__":
+    unittest.main()
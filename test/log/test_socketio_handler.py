@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import logging
+import time
+import unittest
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+from mmpm.log.factory import MMPMLogFactory, SocketIOHandler, UnixDatagramHandler
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestSocketIOHandler(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.connected = True
+        self.connect = Event()
+
+        # the "connection" only completes once the test allows it
+        self.client.connect.side_effect = lambda *args, **kwargs: self.connect.wait(5)
+
+        self.probe = patch("mmpm.log.factory.socket.create_connection")
+        self.socketio = patch("socketio.Client", return_value=self.client)
+        self.probe.start()
+        self.socketio.start()
+
+    def tearDown(self):
+        self.probe.stop()
+        self.socketio.stop()
+
+    def test_no_connection_until_first_record(self):
+        handler = SocketIOHandler("localhost", 6789)
+        self.assertIsNone(handler.sio)
+        handler.close()
+        self.client.connect.assert_not_called()
+
+    def test_emit_does_not_wait_for_connection(self):
+        handler = SocketIOHandler("localhost", 6789)
+
+        start = time.perf_counter()
+        handler.emit(make_record("hello"))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+        self.connect.set()
+        handler.close()
+
+        self.client.emit.assert_called_once()
+        self.assertEqual(handler.sent, 1)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_buffer_is_bounded(self):
+        handler = SocketIOHandler("localhost", 6789, capacity=5)
+
+        for index in range(8):
+            handler.emit(make_record(f"record {index}"))
+
+        self.connect.set()
+        handler.close()
+
+        self.assertEqual(handler.sent, 5)
+        self.assertEqual(handler.dropped, 3)
+
+    def test_unavailable_server(self):
+        self.probe.stop()
+
+        with patch("mmpm.log.factory.socket.create_connection", side_effect=ConnectionRefusedError):
+            handler = SocketIOHandler("localhost", 6789)
+            handler.emit(make_record("first"))
+            handler.close()
+            handler.emit(make_record("second"))
+
+        self.probe.start()
+        self.client.connect.assert_not_called()
+        self.assertEqual(handler.sent, 0)
+        self.assertEqual(handler.dropped, 2)
+
+    def test_retries_after_delay(self):
+        self.probe.stop()
+        self.connect.set()
+
+        with patch("mmpm.log.factory.socket.create_connection", side_effect=ConnectionRefusedError):
+            handler = SocketIOHandler("localhost", 6789, retry=(0.2, 1.0))
+            handler.emit(make_record("refused"))
+            time.sleep(0.1)
+            handler.emit(make_record("too soon"))
+
+        self.probe.start()
+        time.sleep(0.2)
+
+        # the log server was started in the meantime
+        handler.emit(make_record("connected"))
+        handler.close()
+
+        self.client.connect.assert_called_once()
+        self.assertEqual(handler.sent, 1)
+        self.assertEqual(handler.dropped, 2)
+
+
+class TestLogServerHandler(unittest.TestCase):
+    def test_unix_sockets_are_preferred(self):
+        handler = MMPMLogFactory.__server_handler__()
+        self.addCleanup(handler.close)
+
+        self.assertIsInstance(handler, UnixDatagramHandler)
+
+    def test_fallback_without_unix_sockets(self):
+        with patch("mmpm.log.factory.socket", spec=["create_connection"]):
+            handler = MMPMLogFactory.__server_handler__()
+
+        self.addCleanup(handler.close)
+        self.assertIsInstance(handler, SocketIOHandler)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import json
+import logging
+import shutil
+import socket
+import tempfile
+import unittest
+from pathlib import Path
+
+from mmpm.log.factory import UnixDatagramHandler
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestUnixDatagramHandler(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.path = self.directory / "mmpm-log-server.sock"
+        self.handler = UnixDatagramHandler(self.path)
+
+    def tearDown(self):
+        self.handler.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_emit(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+            server.bind(str(self.path))
+            server.settimeout(1)
+
+            self.handler.emit(make_record("first"))
+            self.handler.emit(make_record("second"))
+
+            self.assertEqual(json.loads(server.recv(UnixDatagramHandler.MAX_DATAGRAM_SIZE))["message"], "first")
+            self.assertEqual(json.loads(server.recv(UnixDatagramHandler.MAX_DATAGRAM_SIZE))["message"], "second")
+
+        self.assertEqual(self.handler.sent, 2)
+        self.assertEqual(self.handler.dropped, 0)
+
+    def test_no_server(self):
+        self.handler.emit(make_record("nobody is listening"))
+        self.assertEqual(self.handler.sent, 0)
+        self.assertEqual(self.handler.dropped, 1)
+
+    def test_oversized_record(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+            server.bind(str(self.path))
+            self.handler.emit(make_record("x" * UnixDatagramHandler.MAX_DATAGRAM_SIZE))
+
+        self.assertEqual(self.handler.dropped, 1)
+
+    def test_full_receive_queue_does_not_block(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+            server.bind(str(self.path))
+
+            # nothing is receiving, so the kernel queue fills up and the remainder must be dropped
+            for index in range(5000):
+                self.handler.emit(make_record(f"record {index}"))
+
+        self.assertGreater(self.handler.dropped, 0)
+        self.assertEqual(self.handler.sent + self.handler.dropped, 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
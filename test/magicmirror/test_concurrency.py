@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from mmpm.magicmirror.database import MagicMirrorDatabase
+from mmpm.magicmirror.package import InstallationHandler, MagicMirrorPackage
+
+
+class TestConcurrentOperations(unittest.TestCase):
+    """
+    Installs, upgrades, updates and discovery must never rely on the current
+    directory of the process, otherwise they are unsafe to run concurrently
+    within the API server.
+    """
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.modules_dir = self.root / "modules"
+        self.modules_dir.mkdir()
+        self.env = MagicMock()
+        self.env.MMPM_MAGICMIRROR_ROOT.get.return_value = self.root
+        self.calls = []
+        self.lock = threading.Lock()
+
+        self.packages = []
+
+        for index in range(8):
+            directory = self.modules_dir / f"MMM-Test-{index}"
+            (directory / ".git").mkdir(parents=True)
+            (directory / "package.json").touch()
+
+            package = MagicMirrorPackage(
+                title=f"MMM-Test-{index}",
+                repository=f"https://github.com/test/MMM-Test-{index}",
+                directory=directory.name,
+            )
+            package.env = self.env
+            self.packages.append(package)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def fake_run_cmd(self, command, progress=True, background=False, message="", cwd=None):  # pylint: disable=unused-argument
+        with self.lock:
+            self.calls.append((command, cwd))
+
+        time.sleep(0.01)  # give the other threads a chance to interleave
+
+        if command[:2] == ["git", "config"]:
+            return 0, f"https://github.com/test/{Path(cwd).name}\n", ""
+        elif command[0] == "basename":
+            return 0, Path(command[1]).name, ""
+
+        return 0, "", ""
+
+    @patch("mmpm.magicmirror.package.repo_up_to_date", return_value=False)
+    def test_install_upgrade_update_and_discovery(self, mock_repo_up_to_date):
+        cwd = os.getcwd()
+        database = MagicMirrorDatabase()
+        database.env = self.env
+
+        with patch("mmpm.magicmirror.package.run_cmd", side_effect=self.fake_run_cmd), patch(
+            "mmpm.magicmirror.database.run_cmd", side_effect=self.fake_run_cmd
+        ), patch("os.chdir", side_effect=AssertionError("os.chdir must not be called")) as mock_chdir:
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = []
+
+                for package in self.packages:
+                    futures.append(executor.submit(package.update))
+                    futures.append(executor.submit(package.upgrade))
+                    futures.append(executor.submit(InstallationHandler(package).install))
+                    futures.append(executor.submit(database.__discover_installed_packages__))
+
+                results = [future.result() for future in futures]
+
+        mock_chdir.assert_not_called()
+        self.assertEqual(os.getcwd(), cwd)
+
+        for result in results:
+            if isinstance(result, list):
+                self.assertEqual(len(result), len(self.packages))
+
+        for command, directory in self.calls:
+            if command[0] == "basename":
+                continue
+
+            self.assertIsNotNone(directory, f"{command} was run without an explicit working directory")
+
+            if command == ["npm", "install"]:
+                self.assertTrue(Path(directory).parent == self.modules_dir)
+
+        npm_dirs = sorted(str(directory) for command, directory in self.calls if command == ["npm", "install"])
+        self.assertEqual(npm_dirs, sorted(str(self.modules_dir / package.directory.name) for package in self.packages))
+
+
+if __name__ == "__main__":
+    unittest.main()
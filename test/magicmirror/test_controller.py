@@ -1,87 +1,264 @@
 #!/usr/bin/env python3
+import tempfile
+import time
 import unittest
+from pathlib import Path
+from threading import Thread
 from unittest.mock import MagicMock, patch
 
+import socketio
 from faker import Faker
 
 from mmpm.env import MMPMEnv
-from mmpm.magicmirror.controller import MagicMirrorClientFactory, MagicMirrorController
+from mmpm.magicmirror.controller import MagicMirrorClient, MagicMirrorController
+from mmpm.singleton import Singleton
 
 fake = Faker()
 
 
-class TestMagicMirrorClientFactory(unittest.TestCase):
-    @patch("mmpm.magicmirror.controller.socketio.Client")
-    def test_create_client_valid(self, mock_client):
-        client = MagicMirrorClientFactory.create_client("test_event", {"data": "test"})
-        self.assertIsNotNone(client)
-        mock_client.assert_called()
+MODULES = [{"name": "clock", "hidden": False, "key": 0}, {"name": "calendar", "hidden": True, "key": 1}]
 
-    @patch("mmpm.magicmirror.controller.socketio.Client")
-    def test_create_client_invalid(self, mock_client):
-        client = MagicMirrorClientFactory.create_client("", {})
-        self.assertIsNone(client)
-        mock_client.assert_not_called()
+
+class FakeSocketIO:
+    """
+    Stands in for socketio.Client, connected to a MagicMirror whose MMM-mmpm module responds to each request
+    from another thread, like the real one would.
+    """
+
+    responses = {"FROM_MMPM_APP_get_active_modules": "ACTIVE_MODULES", "FROM_MMPM_APP_toggle_modules": "MODULES_TOGGLED"}
+
+    def __init__(self, *args, **kwargs):
+        self.handlers = {}
+        self.connected = False
+        self.namespaces = {}
+        self.urls = []
+        self.emitted = []
+        self.respond = lambda event, data: MODULES
+
+    def on(self, event, handler=None, namespace=None):
+        self.handlers[event] = handler
+
+    def connect(self, url, namespaces=None, wait_timeout=None):
+        self.urls.append(url)
+        self.connected = True
+        self.namespaces = {namespace: "sid" for namespace in namespaces}
+
+    def disconnect(self):
+        self.connected = False
+        self.namespaces = {}
+        self.handlers["disconnect"]()
+
+    def emit(self, event, data=None, namespace=None):
+        self.emitted.append((event, data))
+        response = self.respond(event, data)
+
+        if response is not None:
+            Thread(target=self.handlers[self.responses[event]], args=(response,)).start()
+
+
+class TestMagicMirrorClient(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("mmpm.magicmirror.controller.socketio.Client", FakeSocketIO)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = MagicMirrorClient()
+        self.socketio = self.client._MagicMirrorClient__client
+
+    def test_single_connection(self):
+        for _ in range(5):
+            self.assertEqual(self.client.request("FROM_MMPM_APP_toggle_modules", {"directive": "hide", "modules": ["1"]}, "MODULES_TOGGLED"), MODULES)
+
+        self.assertEqual(self.socketio.urls, [MMPMEnv().MMPM_MAGICMIRROR_URI.get()])
+        self.assertEqual(len(self.socketio.emitted), 5)
+
+    def test_reconnects_once_disconnected(self):
+        self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES")
+        self.socketio.disconnect()
+        self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES")
+
+        self.assertEqual(len(self.socketio.urls), 2)
+
+    def test_reconnects_when_uri_changes(self):
+        self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES")
+
+        self.client.env = MagicMock()
+        self.client.env.MMPM_MAGICMIRROR_URI.get.return_value = "http://magicmirror:8080"
+        self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES")
+
+        self.assertEqual(self.socketio.urls[-1], "http://magicmirror:8080")
+
+    def test_responses_are_matched_in_order(self):
+        self.socketio.respond = lambda event, data: data["modules"]
+        results = {}
+
+        def toggle(index):
+            results[index] = self.client.request("FROM_MMPM_APP_toggle_modules", {"directive": "hide", "modules": [str(index)]}, "MODULES_TOGGLED")
+
+        threads = [Thread(target=toggle, args=(index,)) for index in range(20)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results.values()), sorted([str(index)] for index in range(20)))
+
+    def test_timeout(self):
+        self.socketio.respond = lambda event, data: None
+
+        start = time.perf_counter()
+        self.assertIsNone(self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES", timeout=0.1))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        # the request which timed out no longer waits, so the next request gets its own response
+        self.socketio.respond = lambda event, data: MODULES
+        self.assertEqual(self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES"), MODULES)
+
+    def test_disconnect_fails_waiting_requests(self):
+        self.socketio.respond = lambda event, data: None
+        result = []
+
+        waiting = Thread(target=lambda: result.append(self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES", timeout=30)))
+        waiting.start()
+
+        while not self.socketio.emitted:
+            time.sleep(0.01)
+
+        self.socketio.disconnect()
+        waiting.join(timeout=5)
+
+        self.assertEqual(result, [None])
+
+    def test_connection_failure(self):
+        self.socketio.connect = MagicMock(side_effect=socketio.exceptions.ConnectionError("refused"))
+        self.assertIsNone(self.client.request("FROM_MMPM_APP_get_active_modules", {}, "ACTIVE_MODULES"))
 
 
 class TestMagicMirrorController(unittest.TestCase):
-    @patch("mmpm.magicmirror.controller.socketio.Client")
-    def test_status(self, mock_client):
-        client_instance = MagicMock()
-        mock_client.return_value = client_instance
+    def setUp(self):
+        patcher = patch("mmpm.magicmirror.controller.socketio.Client", FakeSocketIO)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        Singleton._instances.pop(MagicMirrorController, None)
+        self.addCleanup(Singleton._instances.pop, MagicMirrorController, None)
+
+    def test_status(self):
+        controller = MagicMirrorController()
+
+        with patch("builtins.print") as mock_print:
+            self.assertTrue(controller.status())
 
+        self.assertEqual(mock_print.call_count, len(MODULES))
+
+    def test_status_without_magicmirror(self):
         controller = MagicMirrorController()
-        controller.status()
+        controller.client._MagicMirrorClient__client.connect = MagicMock(side_effect=socketio.exceptions.ConnectionError("refused"))
 
-        client_instance.connect.assert_called_with(MMPMEnv().MMPM_MAGICMIRROR_URI.get())
+        self.assertFalse(controller.status())
 
     @patch("mmpm.magicmirror.controller.Path.exists")
     @patch("mmpm.magicmirror.controller.run_cmd")
     @patch("mmpm.magicmirror.controller.shutil.which")
-    @patch("mmpm.magicmirror.controller.os.chdir")
+    @patch("os.chdir")
     @patch("mmpm.magicmirror.controller.MMPMEnv")
     def test_start_with_npm(self, mock_env, mock_chdir, mock_which, mock_run_cmd, mock_exists):
         # Mock environment and dependencies
         mock_env.return_value.MMPM_MAGICMIRROR_PM2_PROCESS_NAME.get.return_value = None
         mock_env.return_value.MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE.get.return_value = None
-        mock_env.return_value.MMPM_MAGICMIRROR_ROOT.get.return_value = "/path/to/magicmirror"
+        mock_env.return_value.MMPM_MAGICMIRROR_ROOT.get.return_value = Path(tempfile.gettempdir())
         mock_exists.return_value = True
         mock_which.side_effect = lambda x: "/usr/bin/" + x if x in ["npm"] else None
         mock_run_cmd.return_value = (0, "", "")  # Simulate successful command execution
 
         # Instantiate and start MagicMirror
         controller = MagicMirrorController()
+        controller.serving = MagicMock(return_value=False)
+        controller.wait_until_ready = MagicMock(return_value=1.0)
         success = controller.start()
         self.assertTrue(success)
-        mock_run_cmd.assert_called_with(["npm", "run", "start"], message="Starting MagicMirror", background=True)
+        controller.wait_until_ready.assert_called_once()
+        mock_chdir.assert_not_called()
+        mock_run_cmd.assert_called_with(["npm", "run", "start"], message="Starting MagicMirror", background=True, cwd=controller.env.MMPM_MAGICMIRROR_ROOT.get())
 
-    @patch("mmpm.magicmirror.controller.socketio.Client")
-    def test_hide_modules(self, mock_client):
-        client_instance = MagicMock()
-        mock_client.return_value = client_instance
+    @patch("mmpm.magicmirror.controller.run_cmd")
+    def test_start_when_already_running(self, mock_run_cmd):
+        controller = MagicMirrorController()
+        controller.serving = MagicMock(return_value=True)
+
+        self.assertTrue(controller.start())
+        mock_run_cmd.assert_not_called()
 
-        # Test hide
+    @patch("mmpm.magicmirror.controller.sleep")
+    def test_wait_until_ready(self, mock_sleep):
         controller = MagicMirrorController()
-        controller.env = MMPMEnv()
+        controller.serving = MagicMock(side_effect=[False, False, True])
 
-        modules = [fake.pystr() for _ in range(5)]
+        self.assertIsNotNone(controller.wait_until_ready(timeout=10))
+        self.assertEqual(controller.serving.call_count, 3)
+        self.assertTrue(controller.client.connected)
 
-        controller.hide(modules)
-        client_instance.connect.assert_called_with(controller.env.MMPM_MAGICMIRROR_URI.get())
+        # the probes back off
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(delays, sorted(delays))
+        self.assertLess(delays[0], delays[-1])
 
-    @patch("mmpm.magicmirror.controller.socketio.Client")
-    def test_show_modules(self, mock_client):
-        client_instance = MagicMock()
-        mock_client.return_value = client_instance
+    def test_wait_until_ready_times_out(self):
+        controller = MagicMirrorController()
+        controller.serving = MagicMock(return_value=False)
 
+        self.assertIsNone(controller.wait_until_ready(timeout=0.3))
+
+    def test_ready_without_mmpm_module(self):
         controller = MagicMirrorController()
-        controller.env = MMPMEnv()
+        controller.serving = MagicMock(return_value=True)
+        controller.client.connect = MagicMock(return_value=False)
+
+        with patch("mmpm.magicmirror.controller.MODULE_TIMEOUT", 0.3):
+            self.assertIsNotNone(controller.wait_until_ready(timeout=1))
 
+    def test_restart(self):
+        controller = MagicMirrorController()
+        controller.stop = MagicMock(return_value=True)
+        controller.start = MagicMock(return_value=True)
+
+        for running, message in ((True, "Restarted MagicMirror"), (False, "MagicMirror was not running, so it was started rather than restarted")):
+            controller.serving = MagicMock(return_value=running)
+
+            with patch("mmpm.magicmirror.controller.logger") as mock_logger:
+                self.assertTrue(controller.restart())
+
+            mock_logger.info.assert_called_with(message)
+
+    def test_restart_fails_when_stop_fails(self):
+        controller = MagicMirrorController()
+        controller.serving = MagicMock(return_value=True)
+        controller.stop = MagicMock(return_value=False)
+        controller.start = MagicMock()
+
+        self.assertFalse(controller.restart())
+        controller.start.assert_not_called()
+
+    def test_hide_modules(self):
+        controller = MagicMirrorController()
         modules = [fake.pystr() for _ in range(5)]
 
-        controller.show(modules)
-        client_instance.connect.assert_called_with(controller.env.MMPM_MAGICMIRROR_URI.get())
+        self.assertTrue(controller.hide(modules))
+        self.assertEqual(controller.client._MagicMirrorClient__client.emitted, [("FROM_MMPM_APP_toggle_modules", {"directive": "hide", "modules": modules})])
+
+    def test_show_modules(self):
+        controller = MagicMirrorController()
+        modules = [fake.pystr() for _ in range(5)]
+
+        self.assertTrue(controller.show(modules))
+        self.assertEqual(controller.client._MagicMirrorClient__client.emitted, [("FROM_MMPM_APP_toggle_modules", {"directive": "show", "modules": modules})])
+
+    def test_unknown_modules(self):
+        controller = MagicMirrorController()
+        controller.client._MagicMirrorClient__client.respond = lambda event, data: []
 
+        self.assertFalse(controller.hide(["100"]))
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
+import os
+import shutil
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
 
 from mmpm.env import MMPMEnv
@@ -60,6 +64,38 @@ class TestMagicMirrorDatabase(unittest.TestCase):
         result = self.database.remove_mm_pkg(title="Not found")
         self.assertFalse(result)
 
+    @patch("mmpm.magicmirror.database.run_cmd")
+    def test_discovered_packages_are_cached(self, mock_run_cmd):
+        root = Path(tempfile.mkdtemp())
+        env = self.database.env
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.addCleanup(setattr, self.database, "env", env)
+
+        for name in ("MMM-Foo", "MMM-Bar"):
+            (root / "modules" / name / ".git").mkdir(parents=True)
+            (root / "modules" / name / ".git" / "config").write_text(f"[remote \"origin\"]\n\turl = https://github.com/test/{name}\n")
+
+        self.database.env = MagicMock()
+        self.database.env.MMPM_MAGICMIRROR_ROOT.get.return_value = root
+        mock_run_cmd.side_effect = lambda command, progress=True, cwd=None: (0, f"https://github.com/test/{Path(cwd or '').name}\n", "")
+
+        first = self.database.__discover_installed_packages__()
+        self.assertEqual(mock_run_cmd.call_count, 4)  # git config and basename for each package
+
+        second = self.database.__discover_installed_packages__()
+        self.assertEqual(mock_run_cmd.call_count, 4)
+        self.assertEqual(sorted(package.repository for package in second), sorted(package.repository for package in first))
+
+        # changing the remote of a package only rediscovers that package
+        config = root / "modules" / "MMM-Foo" / ".git" / "config"
+        os.utime(config, ns=(config.stat().st_atime_ns, config.stat().st_mtime_ns + 1_000_000_000))
+
+        self.database.__discover_installed_packages__()
+        self.assertEqual(mock_run_cmd.call_count, 6)
+
+        shutil.rmtree(root / "modules" / "MMM-Bar")
+        self.assertEqual([package.directory.name for package in self.database.__discover_installed_packages__()], ["MMM-Foo"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -50,7 +50,7 @@ class TestInstallationHandler(unittest.TestCase):
         self.assertEqual(error_code, 0)
         self.assertEqual(stdout, "stdout")
         self.assertEqual(stderr, "stderr")
-        mock_run_cmd.assert_called_with(["bundle", "install"], message="Installing Ruby dependencies")
+        mock_run_cmd.assert_called_with(["bundle", "install"], message="Installing Ruby dependencies", cwd=self.mock_package.directory)
 
     @patch("mmpm.magicmirror.package.run_cmd")
     def test_npm_install(self, mock_run_cmd):
@@ -60,7 +60,7 @@ class TestInstallationHandler(unittest.TestCase):
         self.assertEqual(error_code, 0)
         self.assertEqual(stdout, "stdout")
         self.assertEqual(stderr, "stderr")
-        mock_run_cmd.assert_called_with(["npm", "install"], message="Installing Node dependencies")
+        mock_run_cmd.assert_called_with(["npm", "install"], message="Installing Node dependencies", cwd=self.mock_package.directory)
 
     @patch("mmpm.magicmirror.package.run_cmd")
     @patch("os.cpu_count", return_value=4)
@@ -71,7 +71,7 @@ class TestInstallationHandler(unittest.TestCase):
         self.assertEqual(error_code, 0)
         self.assertEqual(stdout, "stdout")
         self.assertEqual(stderr, "stderr")
-        mock_run_cmd.assert_called_with(["make", "-j", f"{cpu_count()}"], message="Building with 'make'")
+        mock_run_cmd.assert_called_with(["make", "-j", f"{cpu_count()}"], message="Building with 'make'", cwd=self.mock_package.directory)
 
     @patch("mmpm.magicmirror.package.run_cmd")
     def test_pip_install(self, mock_run_cmd):
@@ -84,6 +84,7 @@ class TestInstallationHandler(unittest.TestCase):
         mock_run_cmd.assert_called_with(
             ["pip", "install", "-r", "requirements.txt"],
             message="Installing Python dependencies",
+            cwd=self.mock_package.directory,
         )
 
     @patch("mmpm.magicmirror.package.run_cmd")
@@ -94,7 +95,7 @@ class TestInstallationHandler(unittest.TestCase):
         self.assertEqual(error_code, 0)
         self.assertEqual(stdout, "stdout")
         self.assertEqual(stderr, "stderr")
-        mock_run_cmd.assert_called_with(["mvn", "install"], message="Building with Maven")
+        mock_run_cmd.assert_called_with(["mvn", "install"], message="Building with Maven", cwd=self.mock_package.directory)
 
     @patch("mmpm.magicmirror.package.run_cmd")
     def test_go_build(self, mock_run_cmd):
@@ -104,7 +105,7 @@ class TestInstallationHandler(unittest.TestCase):
         self.assertEqual(error_code, 0)
         self.assertEqual(stdout, "stdout")
         self.assertEqual(stderr, "stderr")
-        mock_run_cmd.assert_called_with(["go", "build"], message="Building Go project")
+        mock_run_cmd.assert_called_with(["go", "build"], message="Building Go project", cwd=self.mock_package.directory)
 
     @patch("mmpm.magicmirror.package.run_cmd")
     @patch("os.chdir")
@@ -124,5 +125,5 @@ class TestInstallationHandler(unittest.TestCase):
 
         mock_mkdir.assert_called_with(exist_ok=True)
         mock_system.assert_called_with(f"rm -rf {build_dir}/*")
-        mock_chdir.assert_called_with(build_dir)
-        mock_run_cmd.assert_called_with(["cmake", ".."], message="Building with CMake")
+        mock_chdir.assert_not_called()
+        mock_run_cmd.assert_called_with(["cmake", ".."], message="Building with CMake", cwd=build_dir)
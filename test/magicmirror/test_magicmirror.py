@@ -10,10 +10,9 @@ from mmpm.magicmirror.magicmirror import MagicMirror
 
 class MagicMirrorTestCase(unittest.TestCase):
     @patch("mmpm.magicmirror.magicmirror.repo_up_to_date")
-    @patch("mmpm.magicmirror.magicmirror.chdir")
+    @patch("mmpm.magicmirror.magicmirror.os.chdir")
     def test_update(self, mock_chdir, mock_repo_up_to_date):
         mock_repo_up_to_date.return_value = True
-        mock_chdir.return_value = None
 
         mm = MagicMirror()
         mm.env = MockedMMPMEnv()
@@ -23,7 +22,7 @@ class MagicMirrorTestCase(unittest.TestCase):
 
         can_upgrade = mm.update()
 
-        mock_chdir.assert_called_once_with(root)
+        mock_chdir.assert_not_called()
         mock_repo_up_to_date.assert_called_with(root)
         self.assertTrue(can_upgrade)
         shutil.rmtree(root)
@@ -40,20 +39,20 @@ class MagicMirrorTestCase(unittest.TestCase):
 
         success = mm.upgrade()
 
-        mock_run_cmd.assert_called_with(["npm", "install"], progress=True)
+        mock_run_cmd.assert_called_with(["npm", "install"], progress=True, cwd=root)
         self.assertEqual(success, True)
         shutil.rmtree(root)
 
     @patch("mmpm.magicmirror.magicmirror.run_cmd")
-    @patch("mmpm.magicmirror.magicmirror.chdir")
+    @patch("mmpm.magicmirror.magicmirror.os.chdir")
     def test_install(self, mock_chdir, mock_run_cmd):
         mock_run_cmd.return_value = (0, "", "")
-        mock_chdir.return_value = None
 
         mm = MagicMirror()
         mm.env = MockedMMPMEnv()
 
         success = mm.install()
+        mock_chdir.assert_not_called()
         self.assertEqual(success, True)
 
     @patch("mmpm.magicmirror.magicmirror.print")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import unittest
+
+from mmpm.magicmirror.modules import ModuleStates
+
+MODULES = [{"name": "clock", "hidden": False, "key": 0}, {"name": "calendar", "hidden": True, "key": 1}, {"name": "weather", "hidden": False, "key": 2}]
+
+
+class TestModuleStates(unittest.TestCase):
+    def setUp(self):
+        self.states = ModuleStates()
+
+    def test_unknown_until_reported(self):
+        self.assertFalse(self.states.known)
+        self.assertEqual(self.states.age(), float("inf"))
+
+        # an empty report is still a report, ie. MagicMirror without modules
+        self.assertTrue(self.states.replace([]))
+        self.assertTrue(self.states.known)
+        self.assertLess(self.states.age(), 1.0)
+
+    def test_replace(self):
+        self.assertTrue(self.states.replace(MODULES))
+        self.assertFalse(self.states.replace([dict(module) for module in MODULES]))
+        self.assertEqual(self.states.snapshot(), MODULES)
+
+        self.assertTrue(self.states.replace(MODULES[:1]))
+        self.assertEqual(self.states.snapshot(), MODULES[:1])
+
+    def test_merge(self):
+        self.states.replace(MODULES)
+
+        self.assertTrue(self.states.merge([{"name": "calendar", "hidden": False, "key": 1}]))
+        self.assertEqual([module["hidden"] for module in self.states.snapshot()], [False, False, False])
+        self.assertFalse(self.states.merge([{"name": "calendar", "hidden": False, "key": 1}]))
+
+        # the order of the modules is the order MagicMirror lists them in, not the order they were toggled
+        self.assertEqual([module["key"] for module in self.states.snapshot()], [0, 1, 2])
+
+    def test_duplicates_and_malformed_modules(self):
+        self.states.replace(MODULES + [MODULES[0], {"name": "no key"}, "clock"])
+        self.assertEqual(self.states.snapshot(), MODULES)
+
+        self.assertFalse(self.states.merge(None))
+        self.assertFalse(self.states.merge({"key": 0}))
+        self.assertEqual(self.states.snapshot(), MODULES)
+
+    def test_delta(self):
+        self.states.replace(MODULES)
+        before = self.states.snapshot()
+
+        self.states.merge([{"name": "calendar", "hidden": False, "key": 1}, {"name": "weather", "hidden": False, "key": 2, "position": "top_left"}])
+        self.assertEqual(self.states.delta(before), [{"key": 1, "hidden": False}, {"key": 2, "position": "top_left"}])
+        self.assertEqual(self.states.delta(self.states.snapshot()), [])
+
+    def test_delta_of_added_removed_and_reordered_modules(self):
+        self.states.replace(MODULES)
+
+        self.assertIsNone(self.states.delta(MODULES[:2]))
+        self.assertIsNone(self.states.delta(list(reversed(MODULES))))
+        self.assertIsNone(self.states.delta([{**MODULES[0], "position": "top_left"}] + MODULES[1:]))
+
+    def test_snapshot_is_a_copy(self):
+        self.states.replace(MODULES)
+        self.states.snapshot()[0]["hidden"] = True
+
+        self.assertFalse(self.states.snapshot()[0]["hidden"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -114,7 +114,8 @@ class TestMagicMirrorPackage(unittest.TestCase):
         self.package.env = MMPMEnv()
         expected_dir = MMPM_DEFAULT_ENV.get("MMPM_MAGICMIRROR_ROOT") / "modules" / self.package.directory
         self.package.update()
-        mock_chdir.assert_called_with(expected_dir)
+        mock_chdir.assert_not_called()
+        mock_repo_up_to_date.assert_called_with(expected_dir)
         self.assertTrue(self.package.is_upgradable)
 
     @patch("os.chdir")
@@ -125,7 +126,8 @@ class TestMagicMirrorPackage(unittest.TestCase):
         self.package.env = MMPMEnv()
         expected_dir = MMPM_DEFAULT_ENV.get("MMPM_MAGICMIRROR_ROOT") / "modules" / self.package.directory
         self.package.update()
-        mock_chdir.assert_called_with(expected_dir)
+        mock_chdir.assert_not_called()
+        mock_repo_up_to_date.assert_called_with(expected_dir)
         self.assertFalse(self.package.is_upgradable)
 
     @patch("os.chdir")
@@ -137,7 +139,8 @@ class TestMagicMirrorPackage(unittest.TestCase):
         expected_dir = MMPM_DEFAULT_ENV.get("MMPM_MAGICMIRROR_ROOT") / "modules" / self.package.directory
         self.package.is_upgradable = True
         self.package.upgrade()
-        mock_chdir.assert_called_with(expected_dir)
+        mock_chdir.assert_not_called()
+        mock_run_cmd.assert_called_with(["git", "pull"], message="Retrieving changes", cwd=expected_dir)
 
     @patch("os.chdir")
     @patch("mmpm.magicmirror.package.run_cmd")
@@ -146,5 +149,6 @@ class TestMagicMirrorPackage(unittest.TestCase):
         expected_dir = MMPM_DEFAULT_ENV.get("MMPM_MAGICMIRROR_ROOT") / "modules" / self.package.directory
         self.package.env = MMPMEnv()
         result = self.package.upgrade()
-        mock_chdir.assert_called_with(expected_dir)
+        mock_chdir.assert_not_called()
+        mock_run_cmd.assert_called_with(["git", "pull"], message="Retrieving changes", cwd=expected_dir)
         self.assertFalse(result)
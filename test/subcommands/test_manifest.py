@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import subprocess
+import sys
+import unittest
+from argparse import ArgumentParser
+from pkgutil import iter_modules
+from unittest.mock import patch
+
+import mmpm.subcommands
+from mmpm.subcommands import manifest
+from mmpm.subcommands.sub_cmd import SubCmd
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.parser = ArgumentParser(prog="mmpm")
+        manifest.register(self.parser.add_subparsers(dest="subcmd"), "mmpm")
+
+    def test_every_module_is_in_manifest(self):
+        modules = {submodule.name for submodule in iter_modules(mmpm.subcommands.__path__) if submodule.name.startswith("_sub_cmd")}
+        self.assertEqual(modules, {spec["module"] for spec in manifest.SUBCOMMANDS.values()})
+
+    def test_load(self):
+        for name in manifest.SUBCOMMANDS:
+            subcommand = manifest.load(name, "mmpm")
+            self.assertIsInstance(subcommand, SubCmd)
+            self.assertEqual(subcommand.name, name)
+
+    def test_load_unknown(self):
+        self.assertIsNone(manifest.load(None, "mmpm"))
+        self.assertIsNone(manifest.load("not-a-subcommand", "mmpm"))
+
+    def test_parse(self):
+        args, extra = self.parser.parse_known_args(["install", "MMM-Test", "-y"])
+        self.assertEqual(args.subcmd, "install")
+        self.assertTrue(args.assume_yes)
+        self.assertEqual(extra, ["MMM-Test"])
+
+        args, _ = self.parser.parse_known_args(["mm-pkg", "remove", "MMM-Test", "--yes"])
+        self.assertEqual(args.command, "remove")
+        self.assertEqual(args.pkg_name, ["MMM-Test"])
+        self.assertTrue(args.assume_yes)
+
+        args, _ = self.parser.parse_known_args(["mm-ctl", "--hide", "1", "2"])
+        self.assertEqual(args.hide, ["1", "2"])
+
+        args, _ = self.parser.parse_known_args(["serve", "--port", "8000"])
+        self.assertEqual((args.host, args.port), ("0.0.0.0", 8000))
+
+        args, _ = self.parser.parse_known_args(["supervisor", "--status"])
+        self.assertTrue(args.status)
+
+    def test_mutually_exclusive(self):
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args(["db", "--info", "--dump"])
+
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args(["supervisor", "--start", "--stop"])
+
+    @patch("mmpm.subcommands._sub_cmd_serve.os.execv")
+    def test_serve_replaces_process(self, mock_execv):
+        args, extra = self.parser.parse_known_args(["serve", "--host", "127.0.0.1"])
+
+        with patch("mmpm.subcommands._sub_cmd_serve.MMPMLogFactory.shutdown"):
+            manifest.load("serve", "mmpm").exec(args, extra)
+
+        mock_execv.assert_called_once_with(sys.executable, [sys.executable, "-m", "mmpm.server", "--host", "127.0.0.1", "--port", "7891"])
+
+    def test_only_invoked_subcommand_is_imported(self):
+        code = (
+            "import sys; sys.argv = ['mmpm', 'version']; "
+            "from mmpm.entrypoint import main; main(); "
+            "print(sorted(name for name in sys.modules if name.startswith('mmpm.subcommands._sub_cmd')))"
+        )
+
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertIn("['mmpm.subcommands._sub_cmd_version']", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
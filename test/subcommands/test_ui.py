@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import unittest
+from argparse import ArgumentParser
+from unittest.mock import MagicMock, patch
+
+from mmpm.subcommands import manifest
+
+
+class TestUi(unittest.TestCase):
+    def setUp(self):
+        self.parser = ArgumentParser(prog="mmpm")
+        manifest.register(self.parser.add_subparsers(dest="subcmd"), "mmpm")
+
+        self.ui = manifest.load("ui", "mmpm")
+        self.ui.database = MagicMock()
+        self.ui.database.is_initialized.return_value = True
+        self.ui.ui = MagicMock()
+        self.ui.env = MagicMock()
+        self.ui.env.MMPM_IS_DOCKER_IMAGE.get.return_value = False
+
+    def exec(self, *argv: str):
+        args, extra = self.parser.parse_known_args(["ui", *argv])
+        self.ui.exec(args, extra)
+
+    @patch("mmpm.subcommands._sub_cmd_ui.which", return_value=None)
+    @patch("mmpm.subcommands._sub_cmd_ui.supervisor")
+    def test_supervisor_without_pm2(self, mock_supervisor, _):
+        self.exec("--start")
+        mock_supervisor.start.assert_called_once()
+
+        self.exec("--status")
+        mock_supervisor.status.assert_called_once()
+
+        mock_supervisor.stop.return_value = True
+        self.exec("--restart")
+        mock_supervisor.stop.assert_called_once()
+        self.assertEqual(mock_supervisor.start.call_count, 2)
+
+        self.exec("--stop")
+        self.assertEqual(mock_supervisor.stop.call_count, 2)
+
+        self.ui.ui.start.assert_not_called()
+        self.ui.ui.stop.assert_not_called()
+        self.ui.ui.status.assert_not_called()
+
+    @patch("mmpm.subcommands._sub_cmd_ui.which", return_value=None)
+    @patch("mmpm.subcommands._sub_cmd_ui.supervisor")
+    def test_install_requires_pm2(self, mock_supervisor, _):
+        with patch("mmpm.subcommands._sub_cmd_ui.logger") as mock_logger:
+            self.exec("install", "--yes")
+
+        mock_logger.fatal.assert_called_once()
+        self.ui.ui.install.assert_not_called()
+        mock_supervisor.start.assert_not_called()
+
+    @patch("mmpm.subcommands._sub_cmd_ui.which", return_value="/usr/bin/pm2")
+    @patch("mmpm.subcommands._sub_cmd_ui.supervisor")
+    def test_pm2(self, mock_supervisor, _):
+        self.exec("--start")
+
+        self.ui.ui.start.assert_called_once()
+        mock_supervisor.start.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
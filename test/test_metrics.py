@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import unittest
+
+from mmpm import metrics
+from mmpm.metrics import Counter, Gauge, Histogram, Metric, MetricsRegistry
+from mmpm.utils import run_cmd
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        counter = Counter("test_requests_total", "Requests.", ("host",), registry=self.registry)
+        counter.inc(host="github.com")
+        counter.inc(2, host="github.com")
+        counter.inc(host="gitlab.com")
+
+        self.assertEqual(counter.value(host="github.com"), 3)
+        self.assertEqual(
+            self.registry.render(),
+            "# HELP test_requests_total Requests.\n"
+            "# TYPE test_requests_total counter\n"
+            'test_requests_total{host="github.com"} 3\n'
+            'test_requests_total{host="gitlab.com"} 1\n',
+        )
+
+    def test_gauge_without_labels(self):
+        gauge = Gauge("test_depth", "Depth.", registry=self.registry)
+        gauge.set(0.5)
+
+        self.assertIn("test_depth 0.5\n", self.registry.render())
+
+    def test_histogram(self):
+        histogram = Histogram("test_duration_seconds", "Duration.", ("command",), buckets=(0.1, 1.0), registry=self.registry)
+        histogram.observe(0.05, command="git")
+        histogram.observe(0.5, command="git")
+        histogram.observe(5, command="git")
+
+        lines = histogram.render().splitlines()[2:]
+
+        self.assertEqual(
+            lines,
+            [
+                'test_duration_seconds_bucket{command="git",le="0.1"} 1',
+                'test_duration_seconds_bucket{command="git",le="1"} 2',
+                'test_duration_seconds_bucket{command="git",le="+Inf"} 3',
+                'test_duration_seconds_sum{command="git"} 5.55',
+                'test_duration_seconds_count{command="git"} 3',
+            ],
+        )
+        self.assertEqual(histogram.count(command="git"), 3)
+
+    def test_histogram_time(self):
+        histogram = Histogram("test_block_seconds", "Block.", registry=self.registry)
+
+        with self.assertRaises(RuntimeError):
+            with histogram.time():
+                raise RuntimeError()
+
+        self.assertEqual(histogram.count(), 1)
+
+    def test_labels_are_validated_and_escaped(self):
+        counter = Counter("test_escaped_total", "Escaped.", ("route",), registry=self.registry)
+
+        with self.assertRaises(ValueError):
+            counter.inc(path="/")
+
+        counter.inc(route='a"b\\c\nd')
+        self.assertIn('test_escaped_total{route="a\\"b\\\\c\\nd"} 1', counter.render())
+
+    def test_duplicate_names_are_rejected(self):
+        Counter("test_duplicate_total", "Duplicate.", registry=self.registry)
+
+        with self.assertRaises(ValueError):
+            Gauge("test_duplicate_total", "Duplicate.", registry=self.registry)
+
+    def test_metric_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Metric("test_abstract", "Abstract.", registry=self.registry)  # pylint: disable=abstract-class-instantiated
+
+    def test_collectors_run_before_rendering(self):
+        gauge = Gauge("test_collected", "Collected.", registry=self.registry)
+        self.registry.collector(lambda: gauge.set(42))
+
+        self.assertIn("test_collected 42\n", self.registry.render())
+
+    def test_remote_request(self):
+        before = metrics.REMOTE_REQUESTS.value(host="api.github.com", status="200")
+
+        metrics.remote_request("https://api.github.com/repos/a/b", 200, {"X-RateLimit-Remaining": "42"})
+        metrics.remote_request("https://api.github.com/repos/a/b")
+
+        self.assertEqual(metrics.REMOTE_REQUESTS.value(host="api.github.com", status="200"), before + 1)
+        self.assertGreaterEqual(metrics.REMOTE_REQUESTS.value(host="api.github.com", status="error"), 1)
+        self.assertEqual(metrics.REMOTE_RATE_LIMIT_REMAINING.value(host="api.github.com"), 42)
+
+    def test_cache_lookup(self):
+        metrics.cache_lookup("test", True)
+        metrics.cache_lookup("test", True)
+        metrics.cache_lookup("test", False)
+        metrics.cache_lookup("test", True)
+
+        self.assertEqual(metrics.CACHE_REQUESTS.value(cache="test", result="hit"), 3)
+        self.assertEqual(metrics.CACHE_HIT_RATIO.value(cache="test"), 0.75)
+
+    def test_run_cmd_is_measured(self):
+        count = metrics.SUBPROCESS_DURATION.count(command="false")
+        failures = metrics.SUBPROCESS_FAILURES.value(command="false")
+
+        run_cmd(["false"], progress=False)
+
+        self.assertEqual(metrics.SUBPROCESS_DURATION.count(command="false"), count + 1)
+        self.assertEqual(metrics.SUBPROCESS_FAILURES.value(command="false"), failures + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from email.utils import formatdate
+from pathlib import Path
+from unittest.mock import patch
+
+from mmpm.static import IMMUTABLE, REVALIDATE, StaticFiles, compressors, precompress
+
+BUNDLE = ("console.log('mmpm');\n" * 200).encode("utf-8")
+
+
+class TestStaticFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+        (self.directory / "index.html").write_text("<html><body>mmpm</body></html>")
+        (self.directory / "main.1a2b3c4d5e6f7a8b.js").write_bytes(BUNDLE)
+        (self.directory / "assets").mkdir()
+        (self.directory / "assets" / "logo.png").write_bytes(b"\x89PNG" + bytes(range(256)) * 8)
+
+        self.app = StaticFiles(self.directory)
+
+    def request(self, path: str, method: str = "GET", **headers):
+        environ = {"REQUEST_METHOD": method, "PATH_INFO": path, **{f"HTTP_{name.upper()}": value for name, value in headers.items()}}
+        response = {}
+
+        def start_response(status, response_headers):
+            response["status"] = int(status.split()[0])
+            response["headers"] = dict(response_headers)
+
+        response["body"] = b"".join(self.app(environ, start_response))
+        return response
+
+    def test_index(self):
+        response = self.request("/")
+
+        self.assertEqual(response["status"], 200)
+        self.assertEqual(response["body"], b"<html><body>mmpm</body></html>")
+        self.assertEqual(response["headers"]["Content-Type"], "text/html; charset=utf-8")
+        self.assertEqual(response["headers"]["Cache-Control"], REVALIDATE)
+        self.assertIn("ETag", response["headers"])
+
+    def test_hashed_files_are_immutable(self):
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js")
+
+        self.assertEqual(response["headers"]["Cache-Control"], IMMUTABLE)
+        self.assertEqual(response["headers"]["Content-Type"], "text/javascript; charset=utf-8")
+
+    def test_not_found_and_traversal(self):
+        self.assertEqual(self.request("/missing.js")["status"], 404)
+        self.assertEqual(self.request("/../etc/passwd")["status"], 404)
+        self.assertEqual(self.request("/assets/../../etc/passwd")["status"], 404)
+
+    def test_method_not_allowed(self):
+        response = self.request("/", method="POST")
+
+        self.assertEqual(response["status"], 405)
+        self.assertEqual(response["headers"]["Allow"], "GET, HEAD")
+
+    def test_head(self):
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", method="HEAD")
+
+        self.assertEqual(response["body"], b"")
+        self.assertEqual(response["headers"]["Content-Length"], str(len(BUNDLE)))
+
+    def test_conditional_requests(self):
+        etag = self.request("/")["headers"]["ETag"]
+
+        self.assertEqual(self.request("/", if_none_match=etag)["status"], 304)
+        self.assertEqual(self.request("/", if_none_match=f'"other", W/{etag}')["status"], 304)
+        self.assertEqual(self.request("/", if_none_match='"other"')["status"], 200)
+
+        later = formatdate((self.directory / "index.html").stat().st_mtime + 60, usegmt=True)
+        earlier = formatdate((self.directory / "index.html").stat().st_mtime - 60, usegmt=True)
+
+        self.assertEqual(self.request("/", if_modified_since=later)["status"], 304)
+        self.assertEqual(self.request("/", if_modified_since=earlier)["status"], 200)
+
+    def test_compressed_on_first_request(self):
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", accept_encoding="gzip, deflate")
+
+        self.assertEqual(response["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(response["headers"]["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response["body"]), BUNDLE)
+        self.assertLess(len(response["body"]), len(BUNDLE))
+        self.assertTrue((self.directory / "main.1a2b3c4d5e6f7a8b.js.gz").exists())
+
+        # each encoding is a different representation
+        self.assertNotEqual(response["headers"]["ETag"], self.request("/main.1a2b3c4d5e6f7a8b.js")["headers"]["ETag"])
+
+    def test_small_and_binary_files_are_not_compressed(self):
+        self.assertNotIn("Content-Encoding", self.request("/", accept_encoding="gzip")["headers"])
+        self.assertNotIn("Content-Encoding", self.request("/assets/logo.png", accept_encoding="gzip")["headers"])
+        self.assertNotIn("Vary", self.request("/assets/logo.png", accept_encoding="gzip")["headers"])
+
+    def test_encoding_must_be_accepted(self):
+        self.assertNotIn("Content-Encoding", self.request("/main.1a2b3c4d5e6f7a8b.js")["headers"])
+        self.assertNotIn("Content-Encoding", self.request("/main.1a2b3c4d5e6f7a8b.js", accept_encoding="gzip;q=0")["headers"])
+
+    def test_precompressed_brotli_is_preferred(self):
+        bundle = self.directory / "main.1a2b3c4d5e6f7a8b.js"
+        (self.directory / "main.1a2b3c4d5e6f7a8b.js.br").write_bytes(b"brotli")
+        os.utime(bundle, ns=(bundle.stat().st_atime_ns, bundle.stat().st_mtime_ns - 1_000_000_000))
+
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", accept_encoding="gzip, br")
+
+        self.assertEqual(response["headers"]["Content-Encoding"], "br")
+        self.assertEqual(response["body"], b"brotli")
+
+    def test_stale_sibling_is_replaced(self):
+        bundle = self.directory / "main.1a2b3c4d5e6f7a8b.js"
+        sibling = self.directory / "main.1a2b3c4d5e6f7a8b.js.gz"
+        sibling.write_bytes(gzip.compress(b"a previous build"))
+        os.utime(sibling, ns=(sibling.stat().st_atime_ns, bundle.stat().st_mtime_ns - 1_000_000_000))
+
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", accept_encoding="gzip")
+        self.assertEqual(gzip.decompress(response["body"]), BUNDLE)
+
+    def test_unwritable_directory_serves_uncompressed(self):
+        with patch("mmpm.static.compress", side_effect=PermissionError("read-only file system")) as mock_compress:
+            first = self.request("/main.1a2b3c4d5e6f7a8b.js", accept_encoding="gzip")
+            second = self.request("/main.1a2b3c4d5e6f7a8b.js", accept_encoding="gzip")
+
+        self.assertNotIn("Content-Encoding", first["headers"])
+        self.assertEqual(second["body"], BUNDLE)
+        mock_compress.assert_called_once()
+
+    def test_ranges(self):
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", range="bytes=0-9")
+        self.assertEqual(response["status"], 206)
+        self.assertEqual(response["body"], BUNDLE[:10])
+        self.assertEqual(response["headers"]["Content-Range"], f"bytes 0-9/{len(BUNDLE)}")
+
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", range="bytes=-5")
+        self.assertEqual(response["body"], BUNDLE[-5:])
+
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", range=f"bytes={len(BUNDLE)}-")
+        self.assertEqual(response["status"], 416)
+        self.assertEqual(response["headers"]["Content-Range"], f"bytes */{len(BUNDLE)}")
+
+        # a range of a changed file is ignored, the entire file is sent instead
+        response = self.request("/main.1a2b3c4d5e6f7a8b.js", range="bytes=0-9", if_range='"stale"')
+        self.assertEqual(response["status"], 200)
+        self.assertEqual(response["body"], BUNDLE)
+
+    def test_file_wrapper_is_used(self):
+        wrapped = []
+
+        def file_wrapper(file, block_size):
+            wrapped.append(file)
+            return iter(lambda: file.read(block_size), b"")
+
+        environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/main.1a2b3c4d5e6f7a8b.js", "wsgi.file_wrapper": file_wrapper}
+        body = b"".join(self.app(environ, lambda status, headers: None))
+
+        self.assertEqual(body, BUNDLE)
+        self.assertEqual(len(wrapped), 1)
+        wrapped[0].close()
+
+    def test_precompress(self):
+        self.assertEqual(precompress(self.directory), len(compressors()))  # only the bundle is large enough
+        self.assertEqual(gzip.decompress((self.directory / "main.1a2b3c4d5e6f7a8b.js.gz").read_bytes()), BUNDLE)
+        self.assertFalse((self.directory / "index.html.gz").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
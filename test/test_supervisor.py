@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from mmpm.constants import urls
+from mmpm.supervisor import Service, Supervisor, read_state, services, stop, usage
+
+CRASH = f"{sys.executable} -c 'raise SystemExit(3)'"
+SLEEP = f"{sys.executable} -c 'import time; time.sleep(60)'"
+
+
+def alive(pid: int) -> bool:
+    try:
+        return Path(f"/proc/{pid}/stat").read_text(encoding="utf-8").rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+class TestSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.state_file = self.directory / "supervisor.json"
+
+        patcher = patch("mmpm.supervisor.paths.MMPM_LOG_DIR", self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def supervise(self, *supervised: Service, **kwargs) -> Supervisor:
+        supervisor = Supervisor(list(supervised), state_file=self.state_file, **kwargs)
+
+        for service in supervised:
+            self.addCleanup(service.stop)
+
+        return supervisor
+
+    def test_services_of_the_ui(self):
+        ports = {service.name: service.port for service in services()}
+
+        self.assertEqual(ports["mmpm.api"], urls.MMPM_API_SERVER_PORT)
+        self.assertEqual(ports["mmpm.log-server"], urls.MMPM_LOG_SERVER_PORT)
+        self.assertEqual(ports["mmpm.repeater"], urls.MMPM_REPEATER_SERVER_PORT)
+        self.assertEqual(ports["mmpm.ui"], urls.MMPM_UI_PORT)
+
+    def test_usage(self):
+        rss, ticks = usage(os.getpid())
+
+        self.assertGreater(rss, 0)
+        self.assertGreaterEqual(ticks, 0)
+        self.assertEqual(usage(2**22 + 1), (0, 0))  # beyond pid_max, so never a process
+
+    def test_crashes_are_restarted_with_backoff(self):
+        service = Service("crash", CRASH)
+        supervisor = self.supervise(service, backoff=(1.0, 4.0))
+
+        supervisor.check(now=100.0)
+        self.assertTrue(service.process)
+        service.process.wait()
+        service.started = 100.0
+
+        delays = []
+
+        for attempt in range(4):
+            now = service.started + 0.5
+            supervisor.check(now=now)  # notices the crash
+            self.assertIsNone(service.process)
+            delays.append(service.retry_at - now)
+
+            supervisor.check(now=service.retry_at - 0.1)
+            self.assertIsNone(service.process)
+
+            supervisor.check(now=service.retry_at)
+            self.assertEqual(service.restarts, attempt + 1)
+            service.process.wait()
+            service.started = service.retry_at
+
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 4.0])
+
+    def test_backoff_is_reset_once_stable(self):
+        service = Service("crash", CRASH)
+        supervisor = self.supervise(service, backoff=(1.0, 60.0), stable=30.0)
+
+        supervisor.check(now=0.0)
+        service.process.wait()
+        service.crashes = 5
+        service.started = 0.0
+
+        supervisor.check(now=45.0)
+        self.assertEqual(service.retry_at, 46.0)
+
+    def test_unhealthy_services_are_restarted(self):
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            port = closed.getsockname()[1]
+
+        service = Service("hung", SLEEP, port)
+        supervisor = self.supervise(service, interval=1.0, grace=5.0, failures=2)
+
+        supervisor.check(now=0.0)
+        service.started = 0.0
+        process = service.process
+
+        supervisor.check(now=2.0)  # within the grace period
+        self.assertIsNone(service.healthy)
+
+        supervisor.check(now=6.0)
+        self.assertFalse(service.healthy)
+        self.assertIs(service.process, process)
+
+        supervisor.check(now=7.0)
+        self.assertIsNone(service.process)
+        self.assertIsNotNone(process.poll())
+
+    def test_healthy_services_are_left_running(self):
+        with socket.socket() as listening:
+            listening.bind(("127.0.0.1", 0))
+            listening.listen()
+
+            service = Service("healthy", SLEEP, listening.getsockname()[1])
+            supervisor = self.supervise(service, interval=1.0, grace=0.0, failures=1)
+
+            supervisor.check(now=0.0)
+            service.started = 0.0
+            process = service.process
+
+            supervisor.check(now=1.0)
+            supervisor.check(now=2.0)
+
+        self.assertTrue(service.healthy)
+        self.assertIs(service.process, process)
+
+    def test_state_file(self):
+        service = Service("sleep", SLEEP)
+        supervisor = self.supervise(service, interval=1.0)
+
+        supervisor.check(now=10.0)
+        state = json.loads(self.state_file.read_text(encoding="utf-8"))
+
+        self.assertEqual(state["pid"], os.getpid())
+        self.assertEqual(state["services"]["sleep"]["pid"], service.pid)
+        self.assertEqual(state["services"]["sleep"]["status"], "online")
+
+        # the state file of this process isn't that of a supervisor, as a reused pid wouldn't be
+        self.assertIsNone(read_state(self.state_file))
+
+        with patch("mmpm.supervisor.Path.read_bytes", return_value=b"python\x00-m\x00mmpm.supervisor\x00"):
+            self.assertEqual(read_state(self.state_file)["pid"], os.getpid())
+
+    def test_stopping_stops_the_process_group(self):
+        spawn = 'import subprocess, sys, time; subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"]); time.sleep(60)'
+        service = Service("parent", f"{sys.executable} -c '{spawn}'")
+        service.start(self.directory / "parent.log")
+        self.addCleanup(service.stop)
+
+        children: list = []
+
+        while not children:
+            children = Path(f"/proc/{service.pid}/task/{service.pid}/children").read_text(encoding="utf-8").split()
+            time.sleep(0.05)
+
+        service.stop(timeout=5.0)
+        time.sleep(0.1)
+
+        self.assertIsNone(service.process)
+        self.assertFalse(any(alive(int(child)) for child in children))
+
+    def test_stop_with_a_stale_state_file(self):
+        # pid 1 is never a supervisor, so it isn't signalled
+        with patch("mmpm.supervisor.read_state", return_value={"pid": 1}), patch("mmpm.supervisor.os.kill") as mock_kill:
+            self.assertTrue(stop(self.state_file))
+
+        mock_kill.assert_not_called()
+
+        with patch("mmpm.supervisor.read_state", return_value={"pid": 1}), patch("mmpm.supervisor.__is_supervisor__", return_value=True):
+            with patch("mmpm.supervisor.os.kill", side_effect=PermissionError("not permitted")), patch("mmpm.supervisor.logger") as mock_logger:
+                self.assertFalse(stop(self.state_file))
+
+            mock_logger.error.assert_called_once()
+
+            with patch("mmpm.supervisor.os.kill", side_effect=ProcessLookupError):
+                self.assertTrue(stop(self.state_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
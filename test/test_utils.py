@@ -50,6 +50,19 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(stdout, "output")
         self.assertEqual(stderr, "error")
 
+    def test_run_cmd_background_skips_fork_hooks(self):
+        marker = Path(f"/tmp/mmpm-test-{uuid4()}")
+        armed = [True]
+        self.addCleanup(marker.unlink, missing_ok=True)
+        self.addCleanup(armed.clear)
+
+        # touched by any child running the at-fork hooks (ie. one using preexec_fn); hooks
+        # can't be unregistered, so this one is disarmed once the test is done
+        os.register_at_fork(after_in_child=lambda: armed and marker.touch())
+
+        self.assertEqual(run_cmd(["true"], background=True), (0, "", ""))
+        self.assertFalse(marker.exists())
+
     @patch("mmpm.utils.subprocess.Popen")
     def test_get_pids(self, mock_popen):
         random_proccess_ids = [str(fake.pyint()), str(fake.pyint())]
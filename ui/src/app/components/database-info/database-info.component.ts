@@ -105,7 +105,7 @@ export class DatabaseInfoComponent implements OnInit, OnDestroy {
   private onUpdate(): void {
     this.loadingChange.emit(true);
 
-    this.baseApi.get_("db/update").then((response: APIResponse) => {
+    this.baseApi.get_("db/update").then((response) => this.baseApi.followJob(response)).then((response: APIResponse) => {
       if (response.code === 200) {
         this.store.load();
         this.loadingChange.emit(false);
@@ -175,7 +175,7 @@ export class DatabaseInfoComponent implements OnInit, OnDestroy {
 
     // the update endpoint will write out which packages have updates, and this needs
     // to get updated again following the actual upgrades
-    const response = await this.baseApi.get_("db/update");
+    const response = await this.baseApi.followJob(await this.baseApi.get_("db/update"));
 
     if (response.code === 200) {
       this.msg.add({ severity: "success", summary: "Upgrade", detail: "Database updated to reflect changes" });
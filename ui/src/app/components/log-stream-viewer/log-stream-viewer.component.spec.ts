@@ -1,6 +1,8 @@
 import { ComponentFixture, TestBed } from "@angular/core/testing";
 
 import { LogStreamViewerComponent } from "./log-stream-viewer.component";
+import { BaseAPI } from "@/services/api/base-api";
+import { LogBatch } from "@/models/log-record";
 
 describe("LogStreamViewerComponent", () => {
   let component: LogStreamViewerComponent;
@@ -19,3 +21,41 @@ describe("LogStreamViewerComponent", () => {
     expect(component).toBeTruthy();
   });
 });
+
+describe("LogStreamViewerComponent batches", () => {
+  let component: LogStreamViewerComponent;
+
+  const record = (seq: number) => ({ seq, data: `record ${seq}` });
+  const onBatch = (batch: LogBatch) => component["onBatch"](batch);
+
+  beforeEach(() => {
+    // not initialized, so there's no connection to a log server
+    component = new LogStreamViewerComponent({} as BaseAPI);
+    component.socket = jasmine.createSpyObj("socket", ["emit"]);
+  });
+
+  it("displays contiguous batches", () => {
+    onBatch({ records: [record(1), record(2)], dropped: 0, sampled: 0, last: 2 });
+    onBatch({ records: [record(3)], dropped: 0, sampled: 0, last: 3 });
+
+    expect(component.logs).toBe("record 1\n\nrecord 2\n\nrecord 3\n\n");
+    expect(component.socket.emit).not.toHaveBeenCalled();
+  });
+
+  it("doesn't request sampled out records as missing", () => {
+    onBatch({ records: [record(1)], dropped: 0, sampled: 0, last: 1 });
+    onBatch({ records: [], dropped: 0, sampled: 3, last: 4 });
+    onBatch({ records: [record(5)], dropped: 0, sampled: 0, last: 5 });
+
+    expect(component.logs).toBe("record 1\n\nrecord 5\n\n");
+    expect(component.socket.emit).not.toHaveBeenCalled();
+  });
+
+  it("requests missing records", () => {
+    onBatch({ records: [record(1)], dropped: 0, sampled: 0, last: 1 });
+    onBatch({ records: [record(4)], dropped: 0, sampled: 0, last: 4 });
+
+    expect(component.logs).toBe("record 1\n\n");
+    expect(component.socket.emit).toHaveBeenCalledWith("history", { since: 1, epoch: "" }, jasmine.any(Function));
+  });
+});
@@ -1,8 +1,9 @@
 import { Component, HostListener, OnDestroy, OnInit, ViewChild } from "@angular/core";
 import { io } from "socket.io-client";
-import { getCookie, setCookie } from "@/utils/utils";
+import { getCookie, setCookie, socketUrl } from "@/utils/utils";
 import { BaseAPI } from "@/services/api/base-api";
 import { EditorComponent } from "ngx-monaco-editor-v2";
+import { LogBatch, LogHistory, LogRecord } from "@/models/log-record";
 
 @Component({
   selector: "app-log-stream-viewer",
@@ -19,6 +20,10 @@ export class LogStreamViewerComponent implements OnInit, OnDestroy {
   public logs = "";
   public fontSize = Number(getCookie("mmpm-log-stream-font-size", "12"));
 
+  // the last record received, so reconnecting only replays what was missed
+  private lastSeq = 0;
+  private epoch = "";
+
   public options = {
     language: "text",
     readOnly: true,
@@ -43,7 +48,10 @@ export class LogStreamViewerComponent implements OnInit, OnDestroy {
   public ngOnInit(): void {
     this.fontSize = Number(getCookie("mmpm-log-stream-font-size", "12"));
 
-    this.socket = io(`ws://${window.location.hostname}:6789`, { reconnection: true });
+    this.socket = io(socketUrl(6789, "logs"), {
+      reconnection: true,
+      auth: (callback: (auth: object) => void) => callback({ since: this.lastSeq, epoch: this.epoch }),
+    });
 
     this.socket.on("connect", () => {
       console.log("Connected to Socket.IO log server");
@@ -53,9 +61,57 @@ export class LogStreamViewerComponent implements OnInit, OnDestroy {
       console.log("Failed to connect to MMPM Log Server ");
     });
 
-    this.socket.on("logs", (data: string) => {
-      this.logs += data + "\n\n";
+    this.socket.on("history", (history: LogHistory) => {
+      this.onHistory(history);
     });
+
+    this.socket.on("logs", (batch: LogBatch, ack: () => void) => {
+      this.onBatch(batch);
+      ack(); // lets the log server send the next batch
+    });
+  }
+
+  private onBatch(batch: LogBatch): void {
+    if (batch.dropped) {
+      this.logs += `[${batch.dropped} log record(s) dropped, the log server is sending faster than they can be displayed]\n\n`;
+    }
+
+    if (batch.records.length) {
+      const first: number = batch.records[0].seq;
+
+      if (batch.dropped || batch.sampled) {
+        // the log server left these out on purpose
+        this.lastSeq = Math.max(this.lastSeq, first - 1);
+      } else if (first > this.lastSeq + 1) {
+        // records were missed, so ask for everything since the last one (which includes this batch)
+        this.socket.emit("history", { since: this.lastSeq, epoch: this.epoch }, (history: LogHistory) => this.onHistory(history));
+        return;
+      }
+
+      batch.records.forEach((record: LogRecord) => this.append(record));
+    }
+
+    // the records after the last one in the batch (ie. sampled out) won't be sent, so they aren't missing
+    this.lastSeq = Math.max(this.lastSeq, batch.last ?? 0);
+  }
+
+  private onHistory(history: LogHistory): void {
+    if (history.epoch !== this.epoch) {
+      // the log server restarted, so sequence numbers start over
+      this.epoch = history.epoch;
+      this.lastSeq = 0;
+    }
+
+    history.records.forEach((record: LogRecord) => this.append(record));
+  }
+
+  private append(record: LogRecord): void {
+    if (record.seq <= this.lastSeq) {
+      return; // already displayed
+    }
+
+    this.lastSeq = record.seq;
+    this.logs += record.data + "\n\n";
   }
 
   public ngOnDestroy(): void {
@@ -8,6 +8,7 @@ import { MagicMirrorAPI } from "@/services/api/magicmirror-api.service";
 import { MagicMirrorControllerAPI } from "@/services/api/magicmirror-controller-api.service";
 import { SharedStoreService } from "@/services/shared-store.service";
 import { Subscription } from "rxjs";
+import { socketUrl } from "@/utils/utils";
 
 @Component({
   selector: "app-magicmirror-controller",
@@ -155,9 +156,8 @@ export class MagicMirrorControllerComponent implements OnInit, OnDestroy {
 
     this.mmControllerApi.getStart().then((response: APIResponse) => {
       if (response.code === 200) {
-        setTimeout(() => {
-          this.initSocket();
-        }, 3000);
+        // the job finishes once MagicMirror is ready
+        this.initSocket();
 
         this.msg.add({ severity: "success", summary: "Start MagicMirror", detail: "Successfully started MagicMirror" });
       } else {
@@ -187,9 +187,8 @@ export class MagicMirrorControllerComponent implements OnInit, OnDestroy {
 
     this.mmControllerApi.getRestart().then((response: APIResponse) => {
       if (response.code === 200) {
-        setTimeout(() => {
-          this.initSocket();
-        }, 3000);
+        // the job finishes once MagicMirror is ready
+        this.initSocket();
 
         this.msg.add({ severity: "success", summary: "Restart MagicMirror", detail: "Successfully restarted MagicMirror" });
       } else {
@@ -221,16 +220,15 @@ export class MagicMirrorControllerComponent implements OnInit, OnDestroy {
   public initSocket(): void {
     console.log("Initializing socket");
 
-    this.socket = io(`${window.location.hostname}:8907`, { reconnection: true });
+    this.socket = io(socketUrl(8907, "repeater"), { reconnection: true });
 
+    // the repeater sends the modules as soon as the socket (re)connects, so they aren't requested here
     this.socket.on("connect", () => {
       console.log("Connected to MMPM Socket.IO Repeater");
-      this.socket.emit("request_modules");
     });
 
     this.socket.on("reconnect", () => {
       console.log("Reconnected to MMPM Socket.IO Repeater");
-      this.socket.emit("request_modules");
     });
 
     this.socket.on("disconnect", (error) => {
@@ -243,11 +241,37 @@ export class MagicMirrorControllerComponent implements OnInit, OnDestroy {
       console.log(error);
     });
 
+    this.socket.on("magicmirror", (state: { connected: boolean }) => {
+      if (!state.connected) {
+        this.modules = [];
+      }
+    });
+
     this.socket.on("modules", (modules: Array<MagicMirrorModule>) => {
       console.log("Received modules from MMPM Socket.IO Repeater");
       this.modules = this.formatModules(modules);
     });
 
+    // only the key and the changed fields of the modules which changed since the last "modules" event
+    this.socket.on("modules_changed", (changes: Array<Partial<MagicMirrorModule> & { key: number }>) => {
+      for (const change of changes) {
+        const index = this.modules.findIndex((mod: MagicMirrorModule) => mod.key === change.key + 1);
+
+        if (index !== -1) {
+          // formatted the same way as formatModules
+          const formatted = { ...change, key: change.key + 1 };
+
+          if (change.hidden !== undefined) {
+            formatted.hidden = !change.hidden;
+          }
+
+          this.modules[index] = { ...this.modules[index], ...formatted };
+        }
+      }
+
+      this.modules = [...this.modules];
+    });
+
     this.socket.connect();
   }
 
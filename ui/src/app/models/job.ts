@@ -0,0 +1,21 @@
+export type JobStatus = "pending" | "running" | "succeeded" | "failed" | "cancelled";
+
+export interface JobProgress {
+  step: number;
+  total: number;
+  message: string;
+}
+
+export interface Job {
+  id: string;
+  name: string;
+  status: JobStatus;
+  progress: JobProgress;
+  result: any;
+  error: string;
+  created: number;
+  started: number | null;
+  finished: number | null;
+}
+
+export const FINISHED_JOB_STATUSES: JobStatus[] = ["succeeded", "failed", "cancelled"];
@@ -0,0 +1,17 @@
+export interface LogRecord {
+  seq: number;
+  data: string;
+}
+
+export interface LogHistory {
+  epoch: string;
+  records: LogRecord[];
+}
+
+export interface LogBatch {
+  records: LogRecord[];
+  dropped: number;
+  sampled: number;
+  // every record up to this sequence number was either in this batch (or an earlier one), or left out on purpose
+  last: number;
+}
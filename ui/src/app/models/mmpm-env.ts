@@ -1,6 +1,11 @@
 export interface MMPMEnv {
+  MMPM_API_PROFILING: string;
+  MMPM_DB_UPDATE_INTERVAL: number;
   MMPM_IS_DOCKER_IMAGE: boolean;
+  MMPM_LOG_JSON_BACKEND: string;
   MMPM_LOG_LEVEL: string;
+  MMPM_LOG_SAMPLING: string;
+  MMPM_LOG_MODE: string;
   MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE: string;
   MMPM_MAGICMIRROR_PM2_PROCESS_NAME: string;
   MMPM_MAGICMIRROR_ROOT: string;
@@ -1,6 +1,8 @@
 import { HttpClient, HttpHeaders } from "@angular/common/http";
 import { Injectable } from "@angular/core";
 import { catchError, firstValueFrom, retry } from "rxjs";
+import { io } from "socket.io-client";
+import { FINISHED_JOB_STATUSES, Job } from "@/models/job";
 
 export interface APIResponse {
   code: number;
@@ -34,6 +36,71 @@ export class BaseAPI {
     return firstValueFrom(this.http.get<APIResponse>(this.route(endpoint), { headers: this.headers() }).pipe(retry(1), catchError(this.handleError)));
   }
 
+  /*
+   * Long operations (ie. installing packages) run as background jobs on the API server, and respond
+   * with the queued job right away. This follows the job until it finishes, and resolves to a response
+   * shaped as if the operation had run within the request. Responses without a job are returned as-is.
+   */
+  public followJob(response: APIResponse): Promise<APIResponse> {
+    const job: Job | undefined = response?.message?.job;
+
+    if (response?.code !== 200 || !job) {
+      return Promise.resolve(response);
+    }
+
+    if (FINISHED_JOB_STATUSES.includes(job.status)) {
+      return Promise.resolve(this.jobResponse(job)); // ie. a recent database update, which is reused
+    }
+
+    return new Promise((resolve) => {
+      const socket = io(`ws://${window.location.hostname}:7891`, { reconnection: true });
+
+      const finish = (update: Job): void => {
+        if (update.id !== job.id) {
+          return;
+        }
+
+        if (update.progress.message) {
+          console.log(`Job ${update.name}: ${update.progress.message} (${update.progress.step}/${update.progress.total})`);
+        }
+
+        if (!FINISHED_JOB_STATUSES.includes(update.status)) {
+          return;
+        }
+
+        socket.disconnect();
+        clearInterval(poll);
+        resolve(this.jobResponse(update));
+      };
+
+      socket.on("job", finish);
+      socket.on("jobs", (jobs: Job[]) => jobs.forEach(finish)); // sent on (re)connecting, in case an update was missed
+
+      // in case the socket can't connect, ie. through a proxy without websocket support
+      const poll = setInterval(() => {
+        this.get_(`jobs/${job.id}`)
+          .then((status: APIResponse) => {
+            if (status.code === 200) {
+              finish(status.message);
+            } else {
+              socket.disconnect();
+              clearInterval(poll);
+              resolve(status);
+            }
+          })
+          .catch(() => {});
+      }, 5000);
+    });
+  }
+
+  private jobResponse(job: Job): APIResponse {
+    if (job.status === "succeeded") {
+      return { code: 200, message: job.result };
+    }
+
+    return { code: 500, message: job.status === "cancelled" ? "Cancelled" : job.error };
+  }
+
   public getZipArchive(endpoint: string): Promise<ArrayBuffer> {
     return firstValueFrom(
       this.http
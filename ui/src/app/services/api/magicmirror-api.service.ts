@@ -12,12 +12,12 @@ export class MagicMirrorAPI extends BaseAPI {
 
   public getUpgrade(): Promise<APIResponse> {
     console.log("Requesting MagicMirror perform upgrade");
-    return this.get_("mm-ctl/upgrade");
+    return this.get_("mm-ctl/upgrade").then((response) => this.followJob(response));
   }
 
   public getInstall(): Promise<APIResponse> {
     console.log("Requesting MagicMirror perform upgrade");
-    return this.get_("mm-ctl/install");
+    return this.get_("mm-ctl/install").then((response) => this.followJob(response));
   }
 
   public getRemove(): Promise<APIResponse> {
@@ -9,17 +9,17 @@ import { catchError, firstValueFrom, map, retry } from "rxjs";
 export class MagicMirrorControllerAPI extends BaseAPI {
   public getStart(): Promise<APIResponse> {
     console.log("Requesting to start MagicMirror");
-    return this.get_("mm-ctl/start");
+    return this.get_("mm-ctl/start").then((response) => this.followJob(response));
   }
 
   public getRestart(): Promise<APIResponse> {
     console.log("Requesting to restart MagicMirror");
-    return this.get_("mm-ctl/restart");
+    return this.get_("mm-ctl/restart").then((response) => this.followJob(response));
   }
 
   public getStop(): Promise<APIResponse> {
     console.log("Requesting to stop MagicMirror");
-    return this.get_("mm-ctl/stop");
+    return this.get_("mm-ctl/stop").then((response) => this.followJob(response));
   }
 
   public postHide(mmModule: MagicMirrorModule): Promise<APIResponse> {
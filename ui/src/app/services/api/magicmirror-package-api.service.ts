@@ -38,7 +38,7 @@ export class MagicMirrorPackageAPI extends BaseAPI {
 
   public postInstallPackages(packages: MagicMirrorPackage[]): Promise<APIResponse> {
     console.log(`Requesting to have ${packages.length} packages installed`);
-    return this.postPackages("packages/install", packages);
+    return this.postPackages("packages/install", packages).then((response) => this.followJob(response));
   }
 
   public postRemovePackages(packages: MagicMirrorPackage[]): Promise<APIResponse> {
@@ -48,7 +48,7 @@ export class MagicMirrorPackageAPI extends BaseAPI {
 
   public postUpgradePackages(packages: MagicMirrorPackage[]): Promise<APIResponse> {
     console.log("Requesting to have packages upgraded");
-    return this.postPackages("packages/upgrade", packages);
+    return this.postPackages("packages/upgrade", packages).then((response) => this.followJob(response));
   }
 
   public postAddMmPkg(pkg: MagicMirrorPackage): Promise<APIResponse> {
@@ -23,8 +23,13 @@ export class SharedStoreService {
   public readonly upgradable: Observable<UpgradableDetails> = this.upgradeableSubj.asObservable();
 
   private envSubj: BehaviorSubject<MMPMEnv> = new BehaviorSubject<MMPMEnv>({
+    MMPM_API_PROFILING: "off",
+    MMPM_DB_UPDATE_INTERVAL: 60,
     MMPM_IS_DOCKER_IMAGE: false,
+    MMPM_LOG_JSON_BACKEND: "",
     MMPM_LOG_LEVEL: "",
+    MMPM_LOG_SAMPLING: "",
+    MMPM_LOG_MODE: "",
     MMPM_MAGICMIRROR_DOCKER_COMPOSE_FILE: "",
     MMPM_MAGICMIRROR_PM2_PROCESS_NAME: "",
     MMPM_MAGICMIRROR_ROOT: "",
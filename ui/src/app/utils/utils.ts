@@ -15,3 +15,17 @@ export function setCookie(name: string, value: string) {
 export function openUrl(address: string) {
   window.open(address, "_blank");
 }
+
+export const API_PORT = 7891;
+
+/*
+ * `mmpm serve` hosts the UI on the port of the API, along with the log server and the repeater as
+ * Socket.IO namespaces of the API. Otherwise, each is a separate process listening on a port of its own.
+ */
+export function socketUrl(port: number, namespace: string): string {
+  if (window.location.port === String(API_PORT)) {
+    return `ws://${window.location.hostname}:${API_PORT}/${namespace}`;
+  }
+
+  return `ws://${window.location.hostname}:${port}`;
+}